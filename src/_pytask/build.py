@@ -25,6 +25,7 @@ from _pytask.exceptions import ConfigurationError
 from _pytask.exceptions import ExecutionError
 from _pytask.exceptions import ResolvingDependenciesError
 from _pytask.outcomes import ExitCode
+from _pytask.path import DIRECTORY_INDEX
 from _pytask.path import HashPathCache
 from _pytask.pluginmanager import get_plugin_manager
 from _pytask.pluginmanager import hookimpl
@@ -49,7 +50,7 @@ def pytask_extend_command_line_interface(cli: click.Group) -> None:
 
 @hookimpl
 def pytask_post_parse(config: dict[str, Any]) -> None:
-    """Fill cache of file hashes with stored hashes."""
+    """Fill cache of file hashes and the directory index with stored values."""
     with suppress(Exception):
         path = config["root"] / ".pytask" / "file_hashes.json"
         cache = json.loads(path.read_text())
@@ -57,34 +58,49 @@ def pytask_post_parse(config: dict[str, Any]) -> None:
         for key, value in cache.items():
             HashPathCache.add(key, value)
 
+    with suppress(Exception):
+        path = config["root"] / ".pytask" / "directory_index.json"
+        DIRECTORY_INDEX.listings.update(json.loads(path.read_text()))
+
 
 @hookimpl
 def pytask_unconfigure(session: Session) -> None:
-    """Save calculated file hashes to file."""
+    """Save calculated file hashes and the directory index to file."""
     path = session.config["root"] / ".pytask" / "file_hashes.json"
     path.write_text(json.dumps(HashPathCache._cache))
 
+    if DIRECTORY_INDEX.modified:
+        path = session.config["root"] / ".pytask" / "directory_index.json"
+        path.write_text(json.dumps(DIRECTORY_INDEX.listings))
+        DIRECTORY_INDEX.modified = False
+
 
 def build(  # noqa: C901, PLR0912, PLR0913
     *,
+    build_cache: Path | str | None = None,
     capture: Literal["fd", "no", "sys", "tee-sys"] | CaptureMethod = CaptureMethod.FD,
     check_casing_of_paths: bool = True,
     config: Path | None = None,
     database_url: str = "",
     debug_pytask: bool = False,
     disable_warnings: bool = False,
+    discover_with_git: bool = False,
     dry_run: bool = False,
     editor_url_scheme: Literal["no_link", "file", "vscode", "pycharm"]  # noqa: PYI051
     | str = "file",
     expression: str = "",
     force: bool = False,
     ignore: Iterable[str] = (),
+    lazy_collection: bool = False,
     marker_expression: str = "",
     max_failures: float = float("inf"),
+    n_collection_workers: int = 1,
     n_entries_in_table: int = 15,
+    n_save_workers: int = 0,
     paths: Path | Iterable[Path] = (),
     pdb: bool = False,
     pdb_cls: str = "",
+    prefetch_size: int | str = 0,
     s: bool = False,
     show_capture: Literal["no", "stdout", "stderr", "all"]
     | ShowCapture = ShowCapture.ALL,
@@ -97,6 +113,7 @@ def build(  # noqa: C901, PLR0912, PLR0913
     tasks: Callable[..., Any] | PTask | Iterable[Callable[..., Any] | PTask] = (),
     task_files: Iterable[str] = ("task_*.py",),
     trace: bool = False,
+    value_cache_size: int | str = "1GB",
     verbose: int = 1,
     **kwargs: Any,
 ) -> Session:
@@ -108,6 +125,10 @@ def build(  # noqa: C901, PLR0912, PLR0913
 
     Parameters
     ----------
+    build_cache
+        A directory where products of tasks are stored under a key of the task and its
+        dependencies. Products are restored from the directory instead of executing the
+        task again.
     capture
         The capture method for stdout and stderr.
     check_casing_of_paths
@@ -120,6 +141,9 @@ def build(  # noqa: C901, PLR0912, PLR0913
         Whether debug information should be shown.
     disable_warnings
         Whether warnings should be disabled and not displayed.
+    discover_with_git
+        Whether files should be found with ``git ls-files`` instead of walking
+        directories. Files ignored by git are not collected.
     dry_run
         Whether a dry-run should be performed that shows which tasks need to be rerun.
     editor_url_scheme
@@ -132,13 +156,23 @@ def build(  # noqa: C901, PLR0912, PLR0913
     ignore
         A pattern to ignore files or directories. Refer to ``pathlib.Path.match`` for
         more info.
+    lazy_collection
+        Skip importing unchanged task modules and import them only when one of their
+        tasks has to be executed.
     marker_expression
         Same as ``-m`` on the command line. Select tasks via marker expressions.
     max_failures
         Stop after some failures.
+    n_collection_workers
+        The number of worker processes which import task modules during the
+        collection. Tasks are restored from the workers and their modules are only
+        imported in the main process when one of their tasks is executed.
     n_entries_in_table
         How many entries to display in the table during the execution. Tasks which are
         running are always displayed.
+    n_save_workers
+        The number of threads which save products in the background. Products are
+        saved before the next task starts if it is zero.
     paths
         A path or collection of paths where pytask looks for the configuration and
         tasks.
@@ -147,6 +181,10 @@ def build(  # noqa: C901, PLR0912, PLR0913
     pdb_cls
         Start a custom debugger on errors. For example:
         ``--pdbcls=IPython.terminal.debugger:TerminalPdb``
+    prefetch_size
+        The memory budget for dependencies of upcoming tasks which are loaded in the
+        background while a task runs, either in bytes or as a string like
+        ``"512MB"``. Zero disables prefetching.
     s
         Shortcut for ``capture="no"``.
     show_capture
@@ -170,6 +208,9 @@ def build(  # noqa: C901, PLR0912, PLR0913
         A pattern to describe modules that contain tasks.
     trace
         Enter debugger in the beginning of each task.
+    value_cache_size
+        The memory budget of the cache for values loaded from dependencies which opt in
+        to caching, either in bytes or as a string like ``"512MB"``.
     verbose
         Make pytask verbose (>= 0) or quiet (= 0).
 
@@ -181,23 +222,29 @@ def build(  # noqa: C901, PLR0912, PLR0913
     """
     try:
         raw_config = {
+            "build_cache": build_cache,
             "capture": capture,
             "check_casing_of_paths": check_casing_of_paths,
             "config": config,
             "database_url": database_url,
             "debug_pytask": debug_pytask,
             "disable_warnings": disable_warnings,
+            "discover_with_git": discover_with_git,
             "dry_run": dry_run,
             "editor_url_scheme": editor_url_scheme,
             "expression": expression,
             "force": force,
             "ignore": ignore,
+            "lazy_collection": lazy_collection,
             "marker_expression": marker_expression,
             "max_failures": max_failures,
+            "n_collection_workers": n_collection_workers,
             "n_entries_in_table": n_entries_in_table,
+            "n_save_workers": n_save_workers,
             "paths": paths,
             "pdb": pdb,
             "pdb_cls": pdb_cls,
+            "prefetch_size": prefetch_size,
             "s": s,
             "show_capture": show_capture,
             "show_errors_immediately": show_errors_immediately,
@@ -209,6 +256,7 @@ def build(  # noqa: C901, PLR0912, PLR0913
             "tasks": tasks,
             "task_files": task_files,
             "trace": trace,
+            "value_cache_size": value_cache_size,
             "verbose": verbose,
         } | kwargs
 
@@ -317,6 +365,42 @@ def build(  # noqa: C901, PLR0912, PLR0913
 @click.option(
     "--dry-run", type=bool, is_flag=True, default=False, help="Perform a dry-run."
 )
+@click.option(
+    "--lazy-collection",
+    is_flag=True,
+    default=False,
+    help="Skip importing unchanged task modules until their tasks need to run.",
+)
+@click.option(
+    "--n-collection-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of worker processes which import task modules during the collection.",
+)
+@click.option(
+    "--build-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="A directory to store products and restore them instead of executing tasks.",
+)
+@click.option(
+    "--value-cache-size",
+    type=str,
+    default="1GB",
+    help="Memory budget for cached values of dependencies, for example, '512MB'.",
+)
+@click.option(
+    "--n-save-workers",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of threads which save products in the background.",
+)
+@click.option(
+    "--prefetch-size",
+    type=str,
+    default="0",
+    help="Memory budget for loading dependencies of upcoming tasks in the background.",
+)
 @click.option(
     "-f",
     "--force",
@@ -0,0 +1,356 @@
+"""Contains the build cache which restores products instead of executing tasks.
+
+The build cache is a directory, possibly on a shared file system, in which the products
+of successful tasks are stored under a key. The key is the hash of the task's state, the
+states of its dependencies, and the names of the task, its dependencies, and products.
+States of files are hashes of their contents, and names of paths are relative to the
+root of the project. So, the same key is computed in every copy of the project, for
+example, on the machine of a colleague or on CI.
+
+Before a task is executed, the key is looked up. If an entry exists, the products are
+restored from the cache and the task is not executed. Products are cloned if the file
+system supports reflinks, hard linked to the read-only files in the cache otherwise,
+and copied as a last resort.
+
+Only tasks whose products are all local files can be cached.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
+from upath import UPath
+
+from _pytask.database_utils import update_states_in_database
+from _pytask.node_protocols import PPathNode
+from _pytask.node_protocols import PProvisionalNode
+from _pytask.node_protocols import PTaskWithPath
+from _pytask.outcomes import Restored
+from _pytask.outcomes import TaskOutcome
+from _pytask.pluginmanager import hookimpl
+from _pytask.typing import is_task_generator
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from _pytask.node_protocols import PNode
+    from _pytask.node_protocols import PTask
+    from _pytask.reports import ExecutionReport
+    from _pytask.session import Session
+
+
+__all__ = ["compute_cache_key", "find_cacheable_products"]
+
+
+_CACHE_VERSION = "1"
+"""The version of the layout of keys and entries. Change it to invalidate entries."""
+
+_FICLONE = 0x40049409
+"""The request code of the ``ioctl`` to clone a file on Linux."""
+
+
+@define
+class _RestoredLinks:
+    """The products which were restored as hard links to files in the build cache.
+
+    The paths of products are mapped to the files in the entries they were restored
+    from. The mapping is stored in ``.pytask`` between runs.
+
+    """
+
+    links: dict[str, str] = field(factory=dict)
+    modified: bool = False
+
+
+_RESTORED_LINKS = _RestoredLinks()
+
+
+@hookimpl
+def pytask_parse_config(config: dict[str, Any]) -> None:
+    """Parse the configuration."""
+    value = config.get("build_cache")
+    if not value:
+        config["build_cache"] = None
+        return
+
+    path = Path(value).expanduser()
+    if not path.is_absolute():
+        base = config["config"].parent if config.get("config") else config["root"]
+        path = base.joinpath(path)
+    config["build_cache"] = path.resolve()
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Load the products which were restored as hard links in previous runs."""
+    _RESTORED_LINKS.links.clear()
+    _RESTORED_LINKS.modified = False
+    if config["build_cache"] is None:
+        return
+    with suppress(Exception):
+        path = config["root"] / ".pytask" / "build_cache_links.json"
+        _RESTORED_LINKS.links.update(json.loads(path.read_text()))
+
+
+@hookimpl
+def pytask_unconfigure(session: Session) -> None:
+    """Save the products which are restored as hard links."""
+    if _RESTORED_LINKS.modified:
+        path = session.config["root"] / ".pytask" / "build_cache_links.json"
+        path.write_text(json.dumps(_RESTORED_LINKS.links))
+        _RESTORED_LINKS.modified = False
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_task_setup(
+    session: Session, task: PTask
+) -> Generator[None, None, None]:
+    """Restore the products of a task from the build cache.
+
+    The lookup happens after all other implementations of the hook. So, skipped,
+    unchanged, and persisting tasks never reach the cache and the directories of the
+    products exist.
+
+    """
+    result = yield
+
+    cache_dir = session.config.get("build_cache")
+    if cache_dir is None or session.config["dry_run"] or session.config["force"]:
+        return result
+
+    products = find_cacheable_products(session, task)
+    if products is None:
+        return result
+    key = compute_cache_key(session, task, products)
+    if key is None:
+        return result
+
+    entry = _get_entry(cache_dir, key)
+    if entry.is_dir() and _restore_products(entry, products):
+        raise Restored
+
+    # Products which are hard links into the cache are read-only and must not be
+    # modified by the task.
+    for node in products:
+        _unlink_if_restored_link(node.path)
+    return result
+
+
+@hookimpl
+def pytask_execute_task_process_report(
+    session: Session, report: ExecutionReport
+) -> bool | None:
+    """Process restored tasks and store the products of successful tasks.
+
+    Restored tasks are successful, and their states are updated in the database.
+
+    Successful tasks do not return ``True`` so that their states are updated in the
+    database by the default implementation.
+
+    """
+    if report.exc_info and isinstance(report.exc_info[1], Restored):
+        report.outcome = TaskOutcome.RESTORED
+        update_states_in_database(session, report.task.signature)
+        return True
+
+    cache_dir = session.config.get("build_cache")
+    if cache_dir is not None and report.outcome == TaskOutcome.SUCCESS:
+        products = find_cacheable_products(session, report.task)
+        if products is not None:
+            key = compute_cache_key(session, report.task, products)
+            if key is not None:
+                _store_products(cache_dir, key, products)
+    return None
+
+
+def find_cacheable_products(session: Session, task: PTask) -> list[PPathNode] | None:
+    """Find the products of a task if the task can be cached.
+
+    The products are sorted by their names relative to the root of the project.
+    ``None`` is returned if the task cannot be cached because it has no products, is a
+    task generator, or some products are not local files.
+
+    """
+    if is_task_generator(task):
+        return None
+
+    root = session.config["root"]
+    products = [
+        session.dag.get(name) for name in session.dag.successors(task.signature)
+    ]
+    if not products or not all(
+        isinstance(node, PPathNode) and not isinstance(node.path, UPath)
+        for node in products
+    ):
+        return None
+    return sorted(
+        products,  # type: ignore[arg-type]
+        key=lambda node: _get_portable_name(node, root),
+    )
+
+
+def compute_cache_key(
+    session: Session, task: PTask, products: list[PPathNode]
+) -> str | None:
+    """Compute the key of a task in the build cache.
+
+    ``None`` is returned if the state of the task or one of its dependencies is
+    unknown.
+
+    """
+    task_state = task.state()
+    if task_state is None:
+        return None
+
+    root = session.config["root"]
+    dependencies = []
+    for name in session.dag.predecessors(task.signature):
+        node = session.dag.get(name)
+        if isinstance(node, PProvisionalNode):
+            return None
+        state = node.state()
+        if state is None:
+            return None
+        dependencies.append((_get_portable_name(node, root), state))
+
+    parts = [_CACHE_VERSION, _get_portable_name(task, root), task_state]
+    for name, state in sorted(dependencies):
+        parts.extend((name, state))
+    parts.extend(_get_portable_name(node, root) for node in products)
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _get_portable_name(node: PTask | PNode, root: Path) -> str:
+    """Get a name of a node which is the same in every copy of the project."""
+    if isinstance(node, PTaskWithPath):
+        base_name = node.name.rsplit("::", 1)[-1]
+        return f"{_get_relative_path(node.path, root)}::{base_name}"
+    if isinstance(node, PPathNode):
+        return _get_relative_path(node.path, root)
+    return node.name
+
+
+def _get_relative_path(path: Path, root: Path) -> str:
+    try:
+        return Path(os.path.relpath(path, root)).as_posix()
+    except ValueError:
+        # Paths on different drives on Windows.
+        return path.as_posix()
+
+
+def _get_entry(cache_dir: Path, key: str) -> Path:
+    """Get the directory of an entry which holds the products of a key."""
+    return cache_dir / key[:2] / key[2:]
+
+
+def _restore_products(entry: Path, products: list[PPathNode]) -> bool:
+    """Restore the products from an entry and return whether it succeeded."""
+    try:
+        for i, node in enumerate(products):
+            node.path.unlink(missing_ok=True)
+            source = entry / str(i)
+            if _link_or_copy(source, node.path):
+                _RESTORED_LINKS.links[node.path.as_posix()] = source.as_posix()
+            else:
+                _RESTORED_LINKS.links.pop(node.path.as_posix(), None)
+            _RESTORED_LINKS.modified = True
+    except OSError:
+        return False
+    return True
+
+
+def _store_products(cache_dir: Path, key: str, products: list[PPathNode]) -> None:
+    """Store the products of a task in a new entry.
+
+    The products are copied to a temporary directory which is renamed to the entry, so
+    that other processes never see incomplete entries. Failures to store products are
+    ignored since the cache is only an optimization.
+
+    """
+    entry = _get_entry(cache_dir, key)
+    if entry.exists():
+        return
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir))
+    except OSError:
+        return
+
+    try:
+        for i, node in enumerate(products):
+            path = tmp_dir / str(i)
+            _copy(node.path, path)
+            path.chmod(0o444)
+        entry.parent.mkdir(exist_ok=True)
+        tmp_dir.rename(entry)
+    except OSError:
+        # Another process might have stored the same entry in the meantime.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _link_or_copy(source: Path, destination: Path) -> bool:
+    """Clone, hard link or copy a file from the cache and return if it is hard linked."""
+    if _reflink(source, destination):
+        return False
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+        return False
+    return True
+
+
+def _copy(source: Path, destination: Path) -> None:
+    """Clone or copy a file."""
+    if not _reflink(source, destination):
+        shutil.copyfile(source, destination)
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Clone a file which shares the data with the source until one is modified."""
+    if sys.platform != "linux":
+        return False
+
+    import fcntl
+
+    try:
+        with source.open("rb") as src, destination.open("wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _unlink_if_restored_link(path: Path) -> None:
+    """Remove a product which is a hard link to the file it was restored from.
+
+    Hard links which were created by the user or files which were replaced since they
+    were restored are kept.
+
+    """
+    source = _RESTORED_LINKS.links.pop(path.as_posix(), None)
+    if source is None:
+        return
+    _RESTORED_LINKS.modified = True
+
+    try:
+        stat = path.stat()
+        source_stat = Path(source).stat()
+        if (stat.st_dev, stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+            path.unlink()
+    except OSError:
+        pass
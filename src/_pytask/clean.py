@@ -30,7 +30,7 @@ from _pytask.pluginmanager import storage
 from _pytask.session import Session
 from _pytask.shared import to_list
 from _pytask.traceback import Traceback
-from _pytask.tree_util import tree_leaves
+from _pytask.tree_util import get_flat_arguments
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -212,7 +212,7 @@ def _yield_paths_from_task(task: PTask) -> Generator[Path, None, None]:
     if isinstance(task, PTaskWithPath):
         yield task.path
     for attribute in ("depends_on", "produces"):
-        for node in tree_leaves(getattr(task, attribute)):
+        for node in get_flat_arguments(task, attribute).leaves:
             if isinstance(node, PPathNode):
                 yield node.path
 
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import importlib.metadata
 from typing import Any
 
 import click
 
+from _pytask import __version__
 from _pytask.click import ColoredGroup
 from _pytask.pluginmanager import storage
 
@@ -16,15 +16,9 @@ _CONTEXT_SETTINGS: dict[str, Any] = {
 }
 
 
-if importlib.metadata.version("click") >= "8":  # pragma: no cover
-    _VERSION_OPTION_KWARGS = {"package_name": "pytask"}
-else:  # pragma: no cover
-    _VERSION_OPTION_KWARGS = {}
-
-
 def _extend_command_line_interface(cli: click.Group) -> click.Group:
     """Add parameters from plugins to the commandline interface."""
-    pm = storage.create()
+    pm = storage.get_or_create()
     pm.hook.pytask_extend_command_line_interface.call_historic(kwargs={"cli": cli})
     _sort_options_for_each_command_alphabetically(cli)
     return cli
@@ -38,22 +32,47 @@ def _sort_options_for_each_command_alphabetically(cli: click.Group) -> None:
         )
 
 
+class _LazyColoredGroup(ColoredGroup):
+    """A group whose commands are added by plugins when they are accessed first.
+
+    Extending the command line interface loads all plugins. Deferring it keeps importing
+    pytask and calls like ``pytask --version`` fast.
+
+    """
+
+    _is_extended = False
+
+    @property
+    def commands(self) -> dict[str, click.Command]:
+        if not self._is_extended:
+            self._is_extended = True
+            _extend_command_line_interface(self)
+        return self._commands
+
+    @commands.setter
+    def commands(self, value: dict[str, click.Command]) -> None:
+        self._commands = value
+
+
 @click.group(
-    cls=ColoredGroup,
+    cls=_LazyColoredGroup,
     context_settings=_CONTEXT_SETTINGS,
     default="build",
     default_if_no_args=True,
 )
-@click.version_option(**_VERSION_OPTION_KWARGS)
+@click.version_option(version=__version__)
 def cli() -> None:
     """Manage your tasks with pytask."""
 
 
-_extend_command_line_interface(cli)
-
-
-DEFAULTS_FROM_CLI = {
-    option.name: option.default
-    for command in cli.commands.values()
-    for option in command.params
-}
+def __getattr__(name: str) -> Any:
+    if name == "DEFAULTS_FROM_CLI":
+        value = {
+            option.name: option.default
+            for command in cli.commands.values()
+            for option in command.params
+        }
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import importlib.metadata
 import inspect
 from enum import Enum
 from gettext import gettext as _
@@ -13,6 +12,7 @@ from typing import ClassVar
 from typing import TypeVar
 
 import click
+import click.parser
 from click import Choice
 from click import Command
 from click import Context
@@ -36,7 +36,8 @@ if TYPE_CHECKING:
 __all__ = ["ColoredCommand", "ColoredGroup", "EnumChoice"]
 
 
-if importlib.metadata.version("click") < "8.2":
+# Checking the version of click with importlib.metadata slows down the startup.
+if not hasattr(click.parser, "_split_opt"):  # click < 8.2
     from click.parser import split_opt
 
     class EnumChoice(Choice):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import inspect
 import itertools
 import os
@@ -9,14 +10,19 @@ import sys
 import time
 from contextlib import suppress
 from pathlib import Path
+from pathlib import PosixPath
+from pathlib import WindowsPath
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 
 from rich.text import Text
 from upath import UPath
 
 from _pytask.coiled_utils import Function
 from _pytask.coiled_utils import extract_coiled_function_kwargs
+from _pytask.collect_parallel import collect_task_module_from_entry
+from _pytask.collect_parallel import collect_task_modules_in_parallel
 from _pytask.collect_utils import create_name_of_python_node
 from _pytask.collect_utils import parse_dependencies_from_task_function
 from _pytask.collect_utils import parse_products_from_task_function
@@ -26,6 +32,7 @@ from _pytask.console import create_summary_panel
 from _pytask.console import get_file
 from _pytask.exceptions import CollectionError
 from _pytask.exceptions import NodeNotCollectedError
+from _pytask.git import get_not_ignored_files
 from _pytask.mark import MarkGenerator
 from _pytask.mark_utils import get_all_marks
 from _pytask.mark_utils import has_mark
@@ -41,16 +48,19 @@ from _pytask.nodes import Task
 from _pytask.nodes import TaskWithoutPath
 from _pytask.outcomes import CollectionOutcome
 from _pytask.outcomes import count_outcomes
+from _pytask.path import PatternMatcher
 from _pytask.path import find_case_sensitive_path
 from _pytask.path import import_path
 from _pytask.path import shorten_path
+from _pytask.pluginmanager import has_only_builtin_hookimpls
 from _pytask.pluginmanager import hookimpl
 from _pytask.reports import CollectionReport
-from _pytask.shared import find_duplicates
 from _pytask.shared import to_list
 from _pytask.shared import unwrap_task_function
+from _pytask.task_utils import COLLECTED_GRIDS
 from _pytask.task_utils import COLLECTED_TASKS
 from _pytask.task_utils import task as task_decorator
+from _pytask.tree_util import clear_flat_arguments
 from _pytask.typing import is_task_function
 
 if TYPE_CHECKING:
@@ -83,6 +93,9 @@ def pytask_collect(session: Session) -> bool:
             outcome=CollectionOutcome.FAIL, exc_info=sys.exc_info()
         )
         session.collection_reports.append(report)
+    # Plugins might have modified the arguments of tasks in place.
+    for task in session.tasks:
+        clear_flat_arguments(task)
 
     session.hook.pytask_collect_log(
         session=session, reports=session.collection_reports, tasks=session.tasks
@@ -95,12 +108,22 @@ def _collect_from_paths(session: Session) -> None:
     """Collect tasks from paths.
 
     Go through all paths, check if the path is ignored, and collect the file if not.
+    Task modules might have been collected in worker processes before.
 
     """
-    for path in _not_ignored_paths(session.config["paths"], session, set()):
-        reports = session.hook.pytask_collect_file_protocol(
-            session=session, path=path, reports=session.collection_reports
-        )
+    paths = list(_not_ignored_paths(session.config["paths"], session, set()))
+    collected_in_workers = collect_task_modules_in_parallel(session, paths)
+
+    for path in paths:
+        reports = None
+        if path in collected_in_workers:
+            reports = collect_task_module_from_entry(
+                session, path, collected_in_workers[path]
+            )
+        if reports is None:
+            reports = session.hook.pytask_collect_file_protocol(
+                session=session, path=path, reports=session.collection_reports
+            )
 
         if reports:
             session.collection_reports.extend(reports)
@@ -155,6 +178,11 @@ task(...)(lambda **x: imported_function(**x)).
 
 def _collect_not_collected_tasks(session: Session) -> None:
     """Collect tasks that are not collected yet and create failed reports."""
+    for path in list(COLLECTED_GRIDS):
+        COLLECTED_TASKS[path].extend(
+            grid.function for grid in COLLECTED_GRIDS.pop(path)
+        )
+
     for path in list(COLLECTED_TASKS):
         tasks = COLLECTED_TASKS.pop(path)
         for task in tasks:
@@ -183,7 +211,7 @@ def _collect_not_collected_tasks(session: Session) -> None:
 @hookimpl
 def pytask_ignore_collect(path: Path, config: dict[str, Any]) -> bool:
     """Ignore a path during the collection."""
-    return any(path.match(pattern) for pattern in config["ignore"])
+    return _compile_patterns(tuple(config["ignore"])).match(os.fspath(path))
 
 
 @hookimpl
@@ -364,7 +392,7 @@ The path '{path}' points to a directory, although only files are allowed."""
 
 
 @hookimpl(trylast=True)
-def pytask_collect_node(  # noqa: C901, PLR0912
+def pytask_collect_node(  # noqa: C901, PLR0911, PLR0912
     session: Session, path: Path, node_info: NodeInfo
 ) -> PNode | PProvisionalNode:
     """Collect a node of a task as a :class:`pytask.PNode`.
@@ -386,6 +414,17 @@ def pytask_collect_node(  # noqa: C901, PLR0912
     """
     node = node_info.value
 
+    # Dispatch the most common types first since checks against protocols are slow.
+    node_type = type(node)
+    if node_type in _CONCRETE_PATH_TYPES:
+        return _collect_path_node(session, path, node)
+
+    if node_type is PythonNode:
+        node.node_info = node_info
+        if not node.name:
+            node.name = create_name_of_python_node(node_info)
+        return node
+
     if isinstance(node, (PNode, PProvisionalNode)) and not hasattr(node, "attributes"):
         warn_about_upcoming_attributes_field_on_nodes()
 
@@ -460,21 +499,7 @@ def pytask_collect_node(  # noqa: C901, PLR0912
             return PathNode(name=node.name, path=node)
 
     if isinstance(node, Path):
-        if not node.is_absolute():
-            node = path.joinpath(node)
-
-        # ``normpath`` removes ``../`` from the path which is necessary for the casing
-        # check which will fail since ``.resolves()`` also normalizes a path.
-        node = Path(os.path.normpath(node))
-        _raise_error_if_casing_of_path_is_wrong(
-            node, session.config["check_casing_of_paths"]
-        )
-        name = shorten_path(node, session.config["paths"] or (session.config["root"],))
-
-        if isinstance(node, Path) and node.is_dir():
-            raise ValueError(_TEMPLATE_ERROR_DIRECTORY.format(path=node))
-
-        return PathNode(name=name, path=node)
+        return _collect_path_node(session, path, node)
 
     # Allowing a PythonNode as a return is a poor fallback, because it cannot be used.
     # Probably, the user made a mistake like writing a custom node that does not
@@ -492,6 +517,28 @@ def pytask_collect_node(  # noqa: C901, PLR0912
     return PythonNode(value=node, name=node_name, node_info=node_info)
 
 
+_CONCRETE_PATH_TYPES = (PosixPath, WindowsPath)
+
+
+def _collect_path_node(session: Session, path: Path, node: Path) -> PathNode:
+    """Collect a path as a :class:`pytask.PathNode`."""
+    if not node.is_absolute():
+        node = path.joinpath(node)
+
+    # ``normpath`` removes ``../`` from the path which is necessary for the casing
+    # check which will fail since ``.resolves()`` also normalizes a path.
+    node = Path(os.path.normpath(node))
+    _raise_error_if_casing_of_path_is_wrong(
+        node, session.config["check_casing_of_paths"]
+    )
+    name = shorten_path(node, session.config["paths"] or (session.config["root"],))
+
+    if node.is_dir():
+        raise ValueError(_TEMPLATE_ERROR_DIRECTORY.format(path=node))
+
+    return PathNode(name=name, path=node)
+
+
 _TEMPLATE_ERROR: str = """\
 The provided path of the dependency/product is
 
@@ -537,15 +584,108 @@ def _not_ignored_paths(
     directories, all subsequent files and folders are considered, but one level after
     another, so that files of ignored folders are not checked.
 
+    If only pytask implements the hooks to ignore and collect files, the ignore
+    patterns and the patterns of task files are matched with compiled expressions and
+    only task modules are yielded. With ``discover_with_git``, the files in directories
+    are enumerated with ``git ls-files`` instead of walking the directories.
+
     """
+    is_ignored = create_ignore_predicate(session)
+    is_candidate = _create_candidate_predicate(session)
+
     for path in paths:
-        if not session.hook.pytask_ignore_collect(path=path, config=session.config):
-            if path.is_dir():
-                files_in_dir = path.iterdir()
-                yield from _not_ignored_paths(files_in_dir, session, seen)
-            elif path not in seen:
-                seen.add(path)
-                yield path
+        path_str = os.fspath(path)
+        if is_ignored(path_str):
+            continue
+
+        files: Iterable[str]
+        if not path.is_dir():
+            files = (path_str,)
+        elif (
+            session.config.get("discover_with_git", False)
+            and (git_files := get_not_ignored_files(path)) is not None
+        ):
+            files = _filter_git_files(path_str, git_files, is_ignored)
+        else:
+            files = _walk_directory(path_str, is_ignored)
+
+        for file in files:
+            if is_candidate(file):
+                file_path = Path(file)
+                if file_path not in seen:
+                    seen.add(file_path)
+                    yield file_path
+
+
+def create_ignore_predicate(session: Session) -> Callable[[str], bool]:
+    """Create a function which checks whether a path is ignored."""
+    if has_only_builtin_hookimpls(session.hook, ("pytask_ignore_collect",)):
+        return _compile_patterns(tuple(session.config["ignore"])).match
+    return lambda path: session.hook.pytask_ignore_collect(
+        path=Path(path), config=session.config
+    )
+
+
+def _create_candidate_predicate(session: Session) -> Callable[[str], bool]:
+    """Create a function which checks whether a file might contain tasks."""
+    if has_only_builtin_hookimpls(
+        session.hook, ("pytask_collect_file_protocol", "pytask_collect_file")
+    ):
+        return _compile_patterns(tuple(session.config["task_files"])).match
+    return lambda path: True  # noqa: ARG005
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_patterns(patterns: tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher.from_patterns(patterns)
+
+
+def _walk_directory(
+    directory: str, is_ignored: Callable[[str], bool]
+) -> Generator[str, None, None]:
+    """Walk a directory with :func:`os.scandir` and skip ignored files and folders."""
+    with os.scandir(directory) as it:
+        entries = list(it)
+    for entry in entries:
+        if is_ignored(entry.path):
+            continue
+        if entry.is_dir():
+            yield from _walk_directory(entry.path, is_ignored)
+        else:
+            yield entry.path
+
+
+def _filter_git_files(
+    directory: str, files: list[str], is_ignored: Callable[[str], bool]
+) -> Generator[str, None, None]:
+    """Yield files known to git which are not ignored and whose folders are not.
+
+    Files that were deleted but are still tracked by git are skipped.
+
+    """
+    cache: dict[str, bool] = {}
+    for file in files:
+        folder, _, _ = file.rpartition("/")
+        if folder and _is_folder_ignored(directory, folder, is_ignored, cache):
+            continue
+        path = os.path.join(directory, file)  # noqa: PTH118
+        if not is_ignored(path) and os.path.isfile(path):  # noqa: PTH113
+            yield path
+
+
+def _is_folder_ignored(
+    directory: str,
+    folder: str,
+    is_ignored: Callable[[str], bool],
+    cache: dict[str, bool],
+) -> bool:
+    """Check whether a folder or one of its parents inside the directory is ignored."""
+    if folder not in cache:
+        parent, _, _ = folder.rpartition("/")
+        cache[folder] = bool(
+            parent and _is_folder_ignored(directory, parent, is_ignored, cache)
+        ) or is_ignored(os.path.join(directory, folder))  # noqa: PTH118
+    return cache[folder]
 
 
 @hookimpl(trylast=True)
@@ -557,6 +697,9 @@ def pytask_collect_modify_tasks(tasks: list[PTask]) -> None:
             task.name = id_to_short_id[task.name]
 
 
+_MAX_PARTS_IN_SHORT_ID = 19
+
+
 def _find_shortest_uniquely_identifiable_name_for_tasks(
     tasks: list[PTask],
 ) -> dict[str, str]:
@@ -566,26 +709,43 @@ def _find_shortest_uniquely_identifiable_name_for_tasks(
     name) of the task. If this does not make the id unique, append more and more parent
     folders until the id is unique.
 
-    """
-    id_to_short_id = {}
+    The tasks are inserted into a trie of their base names and their reversed path
+    parts which counts how many tasks share a suffix. The shortest unique id of a task
+    uses the first suffix shared by no other task. Thus, all ids are found in one pass.
 
-    # Make attempt to add up to twenty parts of the path to ensure uniqueness.
+    """
     id_to_task = {task.name: task for task in tasks if isinstance(task, Task)}
-    for n_parts in range(1, 20):
-        dupl_id_to_short_id = {
-            id_: "/".join(task.path.parts[-n_parts:]) + "::" + task.base_name
-            for id_, task in id_to_task.items()
-        }
-        duplicates = find_duplicates(dupl_id_to_short_id.values())
-
-        for id_, short_id in dupl_id_to_short_id.items():
-            if short_id not in duplicates:
-                id_to_short_id[id_] = short_id
-                id_to_task.pop(id_)
-
-    # If there are still non-unique task ids, just use the full id as the short id.
+
+    # Each node of the trie stores the number of tasks passing through it, the number
+    # of tasks whose path ends in it, and its children.
+    trie: dict[str, list[Any]] = {}
+    for task in id_to_task.values():
+        parts = task.path.parts
+        node = trie.setdefault(task.base_name, [0, 0, {}])
+        for part in reversed(parts[-_MAX_PARTS_IN_SHORT_ID:]):
+            node = node[2].setdefault(part, [0, 0, {}])
+            node[0] += 1
+        if len(parts) <= _MAX_PARTS_IN_SHORT_ID:
+            node[1] += 1
+
+    id_to_short_id = {}
     for id_, task in id_to_task.items():
-        id_to_short_id[id_] = task.name
+        parts = task.path.parts
+        node = trie[task.base_name]
+        short_id = task.name
+        for n_parts, part in enumerate(reversed(parts[-_MAX_PARTS_IN_SHORT_ID:]), 1):
+            node = node[2][part]
+            if node[0] == 1:
+                short_id = "/".join(parts[-n_parts:]) + "::" + task.base_name
+                break
+        else:
+            # The whole path is shared with other tasks, but it is unique if no other
+            # task has the same path.
+            if len(parts) < _MAX_PARTS_IN_SHORT_ID and node[1] == 1:
+                short_id = "/".join(parts) + "::" + task.base_name
+
+        # If there are still non-unique task ids, just use the full id as the short id.
+        id_to_short_id[id_] = short_id
 
     return id_to_short_id
 
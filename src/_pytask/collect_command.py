@@ -34,7 +34,7 @@ from _pytask.path import relative_to
 from _pytask.pluginmanager import hookimpl
 from _pytask.pluginmanager import storage
 from _pytask.session import Session
-from _pytask.tree_util import tree_leaves
+from _pytask.tree_util import get_flat_arguments
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -125,10 +125,14 @@ def _find_common_ancestor_of_all_nodes(
         all_paths.append(task.path)
         if show_nodes:
             all_paths.extend(
-                x.path for x in tree_leaves(task.depends_on) if isinstance(x, PPathNode)
+                x.path
+                for x in get_flat_arguments(task, "depends_on").leaves
+                if isinstance(x, PPathNode)
             )
             all_paths.extend(
-                x.path for x in tree_leaves(task.produces) if isinstance(x, PPathNode)
+                x.path
+                for x in get_flat_arguments(task, "produces").leaves
+                if isinstance(x, PPathNode)
             )
 
     return find_common_ancestor(*all_paths, *paths)
@@ -196,7 +200,7 @@ def _print_collected_tasks(
             )
 
             if show_nodes:
-                deps = list(tree_leaves(task.depends_on))
+                deps = list(get_flat_arguments(task, "depends_on").leaves)
                 for node in sorted(
                     deps,
                     key=(
@@ -208,7 +212,7 @@ def _print_collected_tasks(
                     text = format_node_name(node, (common_ancestor,))
                     task_branch.add(Text.assemble(FILE_ICON, "<Dependency ", text, ">"))
 
-                products = list(tree_leaves(task.produces))
+                products = list(get_flat_arguments(task, "produces").leaves)
                 for node in sorted(
                     products,
                     key=lambda x: x.path.as_posix()
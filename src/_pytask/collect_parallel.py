@@ -0,0 +1,124 @@
+"""Contains the code to collect task modules in worker processes.
+
+When ``--n-collection-workers`` is larger than one, task modules are imported in forked
+worker processes. Each worker collects a disjoint set of modules and returns the same
+serializable entries which are stored in the collection manifest. The main process
+restores the tasks from these entries and imports a module only when one of its tasks
+is executed.
+
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from _pytask.manifest import create_entry
+from _pytask.manifest import load_entry
+from _pytask.manifest import restore_tasks
+from _pytask.manifest import save_entry
+from _pytask.outcomes import CollectionOutcome
+from _pytask.reports import CollectionReport
+from _pytask.task_utils import COLLECTED_TASKS
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from _pytask.session import Session
+
+
+__all__ = ["collect_task_modules_in_parallel"]
+
+
+_SESSION: Session | None = None
+"""The session which is inherited by forked worker processes."""
+
+
+def collect_task_modules_in_parallel(
+    session: Session, paths: list[Path]
+) -> dict[Path, bytes]:
+    """Collect task modules in worker processes.
+
+    Only task modules which cannot be restored from the manifest are sent to the
+    workers. Modules which cannot be collected or serialized in a worker are missing
+    from the result and must be collected in the main process.
+
+    Worker processes are forked to inherit the session with its plugins. On platforms
+    without ``fork``, nothing is collected in parallel.
+
+    """
+    global _SESSION  # noqa: PLW0603
+    n_workers = session.config.get("n_collection_workers", 1)
+    if n_workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return {}
+
+    task_modules = [
+        path
+        for path in paths
+        if any(path.match(pattern) for pattern in session.config["task_files"])
+        and not (session.config.get("lazy_collection", False) and load_entry(path))
+    ]
+    if len(task_modules) <= 1:
+        return {}
+
+    _SESSION = session
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(task_modules)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            values = executor.map(
+                _collect_task_module,
+                task_modules,
+                chunksize=max(1, len(task_modules) // (4 * n_workers)),
+            )
+            return {
+                path: value
+                for path, value in zip(task_modules, values)
+                if value is not None
+            }
+    finally:
+        _SESSION = None
+
+
+def collect_task_module_from_entry(
+    session: Session, path: Path, value: bytes
+) -> list[CollectionReport] | None:
+    """Restore the tasks of a module collected in a worker process.
+
+    If the module was already imported by another module in the main process, the
+    tasks are collected normally and ``None`` is returned.
+
+    """
+    if COLLECTED_TASKS.get(path):
+        return None
+
+    entry = pickle.loads(value)  # noqa: S301
+    if session.config.get("lazy_collection", False):
+        save_entry(path, entry)
+
+    reports = [
+        CollectionReport(outcome=CollectionOutcome.SUCCESS, node=task)
+        for task in restore_tasks(path, entry)
+    ]
+    session.hook.pytask_collect_file_log(session=session, reports=reports)
+    return reports
+
+
+def _collect_task_module(path: Path) -> bytes | None:
+    """Import a task module in a worker process and serialize its tasks."""
+    session = _SESSION
+    assert session is not None
+    try:
+        reports = list(
+            itertools.chain.from_iterable(
+                session.hook.pytask_collect_file(session=session, path=path, reports=[])
+            )
+        )
+        entry = create_entry(session, path, reports)
+        return None if entry is None else pickle.dumps(entry)
+    except Exception:  # noqa: BLE001
+        return None
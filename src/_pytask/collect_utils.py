@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import inspect
+import weakref
+from pathlib import PurePath
 from typing import TYPE_CHECKING
 from typing import Annotated
 from typing import Any
@@ -12,6 +13,8 @@ from typing import get_origin
 import attrs
 
 from _pytask._inspect import get_annotations
+from _pytask._inspect import get_parameter_names
+from _pytask._inspect import is_plain_function
 from _pytask.exceptions import NodeNotCollectedError
 from _pytask.models import NodeInfo
 from _pytask.node_protocols import PNode
@@ -26,6 +29,7 @@ from _pytask.typing import no_default
 
 if TYPE_CHECKING:
     from pathlib import Path
+    from types import CodeType
 
     from _pytask.session import Session
 
@@ -119,26 +123,7 @@ def _find_args_with_node_annotation(
     func: Callable[..., Any],
 ) -> dict[str, PNode | PProvisionalNode]:
     """Find args with node annotations."""
-    annotations = get_annotations(func, eval_str=True)
-    metas = {
-        name: annotation.__metadata__
-        for name, annotation in annotations.items()
-        if get_origin(annotation) is Annotated
-    }
-
-    args_with_node_annotation = {}
-    for name, meta in metas.items():
-        annot = [i for i in meta if not isinstance(i, ProductType)]
-        if len(annot) >= 2:  # noqa: PLR2004
-            msg = (
-                f"Parameter {name!r} has multiple node annotations although only one "
-                f"is allowed. Annotations: {annot}"
-            )
-            raise ValueError(msg)
-        if annot:
-            args_with_node_annotation[name] = annot[0]
-
-    return args_with_node_annotation
+    return _parse_annotations(func)[1]
 
 
 _ERROR_MULTIPLE_TASK_RETURN_DEFINITIONS = """The task uses multiple ways to parse \
@@ -178,7 +163,7 @@ def parse_products_from_task_function(
     signature_defaults = parse_keyword_arguments_from_signature_defaults(obj)
     kwargs = {**signature_defaults, **task_kwargs}
 
-    parameters = list(inspect.signature(obj).parameters)
+    parameters = get_parameter_names(obj)
     parameters_with_product_annot = _find_args_with_product_annotation(obj)
     parameters_with_node_annot = _find_args_with_node_annotation(obj)
 
@@ -274,6 +259,35 @@ def _collect_nodes_and_provisional_nodes(  # noqa: PLR0913
 
 def _find_args_with_product_annotation(func: Callable[..., Any]) -> list[str]:
     """Find args with product annotations."""
+    return _parse_annotations(func)[0]
+
+
+_ANNOTATIONS_CACHE: weakref.WeakKeyDictionary[
+    CodeType, tuple[Any, list[str], dict[str, Any]]
+] = weakref.WeakKeyDictionary()
+"""Cache parsed annotations of functions sharing the same code object.
+
+Functions repeated in a loop share the code object. If their annotations are strings
+that are evaluated to immutable values, the parsed annotations are the same.
+
+"""
+
+_IMMUTABLE_ANNOTATION_TYPES = (PurePath, ProductType, str, int, float, bool, type(None))
+
+
+def _parse_annotations(
+    func: Callable[..., Any],
+) -> tuple[list[str], dict[str, Any]]:
+    """Find args with product annotations and args with node annotations."""
+    key = None
+    if is_plain_function(func) and all(
+        isinstance(value, str) for value in func.__annotations__.values()
+    ):
+        key = (id(func.__globals__), tuple(func.__annotations__.items()))
+        cached = _ANNOTATIONS_CACHE.get(func.__code__)
+        if cached is not None and cached[0] == key:
+            return list(cached[1]), dict(cached[2])
+
     annotations = get_annotations(func, eval_str=True)
     metas = {
         name: annotation.__metadata__
@@ -282,12 +296,35 @@ def _find_args_with_product_annotation(func: Callable[..., Any]) -> list[str]:
     }
 
     args_with_product_annot = []
+    args_with_node_annotation = {}
     for name, meta in metas.items():
-        has_product_annot = any(isinstance(i, ProductType) for i in meta)
-        if has_product_annot:
+        if any(isinstance(i, ProductType) for i in meta):
             args_with_product_annot.append(name)
 
-    return args_with_product_annot
+        annot = [i for i in meta if not isinstance(i, ProductType)]
+        if len(annot) >= 2:  # noqa: PLR2004
+            msg = (
+                f"Parameter {name!r} has multiple node annotations although only one "
+                f"is allowed. Annotations: {annot}"
+            )
+            raise ValueError(msg)
+        if annot:
+            args_with_node_annotation[name] = annot[0]
+
+    # Nodes created from annotations are modified during the collection. Thus, only
+    # cache them if they cannot be changed.
+    if key is not None and all(
+        isinstance(i, _IMMUTABLE_ANNOTATION_TYPES)
+        for meta in metas.values()
+        for i in meta
+    ):
+        _ANNOTATIONS_CACHE[func.__code__] = (
+            key,
+            list(args_with_product_annot),
+            dict(args_with_node_annotation),
+        )
+
+    return args_with_product_annot, args_with_node_annotation
 
 
 def collect_dependency(
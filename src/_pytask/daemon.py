@@ -0,0 +1,259 @@
+"""Contains the implementation of ``pytask daemon``.
+
+The daemon is a long-running process which listens on a Unix socket in the ``.pytask``
+folder of the project. The ``pytask`` script sends its arguments to the daemon which
+runs the command and streams back the output. Thus, the interpreter, pytask, plugins,
+and all third-party packages are imported only once, and caches like the hashes of
+files and the directory index stay in memory.
+
+Each command starts with a fresh plugin manager like a new process. It runs with the
+working directory and the environment variables of the client and cannot read from
+stdin. Modules of the project are removed from :data:`sys.modules` after every command
+so that changes to task modules are picked up. Use ``--lazy-collection`` to skip
+re-importing unchanged task modules.
+
+A command is interrupted like with a keyboard interrupt when the client cancels it or
+disconnects. Commands of clients which use another interpreter are rejected, and the
+client runs them itself.
+
+"""
+
+from __future__ import annotations
+
+import _thread
+import io
+import json
+import os
+import select
+import socket
+import sys
+import threading
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+import click
+
+from _pytask.click import ColoredCommand
+from _pytask.config_utils import find_project_root_and_config
+from _pytask.console import console
+from _pytask.daemon_utils import MessageType
+from _pytask.daemon_utils import get_socket_path
+from _pytask.daemon_utils import receive_message
+from _pytask.daemon_utils import send_message
+from _pytask.outcomes import ExitCode
+from _pytask.path import remove_project_modules
+from _pytask.pluginmanager import hookimpl
+from _pytask.pluginmanager import storage
+from _pytask.traceback import Traceback
+
+if TYPE_CHECKING:
+    from typing import NoReturn
+
+
+__all__ = ["serve"]
+
+
+@hookimpl(tryfirst=True)
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    cli.add_command(daemon)
+
+
+@click.command(cls=ColoredCommand)
+@click.option(
+    "--stop", is_flag=True, default=False, help="Stop the daemon of the project."
+)
+def daemon(stop: bool) -> NoReturn:
+    """Run pytask commands of the project in a warm background process."""
+    if not hasattr(socket, "AF_UNIX"):
+        console.print("The daemon is not supported on this platform.")
+        sys.exit(ExitCode.CONFIGURATION_FAILED)
+
+    root, _ = find_project_root_and_config(None)
+    socket_path = get_socket_path(root)
+
+    exit_code = _stop(socket_path) if stop else serve(root)
+    sys.exit(exit_code)
+
+
+def serve(root: Path) -> ExitCode:
+    """Serve commands of a project until the daemon is stopped."""
+    socket_path = get_socket_path(root)
+    if _is_running(socket_path):
+        console.print(f"A daemon is already running for {root}.")
+        return ExitCode.CONFIGURATION_FAILED
+
+    socket_path.parent.mkdir(exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        server.listen()
+        console.print(f"The daemon is listening on {socket_path}.")
+        try:
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    if not _handle_connection(connection, root):
+                        break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+    console.print("The daemon was stopped.")
+    return ExitCode.OK
+
+
+def _is_running(socket_path: Path) -> bool:
+    """Check whether a daemon is listening on the socket."""
+    if not socket_path.exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def _stop(socket_path: Path) -> ExitCode:
+    """Stop the daemon listening on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            console.print("No daemon is running for this project.")
+            return ExitCode.CONFIGURATION_FAILED
+        send_message(connection, MessageType.STOP, b"")
+        receive_message(connection)
+    return ExitCode.OK
+
+
+def _handle_connection(connection: socket.socket, root: Path) -> bool:
+    """Handle a connection and return whether the daemon should keep serving."""
+    message = receive_message(connection)
+    if message is None:
+        return True
+
+    type_, payload = message
+    if type_ == MessageType.STOP:
+        send_message(connection, MessageType.EXIT, b"0")
+        return False
+
+    request = json.loads(payload)
+    if request["executable"] != sys.executable:
+        send_message(connection, MessageType.REJECT, b"")
+        return True
+
+    finished = threading.Event()
+    lock = threading.Lock()
+    watcher = threading.Thread(
+        target=_watch_client, args=(connection, finished, lock), daemon=True
+    )
+    watcher.start()
+    try:
+        try:
+            exit_code = _run_command(connection, request, root)
+        finally:
+            # Afterwards, the watcher cannot interrupt the daemon anymore.
+            with lock:
+                finished.set()
+            watcher.join()
+    except KeyboardInterrupt:
+        exit_code = ExitCode.FAILED
+
+    try:
+        send_message(connection, MessageType.EXIT, str(int(exit_code)).encode())
+    except OSError:
+        # The client disconnected while the command was running.
+        pass
+    return True
+
+
+def _watch_client(
+    connection: socket.socket, finished: threading.Event, lock: threading.Lock
+) -> None:
+    """Interrupt the running command when the client cancels it or disconnects.
+
+    The client sends nothing while the command is running except for a request to
+    cancel it. So, any data or the end of the connection cancels the command.
+
+    """
+    while not finished.is_set():
+        readable, _, _ = select.select([connection], [], [], 0.1)
+        if readable:
+            with lock:
+                if not finished.is_set():
+                    _thread.interrupt_main()
+            return
+
+
+class _SocketWriter(io.StringIO):
+    """A text stream which sends everything written to it to the client."""
+
+    def __init__(self, connection: socket.socket, isatty: bool) -> None:
+        super().__init__()
+        self._connection = connection
+        self._isatty = isatty
+        self._lock = threading.Lock()
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            send_message(self._connection, MessageType.OUTPUT, s.encode())
+        return len(s)
+
+
+def _run_command(connection: socket.socket, request: dict[str, Any], root: Path) -> int:
+    """Run a command of the client like a new process of pytask."""
+    from _pytask.cli import cli
+
+    writer = _SocketWriter(connection, isatty=request["isatty"])
+    environ = os.environ.copy()
+    stdin = sys.stdin
+    sys_path = sys.path.copy()
+    modules = set(sys.modules)
+    cwd = Path.cwd()
+    file, no_color = console.file, console.no_color
+    width, height = console.size
+
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.stdin = io.StringIO()
+    console.file = writer
+    console.width, console.height = request["width"], request["height"]
+    console.no_color = no_color or not request["isatty"]
+    storage.create()
+    try:
+        with redirect_stdout(writer), redirect_stderr(writer):
+            exit_code = cli.main(
+                args=request["args"], prog_name="pytask", standalone_mode=False
+            )
+    except SystemExit as e:
+        exit_code = e.code
+    except click.ClickException as e:
+        e.show(file=writer)
+        exit_code = e.exit_code
+    except (click.Abort, KeyboardInterrupt):
+        exit_code = ExitCode.FAILED
+    except Exception:  # noqa: BLE001
+        console.print(Traceback(sys.exc_info()))
+        exit_code = ExitCode.FAILED
+    finally:
+        console.file, console.no_color = file, no_color
+        console.width, console.height = width, height
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+        sys.stdin = stdin
+        sys.path[:] = sys_path
+        remove_project_modules(set(sys.modules) - modules, root)
+
+    return exit_code if isinstance(exit_code, int) else ExitCode.OK
@@ -0,0 +1,210 @@
+"""Contains the protocol and the client of ``pytask daemon``.
+
+The module only depends on the standard library because the client is the entry point
+of the ``pytask`` script. When a daemon is running for the project, the command is sent
+to the daemon together with the environment variables of the client, and its output is
+streamed back. Otherwise, pytask is imported and runs in the current process.
+
+Commands which keep running, like ``pytask watch``, or which read from the terminal are
+always run in the current process. A daemon started with another interpreter, for
+example, from another virtual environment, rejects commands.
+
+Every message is a frame which consists of a one-byte type, the length of the payload
+as a four-byte unsigned integer, and the payload.
+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import signal
+import socket
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import FrameType
+    from typing import NoReturn
+
+
+__all__ = [
+    "MessageType",
+    "find_socket_path",
+    "get_socket_path",
+    "main",
+    "receive_message",
+    "run_client",
+    "send_message",
+]
+
+
+class MessageType:
+    """The types of messages exchanged between the client and the daemon."""
+
+    REQUEST = b"r"
+    """A command from the client with its arguments serialized as JSON."""
+    STOP = b"s"
+    """A request from the client to stop the daemon."""
+    CANCEL = b"c"
+    """A request from the client to cancel the running command."""
+    REJECT = b"j"
+    """The answer of a daemon which cannot run the command of the client."""
+    OUTPUT = b"o"
+    """Output of the command which is streamed to the client."""
+    EXIT = b"x"
+    """The exit code of the command which ends the response."""
+
+
+_HEADER = struct.Struct("!cI")
+
+_NOT_FORWARDED_COMMANDS = frozenset({"daemon", "watch"})
+"""Commands which keep running and are not sent to the daemon."""
+
+_NOT_FORWARDED_OPTIONS = frozenset({"--pdb", "--trace", "--pdbcls"})
+"""Options which require an interactive terminal and are not sent to the daemon."""
+
+
+def get_socket_path(root: Path) -> Path:
+    """Get the path to the socket of the daemon of a project."""
+    return root / ".pytask" / "daemon.sock"
+
+
+def find_socket_path(path: Path) -> Path | None:
+    """Find the socket of a daemon in the directory or one of its parents."""
+    for directory in (path, *path.parents):
+        socket_path = get_socket_path(directory)
+        if socket_path.exists():
+            return socket_path
+    return None
+
+
+def send_message(connection: socket.socket, type_: bytes, payload: bytes) -> None:
+    """Send a message."""
+    connection.sendall(_HEADER.pack(type_, len(payload)) + payload)
+
+
+def receive_message(connection: socket.socket) -> tuple[bytes, bytes] | None:
+    """Receive a message.
+
+    Returns ``None`` if the connection was closed before a complete message arrived.
+
+    """
+    header = _receive_exactly(connection, _HEADER.size)
+    if header is None:
+        return None
+    type_, length = _HEADER.unpack(header)
+    payload = _receive_exactly(connection, length)
+    if payload is None:
+        return None
+    return type_, payload
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes | None:
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 16))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def run_client(args: list[str], socket_path: Path) -> int | None:
+    """Run a command in the daemon and stream its output to stdout.
+
+    Returns the exit code of the command or ``None`` if the daemon is not reachable or
+    rejects the command.
+
+    The first keyboard interrupt cancels the command in the daemon and the output of the
+    cancelled command is still shown. A second keyboard interrupt leaves immediately.
+
+    """
+    terminal_size = shutil.get_terminal_size()
+    request = {
+        "args": args,
+        "cwd": os.getcwd(),  # noqa: PTH109
+        "env": dict(os.environ),
+        "executable": sys.executable,
+        "isatty": sys.stdout.isatty(),
+        "width": terminal_size.columns,
+        "height": terminal_size.lines,
+    }
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(str(socket_path))
+    except OSError:
+        return None
+
+    def _cancel(signum: int, frame: FrameType | None) -> None:  # noqa: ARG001
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            send_message(connection, MessageType.CANCEL, b"")
+        except OSError:
+            pass
+
+    is_main_thread = threading.current_thread() is threading.main_thread()
+    if is_main_thread:
+        previous_handler = signal.signal(signal.SIGINT, _cancel)
+
+    try:
+        with connection:
+            send_message(connection, MessageType.REQUEST, json.dumps(request).encode())
+            while (message := receive_message(connection)) is not None:
+                type_, payload = message
+                if type_ == MessageType.OUTPUT:
+                    sys.stdout.write(payload.decode())
+                    sys.stdout.flush()
+                elif type_ == MessageType.EXIT:
+                    return int(payload)
+                elif type_ == MessageType.REJECT:
+                    return None
+    except KeyboardInterrupt:
+        sys.stderr.write("Aborted!\n")
+        return 1
+    finally:
+        if is_main_thread:
+            signal.signal(signal.SIGINT, previous_handler)
+
+    sys.stderr.write("The connection to the pytask daemon was lost.\n")
+    return 1
+
+
+def _is_forwarded(args: list[str]) -> bool:
+    """Check whether a command can be run by the daemon."""
+    if args and args[0] in _NOT_FORWARDED_COMMANDS:
+        return False
+    if any(arg.partition("=")[0] in _NOT_FORWARDED_OPTIONS for arg in args):
+        return False
+    return not _is_interactive(args)
+
+
+def _is_interactive(args: list[str]) -> bool:
+    """Check whether a command prompts the user."""
+    if not args or args[0] != "clean":
+        return False
+    return "--mode=interactive" in args or any(
+        arg == "--mode" and value == "interactive"
+        for arg, value in zip(args, args[1:])
+    )
+
+
+def main() -> NoReturn:
+    """Run pytask in the daemon of the project if possible, otherwise locally."""
+    args = sys.argv[1:]
+    if hasattr(socket, "AF_UNIX") and _is_forwarded(args):
+        socket_path = find_socket_path(Path.cwd())
+        if socket_path is not None:
+            exit_code = run_client(args, socket_path)
+            if exit_code is not None:
+                sys.exit(exit_code)
+
+    from _pytask.cli import cli
+
+    cli()
+    sys.exit(0)  # pragma: no cover
@@ -6,7 +6,6 @@ import itertools
 import sys
 from typing import TYPE_CHECKING
 
-import networkx as nx
 from rich.text import Text
 from rich.tree import Tree
 
@@ -17,7 +16,9 @@ from _pytask.console import console
 from _pytask.console import format_node_name
 from _pytask.console import format_task_name
 from _pytask.console import render_to_string
+from _pytask.dag_graph import CompactDAG
 from _pytask.exceptions import ResolvingDependenciesError
+from _pytask.mark import TaskIndex
 from _pytask.mark import select_by_after_keyword
 from _pytask.mark import select_tasks_by_marks_and_expressions
 from _pytask.node_protocols import PNode
@@ -26,18 +27,20 @@ from _pytask.node_protocols import PTask
 from _pytask.nodes import PythonNode
 from _pytask.reports import DagReport
 from _pytask.shared import reduce_names_of_multiple_nodes
-from _pytask.tree_util import tree_map
+from _pytask.tree_util import clear_flat_arguments
+from _pytask.tree_util import get_flat_arguments
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
 
     from _pytask.session import Session
 
 
-__all__ = ["create_dag", "create_dag_from_session"]
+__all__ = ["create_dag", "create_dag_from_session", "update_dag"]
 
 
-def create_dag(session: Session) -> nx.DiGraph:
+def create_dag(session: Session) -> CompactDAG:
     """Create a directed acyclic graph (DAG) for the workflow."""
     try:
         dag = create_dag_from_session(session)
@@ -50,7 +53,7 @@ def create_dag(session: Session) -> nx.DiGraph:
     return dag
 
 
-def create_dag_from_session(session: Session) -> nx.DiGraph:
+def create_dag_from_session(session: Session) -> CompactDAG:
     """Create a DAG from a session."""
     dag = _create_dag_from_tasks(tasks=session.tasks)
     _check_if_dag_has_cycles(dag)
@@ -60,11 +63,57 @@ def create_dag_from_session(session: Session) -> nx.DiGraph:
     return dag
 
 
-def _create_dag_from_tasks(tasks: list[PTask]) -> nx.DiGraph:
+def update_dag(session: Session, tasks: list[PTask]) -> None:
+    """Update the DAG in place after tasks were added or their nodes were resolved.
+
+    Instead of rebuilding the whole DAG, only the vertices and edges of the given tasks
+    are inserted. Provisional nodes that were resolved are removed. Cycles and products
+    created by multiple tasks are only searched in the part of the graph touched by the
+    update. Markers and expressions are applied to new tasks.
+
+    If the update fails, for example, because it creates a cycle, the modifications of
+    the DAG are reverted before the error is raised.
+
+    """
+    dag = session.dag
+    new_tasks = [task for task in tasks if task.signature not in dag]
+
+    with dag.transaction():
+        for task in tasks:
+            # The arguments of the tasks might have been modified in place.
+            clear_flat_arguments(task)
+            if task.signature in dag:
+                _remove_resolved_provisional_nodes(dag, task)
+            _add_task_to_dag(dag, task)
+
+        _check_if_dag_has_cycles(dag, sources=[task.signature for task in tasks])
+        _check_if_tasks_have_the_same_products(
+            dag,
+            session.config["paths"],
+            nodes=[
+                node.signature
+                for task in tasks
+                for node in get_flat_arguments(task, "produces").leaves
+            ],
+        )
+        _modify_dag(session=session, dag=dag, tasks=tasks)
+    if new_tasks:
+        select_tasks_by_marks_and_expressions(session=session, dag=dag, tasks=new_tasks)
+
+
+def _create_dag_from_tasks(tasks: list[PTask]) -> CompactDAG:
     """Create the DAG from tasks, dependencies and products."""
+    dag = CompactDAG()
+    for task in tasks:
+        _add_task_to_dag(dag, task)
+    return dag
+
+
+def _add_task_to_dag(dag: CompactDAG, task: PTask) -> None:
+    """Add a task with its dependencies and products to the DAG."""
 
     def _add_dependency(
-        dag: nx.DiGraph, task: PTask, node: PNode | PProvisionalNode
+        dag: CompactDAG, task: PTask, node: PNode | PProvisionalNode
     ) -> None:
         """Add a dependency to the DAG."""
         dag.add_node(node.signature, node=node)
@@ -77,49 +126,102 @@ def _create_dag_from_tasks(tasks: list[PTask]) -> nx.DiGraph:
             dag.add_edge(node.value.signature, node.signature)
 
     def _add_product(
-        dag: nx.DiGraph, task: PTask, node: PNode | PProvisionalNode
+        dag: CompactDAG, task: PTask, node: PNode | PProvisionalNode
     ) -> None:
         """Add a product to the DAG."""
         dag.add_node(node.signature, node=node)
         dag.add_edge(task.signature, node.signature)
 
-    dag = nx.DiGraph()
+    dag.add_node(task.signature, task=task)
 
-    for task in tasks:
-        dag.add_node(task.signature, task=task)
+    for node in get_flat_arguments(task, "depends_on").leaves:
+        _add_dependency(dag, task, node)
+    for node in get_flat_arguments(task, "produces").leaves:
+        _add_product(dag, task, node)
 
-        tree_map(lambda x: _add_dependency(dag, task, x), task.depends_on)
-        tree_map(lambda x: _add_product(dag, task, x), task.produces)
 
-        # If a node is a PythonNode wrapped in another PythonNode, it is a product from
-        # another task that is a dependency in the current task. Thus, draw an edge
-        # connecting the two nodes.
-        tree_map(
-            lambda x: dag.add_edge(x.value.signature, x.signature)
-            if isinstance(x, PythonNode) and isinstance(x.value, PythonNode)
-            else None,
-            task.depends_on,
-        )
-    return dag
+def _remove_resolved_provisional_nodes(dag: CompactDAG, task: PTask) -> None:
+    """Remove provisional nodes which the task has replaced with resolved nodes.
 
+    Edges between the task and provisional nodes that are not part of the task anymore
+    are removed. If a provisional product has no producer left, edges created by
+    ``@task(after=...)`` are removed, too, since they are recreated for the resolved
+    products. Provisional nodes without edges are deleted.
 
-def _modify_dag(session: Session, dag: nx.DiGraph) -> nx.DiGraph:
-    """Create dependencies between tasks when using ``@task(after=...)``."""
-    temporary_id_to_task = {
-        task.attributes["collection_id"]: task
-        for task in session.tasks
-        if "collection_id" in task.attributes
+    """
+    current = {
+        node.signature
+        for attribute in ("depends_on", "produces")
+        for node in get_flat_arguments(task, attribute).leaves
     }
-    for task in session.tasks:
-        after = task.attributes.get("after")
+    neighbors = {*dag.predecessors(task.signature), *dag.successors(task.signature)}
+
+    for signature in neighbors:
+        if signature in current or not isinstance(
+            dag.nodes[signature].get("node"), PProvisionalNode
+        ):
+            continue
+
+        dag.remove_edge(task.signature, signature)
+        dag.remove_edge(signature, task.signature)
+
+        if next(dag.predecessors(signature), None) is None:
+            for successor in list(dag.successors(signature)):
+                successor_task = dag.get(successor)
+                if isinstance(successor_task, PTask) and signature not in {
+                    node.signature
+                    for node in get_flat_arguments(successor_task, "depends_on").leaves
+                }:
+                    dag.remove_edge(signature, successor)
+
+        if (
+            next(dag.predecessors(signature), None) is None
+            and next(dag.successors(signature), None) is None
+        ):
+            dag.remove_node(signature)
+
+
+def _modify_dag(
+    session: Session, dag: CompactDAG, tasks: list[PTask] | None = None
+) -> CompactDAG:
+    """Create dependencies between tasks when using ``@task(after=...)``.
+
+    If ``tasks`` is given, only dependencies from or to these tasks are created, and
+    only the indexed tasks with ``after`` are visited.
+
+    """
+    after_index = session.after_index
+    if tasks is None:
+        after_index.clear()
+        after_index.add(session.tasks)
+        updated: set[str] = set()
+    else:
+        after_index.add(tasks)
+        updated = {task.signature for task in tasks}
+
+    updated_index: TaskIndex | None = None
+    for task in list(after_index.tasks_with_after.values()):
+        after = task.attributes["after"]
+        is_updated = tasks is None or task.signature in updated
         if isinstance(after, list):
             for temporary_id in after:
-                other_task = temporary_id_to_task[temporary_id]
+                other_task = after_index.collection_id_to_task[temporary_id]
+                if not is_updated and other_task.signature not in updated:
+                    continue
                 for successor in dag.successors(other_task.signature):
                     dag.add_edge(successor, task.signature)
         elif isinstance(after, str):
             task_signature = task.signature
-            signatures = select_by_after_keyword(session, after)
+            if is_updated:
+                if after_index.task_index is None:
+                    # The index owns a copy since it is extended with later updates.
+                    after_index.task_index = TaskIndex(list(session.tasks))
+                index = after_index.task_index
+            else:
+                if updated_index is None:
+                    updated_index = TaskIndex(list(tasks or ()))
+                index = updated_index
+            signatures = select_by_after_keyword(session, after, index=index)
             signatures.discard(task_signature)
             for signature in signatures:
                 for successor in dag.successors(signature):
@@ -127,13 +229,10 @@ def _modify_dag(session: Session, dag: nx.DiGraph) -> nx.DiGraph:
     return dag
 
 
-def _check_if_dag_has_cycles(dag: nx.DiGraph) -> None:
+def _check_if_dag_has_cycles(dag: CompactDAG, sources: list[str] | None = None) -> None:
     """Check if DAG has cycles."""
-    try:
-        cycles = nx.algorithms.cycles.find_cycle(dag)
-    except nx.NetworkXNoCycle:
-        pass
-    else:
+    cycles = dag.find_cycle(sources)
+    if cycles:
         msg = (
             f"The DAG contains cycles which means a dependency is directly or "
             "indirectly a product of the same task. See the following the path of "
@@ -143,7 +242,7 @@ def _check_if_dag_has_cycles(dag: nx.DiGraph) -> None:
         raise ResolvingDependenciesError(msg)
 
 
-def _format_cycles(dag: nx.DiGraph, cycles: list[tuple[str, ...]]) -> str:
+def _format_cycles(dag: CompactDAG, cycles: list[tuple[str, str]]) -> str:
     """Format cycles as a paths connected by arrows."""
     chain = [
         x for i, x in enumerate(itertools.chain.from_iterable(cycles)) if i % 2 == 0
@@ -152,7 +251,7 @@ def _format_cycles(dag: nx.DiGraph, cycles: list[tuple[str, ...]]) -> str:
 
     lines: list[str] = []
     for x in chain:
-        node = dag.nodes[x].get("task") or dag.nodes[x].get("node")
+        node = dag.get(x)
         if isinstance(node, PTask):
             short_name = format_task_name(node, editor_url_scheme="no_link").plain
         elif isinstance(node, (PNode, PProvisionalNode)):
@@ -174,22 +273,22 @@ def _format_dictionary_to_tree(dict_: dict[str, list[str]], title: str) -> str:
     return render_to_string(tree, console=console, strip_styles=True)
 
 
-def _check_if_tasks_have_the_same_products(dag: nx.DiGraph, paths: list[Path]) -> None:
-    nodes_created_by_multiple_tasks = []
-
-    for node in dag.nodes:
-        is_node = "node" in dag.nodes[node]
-        if is_node:
-            parents = list(dag.predecessors(node))
-            if len(parents) > 1:
-                nodes_created_by_multiple_tasks.append(node)
+def _check_if_tasks_have_the_same_products(
+    dag: CompactDAG, paths: list[Path], nodes: list[str] | None = None
+) -> None:
+    candidates: Iterable[str] = list(dag) if nodes is None else dict.fromkeys(nodes)
+    nodes_created_by_multiple_tasks = [
+        node
+        for node in candidates
+        if "node" in dag.nodes[node] and dag.in_degree(node) > 1
+    ]
 
     if nodes_created_by_multiple_tasks:
         dictionary = {}
         for node in nodes_created_by_multiple_tasks:
             short_node_name = format_node_name(dag.nodes[node]["node"], paths).plain
             short_predecessors = reduce_names_of_multiple_nodes(
-                dag.predecessors(node), dag, paths
+                list(dag.predecessors(node)), dag, paths
             )
             dictionary[short_node_name] = short_predecessors
         text = _format_dictionary_to_tree(dictionary, "Products from multiple tasks:")
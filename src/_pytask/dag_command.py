@@ -203,7 +203,7 @@ def build_dag(raw_config: dict[str, Any]) -> nx.DiGraph:
 
 def _refine_dag(session: Session) -> nx.DiGraph:
     """Refine the dag for plotting."""
-    dag = _shorten_node_labels(session.dag, session.config["paths"])
+    dag = _shorten_node_labels(session.dag.to_networkx(), session.config["paths"])
     dag = _clean_dag(dag)
     dag = _style_dag(dag)
     dag.graph["graph"] = {"rankdir": session.config["rank_direction"].name}
@@ -0,0 +1,681 @@
+"""Contains a compact, integer-indexed implementation of the DAG.
+
+:class:`networkx.DiGraph` stores an adjacency dictionary and an attribute dictionary
+for every vertex which becomes expensive for projects with hundreds of thousands of
+tasks and nodes. :class:`CompactDAG` assigns every signature an integer id and stores
+the edges in compressed sparse row (CSR) arrays. Traversals operate on integers and are
+translated back to signatures only at the boundary.
+
+Storing :attr:`pytask.Session.dag` as a :class:`CompactDAG` instead of a
+:class:`networkx.DiGraph` is a breaking change. To keep plugins working, other parts of
+the networkx interface are delegated to a frozen export of the graph with a
+:class:`FutureWarning`, and the graph can be passed to networkx functions.
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from array import array
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Union
+from typing import overload
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from typing import NoReturn
+
+    import networkx as nx
+    from typing_extensions import TypeAlias
+
+    from _pytask.node_protocols import PNode
+    from _pytask.node_protocols import PProvisionalNode
+    from _pytask.node_protocols import PTask
+
+
+__all__ = ["CompactDAG"]
+
+
+_Value: TypeAlias = Union["PTask", "PNode", "PProvisionalNode", None]
+
+
+# Edges are first stored in an overlay of ordered dictionaries and folded into the CSR
+# arrays once the overlay becomes large compared to the arrays. The offset makes sure
+# that small graphs are not compacted on every traversal.
+_MIN_PENDING_EDGES_BEFORE_COMPACTION = 1024
+
+
+class CompactDAG:
+    """A directed graph of tasks and nodes with integer ids and CSR adjacency.
+
+    The class mirrors the parts of the :class:`networkx.DiGraph` interface that pytask
+    and its plugins rely on, for example, ``dag.nodes[signature]["task"]``,
+    :meth:`predecessors` and :meth:`successors`. Use :meth:`to_networkx` to receive a
+    full :class:`networkx.DiGraph` for plotting or other analyses.
+
+    Other attributes of :class:`networkx.DiGraph` like ``edges`` or ``pred`` are
+    deprecated and delegated to a frozen export of the graph which is created on first
+    access and recreated after the graph is modified. Modifications of the export raise
+    an error instead of being lost.
+
+    The adjacency is stored in :class:`array.array` objects that support the buffer
+    protocol and can be wrapped by numpy without copying.
+
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._signatures: list[str] = []
+        self._values: list[_Value] = []
+        self._is_task = bytearray()
+
+        self._succ_ptr = array("q", [0])
+        self._succ_idx = array("q")
+        self._pred_ptr = array("q", [0])
+        self._pred_idx = array("q")
+
+        self._pending_succ: dict[int, dict[int, None]] = {}
+        self._pending_pred: dict[int, dict[int, None]] = {}
+        self._n_pending_edges = 0
+        self._n_removed_edges = 0
+
+        self._journal: list[tuple[Any, ...]] | None = None
+        self._networkx: nx.DiGraph | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Dunder attributes are not delegated so that networkx falls back to its
+        # defaults, for example, for ``__networkx_backend__``. Objects which are not
+        # initialized yet, for example, during unpickling, do not delegate either.
+        if name.startswith("__") or "_networkx" not in vars(self):
+            msg = f"{type(self).__name__!r} object has no attribute {name!r}"
+            raise AttributeError(msg)
+        return getattr(self._as_networkx(), name)
+
+    def __contains__(self, signature: object) -> bool:
+        return signature in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _as_networkx(self) -> nx.DiGraph:
+        """Return a frozen export for the deprecated parts of the networkx interface."""
+        if self._networkx is None:
+            import networkx as nx
+
+            warnings.warn(
+                "The DAG of the session is a 'CompactDAG' and not a "
+                "'networkx.DiGraph' anymore. Attributes of 'networkx.DiGraph' which "
+                "are not implemented by 'CompactDAG' are deprecated and will be "
+                "removed. Use 'session.dag.to_networkx()' to receive a "
+                "'networkx.DiGraph'.",
+                category=FutureWarning,
+                stacklevel=3,
+            )
+            self._networkx = nx.freeze(self.to_networkx())
+        return self._networkx
+
+    @property
+    def nodes(self) -> _NodeView:
+        """A view on the vertices similar to :attr:`networkx.DiGraph.nodes`."""
+        return _NodeView(self)
+
+    def is_directed(self) -> bool:
+        """Return ``True`` since the graph is always directed."""
+        return True
+
+    def number_of_nodes(self) -> int:
+        """Return the number of vertices."""
+        return len(self._ids)
+
+    def number_of_edges(self) -> int:
+        """Return the number of edges."""
+        return len(self._succ_idx) - self._n_removed_edges + self._n_pending_edges
+
+    def add_node(
+        self,
+        signature: str,
+        *,
+        task: PTask | None = None,
+        node: PNode | PProvisionalNode | None = None,
+    ) -> int:
+        """Add a task or a node to the graph and return its id.
+
+        Like :meth:`networkx.DiGraph.add_node`, adding an existing signature replaces
+        the stored object.
+
+        """
+        self._networkx = None
+        value = task if task is not None else node
+        id_ = self._ids.get(signature)
+        if id_ is None:
+            id_ = len(self._signatures)
+            self._ids[signature] = id_
+            self._signatures.append(signature)
+            self._values.append(value)
+            self._is_task.append(task is not None)
+            if self._journal is not None:
+                self._journal.append(("add_node", id_))
+        elif value is not None:
+            if self._journal is not None:
+                self._journal.append(
+                    ("set_value", id_, self._values[id_], self._is_task[id_])
+                )
+            self._values[id_] = value
+            self._is_task[id_] = task is not None
+        return id_
+
+    def add_edge(self, source: str, target: str) -> None:
+        """Add an edge and create missing vertices without a value."""
+        u = self._ids.get(source)
+        if u is None:
+            u = self.add_node(source)
+        v = self._ids.get(target)
+        if v is None:
+            v = self.add_node(target)
+        self._add_edge_by_id(u, v)
+
+    def _add_edge_by_id(self, u: int, v: int) -> None:
+        pending = self._pending_succ.setdefault(u, {})
+        if v in pending or v in self._csr_row(self._succ_ptr, self._succ_idx, u):
+            return
+        pending[v] = None
+        self._pending_pred.setdefault(v, {})[u] = None
+        self._n_pending_edges += 1
+        self._networkx = None
+        if self._journal is not None:
+            self._journal.append(("add_edge", u, v))
+
+    def remove_edge(self, source: str, target: str) -> None:
+        """Remove an edge if it exists.
+
+        Edges stored in the CSR arrays are replaced with a tombstone which is dropped
+        during the next compaction.
+
+        """
+        self._networkx = None
+        u = self._ids[source]
+        v = self._ids[target]
+        pending = self._pending_succ.get(u)
+        if pending and v in pending:
+            del pending[v]
+            del self._pending_pred[v][u]
+            self._n_pending_edges -= 1
+        elif _tombstone(self._succ_ptr, self._succ_idx, u, v):
+            _tombstone(self._pred_ptr, self._pred_idx, v, u)
+            self._n_removed_edges += 1
+        else:
+            return
+        if self._journal is not None:
+            self._journal.append(("remove_edge", u, v))
+
+    def remove_node(self, signature: str) -> None:
+        """Remove a vertex and all its edges."""
+        id_ = self._ids[signature]
+        for predecessor in list(self.predecessors(signature)):
+            self.remove_edge(predecessor, signature)
+        for successor in list(self.successors(signature)):
+            self.remove_edge(signature, successor)
+        if self._journal is not None:
+            self._journal.append(
+                ("remove_node", id_, self._values[id_], self._is_task[id_])
+            )
+        del self._ids[signature]
+        self._values[id_] = None
+        self._is_task[id_] = False
+        self._networkx = None
+
+    @contextmanager
+    def transaction(self) -> Generator[None, None, None]:
+        """Revert all modifications of the graph if an error is raised in the context.
+
+        Vertices which were added are removed and keep their ids like vertices removed
+        with :meth:`remove_node`. Transactions cannot be nested.
+
+        """
+        if self._journal is not None:
+            msg = "Transactions of a 'CompactDAG' cannot be nested."
+            raise RuntimeError(msg)
+
+        self._journal = journal = []
+        try:
+            yield
+        except BaseException:
+            self._journal = None
+            self._revert(journal)
+            raise
+        finally:
+            self._journal = None
+
+    def _revert(self, journal: list[tuple[Any, ...]]) -> None:
+        """Revert the modifications recorded in a journal in reverse order."""
+        for kind, *args in reversed(journal):
+            if kind == "add_node":
+                (id_,) = args
+                del self._ids[self._signatures[id_]]
+                self._values[id_] = None
+                self._is_task[id_] = False
+            elif kind == "remove_node":
+                id_, value, is_task = args
+                self._ids[self._signatures[id_]] = id_
+                self._values[id_] = value
+                self._is_task[id_] = is_task
+            elif kind == "set_value":
+                id_, value, is_task = args
+                self._values[id_] = value
+                self._is_task[id_] = is_task
+            elif kind == "add_edge":
+                u, v = args
+                self.remove_edge(self._signatures[u], self._signatures[v])
+            elif kind == "remove_edge":
+                u, v = args
+                self._add_edge_by_id(u, v)
+        self._networkx = None
+
+    def id_of(self, signature: str) -> int:
+        """Return the integer id of a signature."""
+        return self._ids[signature]
+
+    def signature_of(self, id_: int) -> str:
+        """Return the signature of an integer id."""
+        return self._signatures[id_]
+
+    def get(self, signature: str) -> PTask | PNode | PProvisionalNode:
+        """Return the task or node stored for a signature."""
+        value = self._values[self._ids[signature]]
+        if value is None:
+            msg = f"No task or node is stored for {signature!r}."
+            raise KeyError(msg)
+        return value
+
+    def get_task(self, signature: str) -> PTask:
+        """Return the task stored for a signature."""
+        if not self.is_task(signature):
+            msg = f"{signature!r} is not a task."
+            raise KeyError(msg)
+        return self._values[self._ids[signature]]  # type: ignore[return-value]
+
+    def get_node(self, signature: str) -> PNode | PProvisionalNode:
+        """Return the node stored for a signature."""
+        if self.is_task(signature):
+            msg = f"{signature!r} is a task and not a node."
+            raise KeyError(msg)
+        return self.get(signature)  # type: ignore[return-value]
+
+    def is_task(self, signature: str) -> bool:
+        """Indicate whether the signature belongs to a task."""
+        return bool(self._is_task[self._ids[signature]])
+
+    def tasks(self) -> list[PTask]:
+        """Return all tasks in the order they were added."""
+        return [
+            self._values[id_]  # type: ignore[misc]
+            for id_ in self._ids.values()
+            if self._is_task[id_]
+        ]
+
+    def tasks_from_signatures(self, signatures: Iterable[str]) -> list[PTask]:
+        """Return the tasks among some signatures."""
+        return [
+            self._values[id_]  # type: ignore[misc]
+            for id_ in (self._ids[signature] for signature in signatures)
+            if self._is_task[id_]
+        ]
+
+    def predecessors(self, signature: str) -> Iterator[str]:
+        """Yield the signatures of all direct predecessors."""
+        signatures = self._signatures
+        return (signatures[i] for i in self._predecessor_ids(self._ids[signature]))
+
+    def successors(self, signature: str) -> Iterator[str]:
+        """Yield the signatures of all direct successors."""
+        signatures = self._signatures
+        return (signatures[i] for i in self._successor_ids(self._ids[signature]))
+
+    @overload
+    def in_degree(self, signature: str) -> int: ...
+
+    @overload
+    def in_degree(self, signature: None = ...) -> Any: ...
+
+    def in_degree(self, signature: str | None = None) -> Any:
+        """Return the number of direct predecessors.
+
+        Without a signature, the deprecated degree view of networkx is returned.
+
+        """
+        if signature is None:
+            return self._as_networkx().in_degree()
+        return sum(1 for _ in self._predecessor_ids(self._ids[signature]))
+
+    def descendants(self, signature: str) -> set[str]:
+        """Return all vertices reachable from a vertex."""
+        id_ = self._ids[signature]
+        reachable = self._reachable((id_,), forward=True)
+        reachable.discard(id_)
+        return {self._signatures[i] for i in reachable}
+
+    def ancestors(self, signature: str) -> set[str]:
+        """Return all vertices from which a vertex is reachable."""
+        id_ = self._ids[signature]
+        reachable = self._reachable((id_,), forward=False)
+        reachable.discard(id_)
+        return {self._signatures[i] for i in reachable}
+
+    def descendants_of(self, signatures: Iterable[str]) -> set[str]:
+        """Return all vertices reachable from any of the vertices.
+
+        Unlike calling :meth:`descendants` for each vertex, the graph is traversed only
+        once. The vertices themselves are only included if they are reachable from
+        another one.
+
+        """
+        reachable = self._reachable(
+            [self._ids[signature] for signature in signatures], forward=True
+        )
+        return {self._signatures[i] for i in reachable}
+
+    def ancestors_of(self, signatures: Iterable[str]) -> set[str]:
+        """Return all vertices from which any of the vertices is reachable.
+
+        Unlike calling :meth:`ancestors` for each vertex, the graph is traversed only
+        once. The vertices themselves are only included if they are reachable from
+        another one.
+
+        """
+        reachable = self._reachable(
+            [self._ids[signature] for signature in signatures], forward=False
+        )
+        return {self._signatures[i] for i in reachable}
+
+    def find_cycle(self, sources: Iterable[str] | None = None) -> list[tuple[str, str]]:
+        """Find a cycle and return it as a list of edges.
+
+        The format matches :func:`networkx.find_cycle`. An empty list is returned if the
+        graph is acyclic. If ``sources`` are given, only the part of the graph reachable
+        from the sources is searched which is sufficient to check whether newly added
+        vertices and edges created a cycle.
+
+        """
+        self._maybe_compact()
+        white, gray, black = 0, 1, 2
+        color = bytearray(len(self._signatures))
+        roots = (
+            self._ids.values()
+            if sources is None
+            else [self._ids[signature] for signature in sources]
+        )
+
+        for root in roots:
+            if color[root] != white:
+                continue
+            color[root] = gray
+            path = [root]
+            stack = [iter(self._successor_ids(root))]
+            while stack:
+                for child in stack[-1]:
+                    if color[child] == white:
+                        color[child] = gray
+                        path.append(child)
+                        stack.append(iter(self._successor_ids(child)))
+                        break
+                    if color[child] == gray:
+                        cycle = path[path.index(child) :]
+                        return [
+                            (self._signatures[a], self._signatures[b])
+                            for a, b in zip(cycle, [*cycle[1:], child])
+                        ]
+                else:
+                    color[path.pop()] = black
+                    stack.pop()
+        return []
+
+    def task_successors(
+        self, signatures: Iterable[str] | None = None
+    ) -> dict[str, list[str]]:
+        """Map each task to the closest tasks that depend on it.
+
+        Non-task vertices between two tasks are skipped so that the result describes
+        the dependencies between tasks only. Pass ``signatures`` to restrict the
+        result to some tasks.
+
+        """
+        return self._closest_tasks(signatures, forward=True)
+
+    def task_predecessors(
+        self, signatures: Iterable[str] | None = None
+    ) -> dict[str, list[str]]:
+        """Map each task to the closest tasks it depends on."""
+        return self._closest_tasks(signatures, forward=False)
+
+    def _closest_tasks(
+        self, signatures: Iterable[str] | None, *, forward: bool
+    ) -> dict[str, list[str]]:
+        self._maybe_compact()
+        neighbors = self._successor_ids if forward else self._predecessor_ids
+        is_task = self._is_task
+        ids = (
+            self._ids.values()
+            if signatures is None
+            else [self._ids[signature] for signature in signatures]
+        )
+        result: dict[str, list[str]] = {}
+
+        for id_ in ids:
+            if not is_task[id_]:
+                continue
+            found: dict[int, None] = {}
+            seen = {id_}
+            stack = list(neighbors(id_))
+            while stack:
+                child = stack.pop()
+                if child in seen:
+                    continue
+                seen.add(child)
+                if is_task[child]:
+                    found[child] = None
+                else:
+                    stack.extend(neighbors(child))
+            result[self._signatures[id_]] = [self._signatures[i] for i in found]
+
+        return result
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Export the graph to a :class:`networkx.DiGraph`."""
+        import networkx as nx
+
+        dag = nx.DiGraph()
+        for signature, id_ in self._ids.items():
+            value = self._values[id_]
+            if value is None:
+                dag.add_node(signature)
+            elif self._is_task[id_]:
+                dag.add_node(signature, task=value)
+            else:
+                dag.add_node(signature, node=value)
+        for signature, id_ in self._ids.items():
+            dag.add_edges_from(
+                (signature, self._signatures[i]) for i in self._successor_ids(id_)
+            )
+        return dag
+
+    @classmethod
+    def from_networkx(cls, dag: nx.DiGraph) -> CompactDAG:
+        """Create the graph from a :class:`networkx.DiGraph`."""
+        new = cls()
+        for signature, data in dag.nodes(data=True):
+            new.add_node(signature, task=data.get("task"), node=data.get("node"))
+        for source, target in dag.edges:
+            new.add_edge(source, target)
+        return new
+
+    def _successor_ids(self, id_: int) -> Iterable[int]:
+        row: Iterable[int] = self._csr_row(self._succ_ptr, self._succ_idx, id_)
+        if self._n_removed_edges:
+            row = [i for i in row if i >= 0]
+        pending = self._pending_succ.get(id_)
+        return [*row, *pending] if pending else row
+
+    def _predecessor_ids(self, id_: int) -> Iterable[int]:
+        row: Iterable[int] = self._csr_row(self._pred_ptr, self._pred_idx, id_)
+        if self._n_removed_edges:
+            row = [i for i in row if i >= 0]
+        pending = self._pending_pred.get(id_)
+        return [*row, *pending] if pending else row
+
+    @staticmethod
+    def _csr_row(indptr: array[int], indices: array[int], id_: int) -> array[int]:
+        if id_ + 1 < len(indptr):
+            return indices[indptr[id_] : indptr[id_ + 1]]
+        return indices[0:0]
+
+    def _reachable(self, sources: Iterable[int], *, forward: bool) -> set[int]:
+        """Return all ids reachable from any source following edges in a direction."""
+        self._maybe_compact()
+        neighbors = self._successor_ids if forward else self._predecessor_ids
+        seen: set[int] = set()
+        stack = list(sources)
+        while stack:
+            for child in neighbors(stack.pop()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return seen
+
+    def _maybe_compact(self) -> None:
+        threshold = len(self._succ_idx) // 4 + _MIN_PENDING_EDGES_BEFORE_COMPACTION
+        if self._n_pending_edges + self._n_removed_edges > threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold all pending edges into the CSR arrays."""
+        n = len(self._signatures)
+        self._succ_ptr, self._succ_idx = _merge_into_csr(
+            n, self._succ_ptr, self._succ_idx, self._pending_succ
+        )
+        self._pred_ptr, self._pred_idx = _merge_into_csr(
+            n, self._pred_ptr, self._pred_idx, self._pending_pred
+        )
+        self._pending_succ.clear()
+        self._pending_pred.clear()
+        self._n_pending_edges = 0
+        self._n_removed_edges = 0
+
+
+def _tombstone(indptr: array[int], indices: array[int], row: int, column: int) -> bool:
+    """Replace an entry of a row in CSR arrays with a tombstone."""
+    if row + 1 >= len(indptr):
+        return False
+    for position in range(indptr[row], indptr[row + 1]):
+        if indices[position] == column:
+            indices[position] = -1
+            return True
+    return False
+
+
+def _merge_into_csr(
+    n: int,
+    indptr: array[int],
+    indices: array[int],
+    pending: dict[int, dict[int, None]],
+) -> tuple[array[int], array[int]]:
+    """Create new CSR arrays from existing arrays and pending edges."""
+    new_indptr = array("q", [0])
+    new_indices = array("q")
+    n_indexed = len(indptr) - 1
+    for id_ in range(n):
+        if id_ < n_indexed:
+            new_indices.extend(
+                i for i in indices[indptr[id_] : indptr[id_ + 1]] if i >= 0
+            )
+        extra = pending.get(id_)
+        if extra:
+            new_indices.extend(extra)
+        new_indptr.append(len(new_indices))
+    return new_indptr, new_indices
+
+
+class _NodeData(Mapping[str, Any]):
+    """The data of a vertex which raises an error when it is modified.
+
+    The data is created on every access, so modifications would be lost silently.
+
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, **data: Any) -> None:
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def __setitem__(self, key: str, value: Any) -> NoReturn:
+        _raise_read_only()
+
+    def __delitem__(self, key: str) -> NoReturn:
+        _raise_read_only()
+
+    def update(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _raise_read_only()
+
+
+def _raise_read_only() -> NoReturn:
+    msg = (
+        "The data of vertices in a 'CompactDAG' cannot be modified. Store "
+        "additional information in the 'attributes' of tasks and nodes or use "
+        "'session.dag.to_networkx()' to receive a modifiable 'networkx.DiGraph'."
+    )
+    raise TypeError(msg)
+
+
+class _NodeView:
+    """A read-only view on the vertices mimicking :class:`networkx.NodeView`."""
+
+    __slots__ = ("_dag",)
+
+    def __init__(self, dag: CompactDAG) -> None:
+        self._dag = dag
+
+    def __getitem__(self, signature: str) -> Mapping[str, Any]:
+        dag = self._dag
+        id_ = dag._ids[signature]
+        value = dag._values[id_]
+        if value is None:
+            return _NodeData()
+        return _NodeData(task=value) if dag._is_task[id_] else _NodeData(node=value)
+
+    def __call__(self, data: bool | str = False, default: Any = None) -> Any:
+        """Return the view or, like networkx, a deprecated view with data."""
+        if data is False:
+            return self
+        return self._dag._as_networkx().nodes(data=data, default=default)
+
+    def data(self, data: bool | str = True, default: Any = None) -> Any:
+        """Return a deprecated view with data like :meth:`networkx.NodeView.data`."""
+        return self._dag._as_networkx().nodes.data(data=data, default=default)
+
+    def __contains__(self, signature: object) -> bool:
+        return signature in self._dag._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dag._ids)
+
+    def __len__(self) -> int:
+        return len(self._dag._ids)
@@ -2,53 +2,133 @@
 
 from __future__ import annotations
 
+import heapq
 import itertools
+import warnings
 from typing import TYPE_CHECKING
+from typing import Union
 
-import networkx as nx
 from attrs import define
 from attrs import field
 
+from _pytask.dag_graph import CompactDAG
 from _pytask.mark_utils import has_mark
 
 if TYPE_CHECKING:
     from collections.abc import Generator
     from collections.abc import Iterable
 
+    import networkx as nx
+    from typing_extensions import TypeAlias
+
+    from _pytask.mark import Mark
+    from _pytask.mark import TaskIndex
     from _pytask.node_protocols import PTask
+    from _pytask.outcomes import TaskOutcome
+    from _pytask.session import Session
+
+    AnyDAG: TypeAlias = Union[CompactDAG, nx.DiGraph]
+
+
+def _descendants(dag: AnyDAG, node: str) -> set[str]:
+    if isinstance(dag, CompactDAG):
+        return dag.descendants(node)
+    import networkx as nx
+
+    return nx.descendants(dag, node)
+
+
+def _ancestors(dag: AnyDAG, node: str) -> set[str]:
+    if isinstance(dag, CompactDAG):
+        return dag.ancestors(node)
+    import networkx as nx
+
+    return nx.ancestors(dag, node)
+
+
+def _descendants_of(dag: AnyDAG, nodes: Iterable[str]) -> set[str]:
+    if isinstance(dag, CompactDAG):
+        return dag.descendants_of(nodes)
+    import networkx as nx
+
+    return set().union(*(nx.descendants(dag, node) for node in nodes))
+
+
+def _ancestors_of(dag: AnyDAG, nodes: Iterable[str]) -> set[str]:
+    if isinstance(dag, CompactDAG):
+        return dag.ancestors_of(nodes)
+    import networkx as nx
+
+    return set().union(*(nx.ancestors(dag, node) for node in nodes))
+
 
+def _is_task(dag: AnyDAG, node: str) -> bool:
+    if isinstance(dag, CompactDAG):
+        return dag.is_task(node)
+    return "task" in dag.nodes[node]
 
-def descending_tasks(task_name: str, dag: nx.DiGraph) -> Generator[str, None, None]:
+
+def descending_tasks(task_name: str, dag: AnyDAG) -> Generator[str, None, None]:
     """Yield only descending tasks."""
-    for descendant in nx.descendants(dag, task_name):
-        if "task" in dag.nodes[descendant]:
+    for descendant in _descendants(dag, task_name):
+        if _is_task(dag, descendant):
             yield descendant
 
 
 def task_and_descending_tasks(
-    task_name: str, dag: nx.DiGraph
+    task_name: str, dag: AnyDAG
 ) -> Generator[str, None, None]:
     """Yield task and descending tasks."""
     yield task_name
     yield from descending_tasks(task_name, dag)
 
 
-def preceding_tasks(task_name: str, dag: nx.DiGraph) -> Generator[str, None, None]:
+def preceding_tasks(task_name: str, dag: AnyDAG) -> Generator[str, None, None]:
     """Yield only preceding tasks."""
-    for ancestor in nx.ancestors(dag, task_name):
-        if "task" in dag.nodes[ancestor]:
+    for ancestor in _ancestors(dag, task_name):
+        if _is_task(dag, ancestor):
             yield ancestor
 
 
-def task_and_preceding_tasks(
-    task_name: str, dag: nx.DiGraph
-) -> Generator[str, None, None]:
+def task_and_preceding_tasks(task_name: str, dag: AnyDAG) -> Generator[str, None, None]:
     """Yield task and preceding tasks."""
     yield task_name
     yield from preceding_tasks(task_name, dag)
 
 
-def node_and_neighbors(dag: nx.DiGraph, node: str) -> Iterable[str]:
+def tasks_and_descending_tasks(task_names: Iterable[str], dag: AnyDAG) -> set[str]:
+    """Return tasks and all their descending tasks with a single traversal."""
+    task_names = set(task_names)
+    return task_names | {
+        node for node in _descendants_of(dag, task_names) if _is_task(dag, node)
+    }
+
+
+def tasks_and_preceding_tasks(task_names: Iterable[str], dag: AnyDAG) -> set[str]:
+    """Return tasks and all their preceding tasks with a single traversal."""
+    task_names = set(task_names)
+    return task_names | {
+        node for node in _ancestors_of(dag, task_names) if _is_task(dag, node)
+    }
+
+
+def count_dependent_tasks(node: str, dag: AnyDAG) -> int:
+    """Count the tasks which depend on a node directly or through other nodes.
+
+    Products of tasks which are dependencies of other tasks might be wrapped in other
+    nodes which are the successors of the product instead of the tasks.
+
+    """
+    n_tasks = 0
+    for successor in dag.successors(node):
+        if _is_task(dag, successor):
+            n_tasks += 1
+        else:
+            n_tasks += count_dependent_tasks(successor, dag)
+    return n_tasks
+
+
+def node_and_neighbors(dag: AnyDAG, node: str) -> Iterable[str]:
     """Yield node and neighbors which are first degree predecessors and successors.
 
     We cannot use ``dag.neighbors`` as it only considers successors as neighbors in a
@@ -61,93 +141,342 @@ def node_and_neighbors(dag: nx.DiGraph, node: str) -> Iterable[str]:
     return itertools.chain(dag.predecessors(node), [node], dag.successors(node))
 
 
+@define
+class AfterIndex:
+    """An index of tasks which is needed to create dependencies with ``after``.
+
+    The index is created with the DAG of a session and extended with the tasks of
+    incremental updates. So, the updates visit only the tasks with ``after`` instead of
+    all tasks.
+
+    Attributes
+    ----------
+    tasks_with_after
+        The tasks with ``after`` by their signatures.
+    collection_id_to_task
+        The tasks by the ids which are used in ``after`` to refer to tasks.
+    task_index
+        An index of all tasks to evaluate expressions used in ``after``. It is created
+        when it is needed for the first time.
+
+    """
+
+    tasks_with_after: dict[str, PTask] = field(factory=dict)
+    collection_id_to_task: dict[str, PTask] = field(factory=dict)
+    task_index: TaskIndex | None = None
+    _signatures: set[str] = field(factory=set)
+
+    def add(self, tasks: Iterable[PTask]) -> None:
+        """Add tasks to the index."""
+        new_tasks = []
+        for task in tasks:
+            if "collection_id" in task.attributes:
+                self.collection_id_to_task[task.attributes["collection_id"]] = task
+            if task.attributes.get("after"):
+                self.tasks_with_after[task.signature] = task
+            if task.signature not in self._signatures:
+                self._signatures.add(task.signature)
+                new_tasks.append(task)
+        if self.task_index is not None:
+            self.task_index.extend(new_tasks)
+
+    def clear(self) -> None:
+        """Remove all tasks from the index."""
+        self.tasks_with_after.clear()
+        self.collection_id_to_task.clear()
+        self.task_index = None
+        self._signatures.clear()
+
+
 @define
 class TopologicalSorter:
     """The topological sorter class.
 
-    This class allows to perform a topological sort#
+    This class allows to perform a topological sort.
+
+    Only the dependencies between tasks are stored. A task becomes ready once all its
+    closest preceding tasks are done. Ready tasks are kept in a heap ordered by their
+    priorities so that requesting the next task does not require sorting all ready
+    tasks.
 
     Attributes
     ----------
-    dag
-        Not the full DAG, but a reduced version that only considers tasks.
+    successors
+        A mapping from each task to the closest tasks that depend on it.
     priorities
         A dictionary of task names to a priority value. 1 for try first, 0 for the
         default priority and, -1 for try last.
 
+    Tasks which failed, were skipped or would be executed block all their descending
+    tasks. Instead of marking every descending task, the set of blocking tasks is
+    handed from a task to its closest successors when it is done. Tasks in a chain
+    share the same set, so propagating it costs O(1) per task. Use
+    :meth:`blocked_by` to resolve the blocking tasks of a task.
+
     """
 
-    dag: nx.DiGraph
+    successors: dict[str, list[str]]
     priorities: dict[str, int] = field(factory=dict)
+    _in_degrees: dict[str, int] = field(factory=dict)
+    _ready: list[tuple[int, int, str]] = field(factory=list)
+    _counter: itertools.count[int] = field(factory=itertools.count)
+    _n_remaining: int = 0
     _nodes_processing: set[str] = field(factory=set)
     _nodes_done: set[str] = field(factory=set)
+    _blocking: dict[str, tuple[int, TaskOutcome]] = field(factory=dict)
+    _blocked_by: dict[str, frozenset[str]] = field(factory=dict)
+    _outcomes: dict[frozenset[str], set[TaskOutcome]] = field(factory=dict)
+
+    def __attrs_post_init__(self) -> None:
+        in_degrees = dict.fromkeys(self.successors, 0)
+        for successors in self.successors.values():
+            for successor in successors:
+                in_degrees[successor] += 1
+        self._in_degrees = in_degrees
+        self._n_remaining = len(in_degrees)
+        for task, degree in in_degrees.items():
+            if degree == 0:
+                self._push(task)
+
+    @property
+    def dag(self) -> nx.DiGraph:
+        """A frozen DAG of the tasks which are not done yet.
+
+        The attribute is deprecated. Use :attr:`successors` instead.
+
+        """
+        import networkx as nx
+
+        warnings.warn(
+            "'TopologicalSorter.dag' is deprecated and will be removed. The sorter "
+            "stores only the closest successors of each task in "
+            "'TopologicalSorter.successors'.",
+            category=FutureWarning,
+            stacklevel=2,
+        )
+        remaining = [task for task in self.successors if task not in self._nodes_done]
+        dag = nx.DiGraph()
+        dag.add_nodes_from(remaining)
+        dag.add_edges_from(
+            (task, successor)
+            for task in remaining
+            for successor in self.successors[task]
+        )
+        return nx.freeze(dag)
 
     @classmethod
-    def from_dag(cls, dag: nx.DiGraph) -> TopologicalSorter:
+    def from_dag(cls, dag: AnyDAG) -> TopologicalSorter:
         """Instantiate from a DAG."""
         cls.check_dag(dag)
 
-        tasks = [
-            dag.nodes[node]["task"] for node in dag.nodes if "task" in dag.nodes[node]
-        ]
-        priorities = _extract_priorities_from_tasks(tasks)
+        if not isinstance(dag, CompactDAG):
+            dag = CompactDAG.from_networkx(dag)
 
-        task_signatures = {task.signature for task in tasks}
-        task_dict = {s: nx.ancestors(dag, s) & task_signatures for s in task_signatures}
-        task_dag = nx.DiGraph(task_dict).reverse()
-
-        return cls(dag=task_dag, priorities=priorities)
+        priorities = _extract_priorities_from_tasks(dag.tasks())
+        return cls(successors=dag.task_successors(), priorities=priorities)
 
     @classmethod
     def from_dag_and_sorter(
-        cls, dag: nx.DiGraph, sorter: TopologicalSorter
+        cls, dag: AnyDAG, sorter: TopologicalSorter
     ) -> TopologicalSorter:
         """Instantiate a sorter from another sorter and a DAG."""
         new_sorter = cls.from_dag(dag)
+        new_sorter._blocking = sorter._blocking
+        new_sorter._blocked_by = sorter._blocked_by
+        new_sorter._outcomes = sorter._outcomes
         new_sorter.done(*sorter._nodes_done)
         new_sorter._nodes_processing = sorter._nodes_processing
         return new_sorter
 
     @staticmethod
-    def check_dag(dag: nx.DiGraph) -> None:
+    def check_dag(dag: AnyDAG) -> None:
         if not dag.is_directed():
             msg = "Only directed graphs have a topological order."
             raise ValueError(msg)
 
-        try:
-            nx.algorithms.cycles.find_cycle(dag)
-        except nx.NetworkXNoCycle:
-            pass
+        if isinstance(dag, CompactDAG):
+            has_cycle = bool(dag.find_cycle())
         else:
+            import networkx as nx
+
+            try:
+                nx.algorithms.cycles.find_cycle(dag)
+            except nx.NetworkXNoCycle:
+                has_cycle = False
+            else:
+                has_cycle = True
+
+        if has_cycle:
             msg = "The DAG contains cycles."
             raise ValueError(msg)
 
+    def _push(self, task: str) -> None:
+        heapq.heappush(
+            self._ready, (-self.priorities.get(task, 0), next(self._counter), task)
+        )
+
     def get_ready(self, n: int = 1) -> list[str]:
         """Get up to ``n`` tasks which are ready."""
         if not isinstance(n, int) or n < 1:
             msg = "'n' must be an integer greater or equal than 1."
             raise ValueError(msg)
 
-        ready_nodes = {
-            v for v, d in self.dag.in_degree() if d == 0
-        } - self._nodes_processing
-        prioritized_nodes = sorted(
-            ready_nodes, key=lambda x: self.priorities.get(x, 0)
-        )[-n:]
+        prioritized_nodes: list[str] = []
+        while self._ready and len(prioritized_nodes) < n:
+            _, _, task = heapq.heappop(self._ready)
+            if (
+                task in self._nodes_processing
+                or task in self._nodes_done
+                or self._in_degrees[task]
+            ):
+                continue
+            prioritized_nodes.append(task)
 
         self._nodes_processing.update(prioritized_nodes)
 
         return prioritized_nodes
 
+    def peek_ready(self, n: int = 1) -> list[str]:
+        """Get up to ``n`` tasks which are handed out next without marking them.
+
+        Fewer tasks might be returned if outdated entries are among the next ones.
+
+        """
+        return [
+            task
+            for _, _, task in heapq.nsmallest(n, self._ready)
+            if task not in self._nodes_processing
+            and task not in self._nodes_done
+            and not self._in_degrees[task]
+        ]
+
     def is_active(self) -> bool:
         """Indicate whether there are still tasks left."""
-        return bool(self.dag.nodes)
+        return self._n_remaining > 0
+
+    def update(self, dag: CompactDAG, signatures: Iterable[str]) -> None:
+        """Update the sorter in place after tasks were added or changed in the DAG.
+
+        New tasks are registered and the dependencies of all given tasks are added.
+        Dependencies are never removed since provisional nodes are only resolved while
+        the task is processed.
+
+        """
+        signatures = list(signatures)
+        new_tasks = [
+            task
+            for task in dag.tasks_from_signatures(signatures)
+            if task.signature not in self._in_degrees
+        ]
+        self.priorities.update(_extract_priorities_from_tasks(new_tasks))
+        for task in new_tasks:
+            self.successors[task.signature] = []
+            self._in_degrees[task.signature] = 0
+            self._n_remaining += 1
+
+        for signature, successors in dag.task_successors(signatures).items():
+            for successor in successors:
+                self._add_dependency(signature, successor)
+        for signature, predecessors in dag.task_predecessors(signatures).items():
+            for predecessor in predecessors:
+                self._add_dependency(predecessor, signature)
+
+        for task in new_tasks:
+            if self._in_degrees[task.signature] == 0:
+                self._push(task.signature)
+
+    def _add_dependency(self, predecessor: str, successor: str) -> None:
+        successors = self.successors[predecessor]
+        if successor in successors:
+            return
+        successors.append(successor)
+        if predecessor in self._nodes_done:
+            self._propagate_blocking(predecessor, [successor])
+        elif successor not in self._nodes_done:
+            self._in_degrees[successor] += 1
+
+    def block(self, signature: str, outcome: TaskOutcome) -> None:
+        """Block all descending tasks of a task because of its outcome.
+
+        The task has to be blocked before it is marked as done. If the task is already
+        blocked by a preceding task with the same outcome, its descending tasks are
+        blocked already and nothing changes.
+
+        """
+        blocking = self._blocked_by.get(signature)
+        if blocking and outcome in self._outcomes_of(blocking):
+            return
+        self._blocking[signature] = (len(self._blocking), outcome)
+
+    def blocked_by(self, signature: str) -> dict[str, TaskOutcome]:
+        """Return the preceding tasks blocking a task and their outcomes.
+
+        The tasks are ordered by the time they were blocked.
+
+        """
+        blocking = self._blocked_by.get(signature)
+        if not blocking:
+            return {}
+        return {
+            task: self._blocking[task][1]
+            for task in sorted(blocking, key=lambda x: self._blocking[x][0])
+        }
+
+    def _outcomes_of(self, blocking: frozenset[str]) -> set[TaskOutcome]:
+        # Sets are shared between many tasks and their hashes are cached.
+        outcomes = self._outcomes.get(blocking)
+        if outcomes is None:
+            outcomes = {self._blocking[task][1] for task in blocking}
+            self._outcomes[blocking] = outcomes
+        return outcomes
+
+    def _propagate_blocking(self, node: str, successors: Iterable[str]) -> None:
+        blocking = self._blocked_by.get(node, frozenset())
+        if node in self._blocking:
+            blocking = blocking | {node}
+        if not blocking:
+            return
+
+        for successor in successors:
+            existing = self._blocked_by.get(successor)
+            if existing is None:
+                self._blocked_by[successor] = blocking
+            elif not blocking <= existing:
+                self._blocked_by[successor] = existing | blocking
 
     def done(self, *nodes: str) -> None:
         """Mark some tasks as done."""
         self._nodes_processing = self._nodes_processing - set(nodes)
-        self.dag.remove_nodes_from(nodes)
-        self._nodes_done.update(nodes)
+        for node in nodes:
+            if node in self._nodes_done:
+                continue
+            self._nodes_done.add(node)
+            if node in self._in_degrees:
+                self._n_remaining -= 1
+            successors = self.successors.get(node, ())
+            self._propagate_blocking(node, successors)
+            for successor in successors:
+                self._in_degrees[successor] -= 1
+                if self._in_degrees[successor] == 0:
+                    self._push(successor)
+
+
+def block_descending_tasks(
+    session: Session, task: PTask, outcome: TaskOutcome, mark: Mark
+) -> None:
+    """Prevent the execution of the tasks depending on a task because of its outcome.
+
+    The :class:`TopologicalSorter` blocks the descending tasks lazily. Other schedulers
+    do not support blocking. Then, the marker is attached to all descending tasks which
+    are skipped during their setup.
+
+    """
+    if isinstance(session.scheduler, TopologicalSorter):
+        session.scheduler.block(task.signature, outcome)
+        return
+
+    for signature in descending_tasks(task.signature, session.dag):
+        session.dag.nodes[signature]["task"].markers.append(mark)
 
 
 def _extract_priorities_from_tasks(tasks: list[PTask]) -> dict[str, int]:
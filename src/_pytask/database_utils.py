@@ -5,14 +5,20 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from sqlalchemy import create_engine
+from sqlalchemy import select
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import sessionmaker
 
 from _pytask.dag_utils import node_and_neighbors
+from _pytask.node_protocols import PProvisionalNode
+from _pytask.typing import is_task_generator
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from _pytask.dag_graph import CompactDAG
     from _pytask.node_protocols import PNode
     from _pytask.node_protocols import PTask
     from _pytask.session import Session
@@ -22,6 +28,8 @@ __all__ = [
     "BaseTable",
     "DatabaseSession",
     "create_database",
+    "find_changed_tasks",
+    "load_states",
     "update_states_in_database",
 ]
 
@@ -50,6 +58,54 @@ def create_database(url: str) -> None:
     DatabaseSession.configure(bind=engine)
 
 
+def load_states() -> dict[tuple[str, str], str]:
+    """Load the states of all nodes in relation to tasks with a single query."""
+    with DatabaseSession() as session:
+        rows = session.execute(select(State.task, State.node, State.hash_)).all()
+    return {(task, node): hash_ for task, node, hash_ in rows}
+
+
+def find_changed_tasks(
+    dag: CompactDAG,
+    tasks: Iterable[PTask],
+    node_states: dict[str, str | None] | None = None,
+) -> set[str]:
+    """Find the tasks which changed since their last execution.
+
+    The states of the tasks, their dependencies and products are compared in bulk with
+    the states stored in the database. A task has changed if any state is missing or
+    differs. Task generators and tasks with provisional nodes are always changed.
+
+    Pass ``node_states`` to override the states of some nodes. States computed while
+    comparing are added to the mapping.
+
+    """
+    stored_states = load_states()
+    node_states = {} if node_states is None else node_states
+
+    changed = set()
+    for task in tasks:
+        task_signature = task.signature
+        if is_task_generator(task):
+            changed.add(task_signature)
+            continue
+
+        for node_signature in node_and_neighbors(dag, task_signature):
+            if node_signature in node_states:
+                state = node_states[node_signature]
+            else:
+                node = dag.get(node_signature)
+                state = None if isinstance(node, PProvisionalNode) else node.state()
+                node_states[node_signature] = state
+            if state is None or state != stored_states.get(
+                (task_signature, node_signature)
+            ):
+                changed.add(task_signature)
+                break
+
+    return changed
+
+
 def _create_or_update_state(first_key: str, second_key: str, hash_: str) -> None:
     """Create or update a state."""
     with DatabaseSession() as session:
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import inspect
 import sys
 import time
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import NoReturn
 
 from rich.text import Text
 
+from _pytask._inspect import get_parameter_names
 from _pytask.config import IS_FILE_SYSTEM_CASE_SENSITIVE
 from _pytask.console import console
 from _pytask.console import create_summary_panel
@@ -18,8 +19,10 @@ from _pytask.console import format_node_name
 from _pytask.console import format_strings_as_flat_tree
 from _pytask.console import unify_styles
 from _pytask.dag_utils import TopologicalSorter
-from _pytask.dag_utils import descending_tasks
+from _pytask.dag_utils import block_descending_tasks
 from _pytask.dag_utils import node_and_neighbors
+from _pytask.dag_utils import tasks_and_descending_tasks
+from _pytask.database_utils import find_changed_tasks
 from _pytask.database_utils import has_node_changed
 from _pytask.database_utils import update_states_in_database
 from _pytask.exceptions import ExecutionError
@@ -37,12 +40,12 @@ from _pytask.outcomes import SkippedUnchanged
 from _pytask.outcomes import TaskOutcome
 from _pytask.outcomes import WouldBeExecuted
 from _pytask.outcomes import count_outcomes
+from _pytask.pluginmanager import has_only_builtin_hookimpls
 from _pytask.pluginmanager import hookimpl
 from _pytask.provisional_utils import collect_provisional_products
 from _pytask.reports import ExecutionReport
 from _pytask.traceback import remove_traceback_from_exc_info
-from _pytask.tree_util import tree_leaves
-from _pytask.tree_util import tree_map
+from _pytask.tree_util import get_flat_arguments
 from _pytask.tree_util import tree_structure
 from _pytask.typing import is_task_generator
 
@@ -81,28 +84,171 @@ def pytask_execute_log_start(session: Session) -> None:
 def pytask_execute_build(session: Session) -> bool | None:
     """Execute tasks."""
     if isinstance(session.scheduler, TopologicalSorter):
-        while session.scheduler.is_active():
-            task_name = session.scheduler.get_ready()[0]
-            task = session.dag.nodes[task_name]["task"]
-            report = session.hook.pytask_execute_task_protocol(
-                session=session, task=task
-            )
-            session.execution_reports.append(report)
-            session.scheduler.done(task_name)
+        unchanged_tasks = _find_unchanged_tasks(session)
+        while (task_name := _get_ready_task(session)) is not None:
+            task = session.dag.get_task(task_name)
+            if task_name in unchanged_tasks:
+                report = ExecutionReport.from_unchanged_task(task)
+                session.hook.pytask_execute_task_log_end(
+                    session=session, task=task, report=report
+                )
+            else:
+                session.prefetcher.prefetch(
+                    session,
+                    (
+                        signature
+                        for signature in session.scheduler.peek_ready(
+                            _N_PREFETCHED_TASKS
+                        )
+                        if signature not in unchanged_tasks
+                    ),
+                )
+                report = session.hook.pytask_execute_task_protocol(
+                    session=session, task=task
+                )
+            session.prefetcher.discard(task_name)
+            if report is not None:
+                session.execution_reports.append(report)
+                session.scheduler.done(task_name)
+            _finish_tasks_with_saved_products(session)
 
             if session.should_stop:
+                _finish_tasks_with_saved_products(session, wait=True)
                 return True
         return True
     return None
 
 
+def _get_ready_task(session: Session) -> str | None:
+    """Get the next ready task and wait for saved products if no task is ready.
+
+    Tasks might not be ready because the products of preceding tasks are still saved
+    in the background. If no task is ready and no products are saved, tasks are left
+    which can never become ready, for example, because a plugin did not mark a task as
+    done.
+
+    """
+    while session.scheduler.is_active():
+        ready = session.scheduler.get_ready()
+        if ready:
+            return ready[0]
+        if not session.product_writer.is_saving():
+            msg = (
+                "No task is ready to be executed although the execution is not "
+                "finished. Tasks which were executed have not been marked as done with "
+                "'session.scheduler.done()'. If a plugin implements "
+                "'pytask_execute_task_protocol', it must return a report."
+            )
+            raise RuntimeError(msg)
+        _finish_tasks_with_saved_products(session, block=True)
+    return None
+
+
+def _finish_tasks_with_saved_products(
+    session: Session, *, block: bool = False, wait: bool = False
+) -> None:
+    """Finish tasks whose products were saved in the background.
+
+    With ``block``, wait until at least one task is finished and with ``wait`` until
+    all tasks are finished.
+
+    """
+    writer = session.product_writer
+    while True:
+        signatures = writer.finished(block=block or wait)
+        for signature in signatures:
+            task = session.dag.get_task(signature)
+            report = _finish_task_protocol(session, task)
+            session.execution_reports.append(report)
+            session.scheduler.done(signature)
+        if not wait or not signatures:
+            return
+
+
+_N_PREFETCHED_TASKS = 2
+"""The number of upcoming tasks whose dependencies are prefetched."""
+
+
+def _find_unchanged_tasks(session: Session) -> set[str]:
+    """Find tasks which are unchanged before the execution starts.
+
+    The states of all nodes are compared in bulk with the states stored in the
+    database. Unchanged tasks receive a compact report and skip the execution protocol
+    which would raise :class:`~_pytask.outcomes.SkippedUnchanged` for them during the
+    setup.
+
+    A task is only unchanged if all its preceding tasks are unchanged, too, since they
+    would modify its dependencies otherwise. Tasks with markers that affect skipping,
+    task generators and tasks with provisional nodes run through the protocol. The
+    fast path is disabled if the tasks are forced to run or plugins implement hooks of
+    the execution protocol.
+
+    """
+    if session.config["force"] or not has_only_builtin_hookimpls(
+        session.hook, _EXECUTION_PROTOCOL_HOOKS
+    ):
+        return set()
+
+    skipped_by_markers = {
+        task.signature
+        for task in session.tasks
+        if any(mark.name in _MARKERS_AFFECTING_SKIPPING for mark in task.markers)
+    }
+    changed = skipped_by_markers | find_changed_tasks(
+        session.dag,
+        (task for task in session.tasks if task.signature not in skipped_by_markers),
+    )
+    candidates = {task.signature for task in session.tasks} - changed
+    return candidates - tasks_and_descending_tasks(changed, session.dag)
+
+
+_MARKERS_AFFECTING_SKIPPING = frozenset(
+    {"skip", "skipif", "skip_ancestor_failed", "skip_unchanged", "would_be_executed"}
+)
+
+
+_EXECUTION_PROTOCOL_HOOKS = (
+    "pytask_execute_task_protocol",
+    "pytask_execute_task_log_start",
+    "pytask_execute_task_setup",
+    "pytask_execute_task",
+    "pytask_execute_task_teardown",
+    "pytask_execute_task_process_report",
+)
+
+
 @hookimpl
-def pytask_execute_task_protocol(session: Session, task: PTask) -> ExecutionReport:
-    """Follow the protocol to execute each task."""
+def pytask_execute_task_protocol(
+    session: Session, task: PTask
+) -> ExecutionReport | None:
+    """Follow the protocol to execute each task.
+
+    If products of the task are saved in the background, ``None`` is returned, and the
+    task is finished when all products are saved.
+
+    """
     session.hook.pytask_execute_task_log_start(session=session, task=task)
     try:
         session.hook.pytask_execute_task_setup(session=session, task=task)
         session.hook.pytask_execute_task(session=session, task=task)
+    except KeyboardInterrupt:  # pragma: no cover
+        short_exc_info = remove_traceback_from_exc_info(sys.exc_info())
+        report = ExecutionReport.from_task_and_exception(task, short_exc_info)
+        session.should_stop = True
+        return _process_report(session, task, report)
+    except Exception:  # noqa: BLE001
+        report = ExecutionReport.from_task_and_exception(task, sys.exc_info())
+        return _process_report(session, task, report)
+
+    if session.product_writer.is_saving(task.signature):
+        return None
+    return _finish_task_protocol(session, task)
+
+
+def _finish_task_protocol(session: Session, task: PTask) -> ExecutionReport:
+    """Wait for saved products, tear down the task and process the report."""
+    try:
+        session.product_writer.wait(task.signature)
         session.hook.pytask_execute_task_teardown(session=session, task=task)
     except KeyboardInterrupt:  # pragma: no cover
         short_exc_info = remove_traceback_from_exc_info(sys.exc_info())
@@ -112,9 +258,14 @@ def pytask_execute_task_protocol(session: Session, task: PTask) -> ExecutionRepo
         report = ExecutionReport.from_task_and_exception(task, sys.exc_info())
     else:
         report = ExecutionReport.from_task(task)
+    return _process_report(session, task, report)
+
+
+def _process_report(
+    session: Session, task: PTask, report: ExecutionReport
+) -> ExecutionReport:
     session.hook.pytask_execute_task_process_report(session=session, report=report)
     session.hook.pytask_execute_task_log_end(session=session, task=task, report=report)
-
     return report
 
 
@@ -126,7 +277,11 @@ def pytask_execute_task_setup(session: Session, task: PTask) -> None:  # noqa: C
     2. Create the directory where the product will be placed.
 
     """
-    if has_mark(task, "would_be_executed"):
+    if has_mark(task, "would_be_executed") or (
+        isinstance(session.scheduler, TopologicalSorter)
+        and TaskOutcome.WOULD_BE_EXECUTED
+        in session.scheduler.blocked_by(task.signature).values()
+    ):
         raise WouldBeExecuted
 
     dag = session.dag
@@ -138,26 +293,18 @@ def pytask_execute_task_setup(session: Session, task: PTask) -> None:  # noqa: C
     if not needs_to_be_executed:
         predecessors = set(dag.predecessors(task.signature)) | {task.signature}
         for node_signature in node_and_neighbors(dag, task.signature):
-            node = dag.nodes[node_signature].get("task") or dag.nodes[
-                node_signature
-            ].get("node")
+            node = dag.get(node_signature)
 
-            # Skip provisional nodes that are products since they do not have a state.
-            if node_signature not in predecessors and isinstance(
-                node, PProvisionalNode
-            ):
+            # Provisional nodes do not have a state. Skip them if they are products.
+            if isinstance(node, PProvisionalNode):
+                if node_signature in predecessors:
+                    _raise_missing_node(task, node)
                 continue
 
             node_state = node.state()
 
             if node_signature in predecessors and not node_state:
-                msg = f"{task.name!r} requires missing node {node.name!r}."
-                if IS_FILE_SYSTEM_CASE_SENSITIVE:
-                    msg += (
-                        "\n\n(Hint: Your file-system is case-sensitive. Check the "
-                        "paths' capitalization carefully.)"
-                    )
-                raise NodeNotFoundError(msg)
+                _raise_missing_node(task, node)
 
             has_changed = has_node_changed(task=task, node=node, state=node_state)
             if has_changed:
@@ -178,9 +325,25 @@ def pytask_execute_task_setup(session: Session, task: PTask) -> None:  # noqa: C
             node.root_dir.mkdir(parents=True, exist_ok=True)
 
 
-def _safe_load(node: PNode | PProvisionalNode, task: PTask, *, is_product: bool) -> Any:
+def _raise_missing_node(
+    task: PTask, node: PTask | PNode | PProvisionalNode
+) -> NoReturn:
+    msg = f"{task.name!r} requires missing node {node.name!r}."
+    if IS_FILE_SYSTEM_CASE_SENSITIVE:
+        msg += (
+            "\n\n(Hint: Your file-system is case-sensitive. Check the "
+            "paths' capitalization carefully.)"
+        )
+    raise NodeNotFoundError(msg)
+
+
+def _safe_load(
+    session: Session, node: PNode | PProvisionalNode, task: PTask, *, is_product: bool
+) -> Any:
     try:
-        return node.load(is_product=is_product)
+        if is_product or isinstance(node, PProvisionalNode):
+            return node.load(is_product=is_product)
+        return session.prefetcher.load(task.signature, node, session.value_cache)
     except Exception as e:
         msg = f"Exception while loading node {node.name!r} of task {task.name!r}"
         raise NodeLoadError(msg) from e
@@ -192,23 +355,27 @@ def pytask_execute_task(session: Session, task: PTask) -> bool:
     if session.config["dry_run"]:
         raise WouldBeExecuted
 
-    parameters = inspect.signature(task.function).parameters
+    parameters = get_parameter_names(task.function)
+    depends_on = get_flat_arguments(task, "depends_on").arguments
+    produces = get_flat_arguments(task, "produces").arguments
 
     kwargs = {}
-    for name, value in task.depends_on.items():
-        kwargs[name] = tree_map(lambda x: _safe_load(x, task, is_product=False), value)
+    for name, (leaves, treespec) in depends_on.items():
+        kwargs[name] = treespec.unflatten(
+            [_safe_load(session, x, task, is_product=False) for x in leaves]
+        )
 
-    for name, value in task.produces.items():
+    for name, (leaves, treespec) in produces.items():
         if name in parameters:
-            kwargs[name] = tree_map(
-                lambda x: _safe_load(x, task, is_product=True), value
+            kwargs[name] = treespec.unflatten(
+                [_safe_load(session, x, task, is_product=True) for x in leaves]
             )
 
     out = task.execute(**kwargs)
 
-    if "return" in task.produces:
+    if "return" in produces:
+        nodes, structure_return = produces["return"]
         structure_out = tree_structure(out)
-        structure_return = tree_structure(task.produces["return"])
 
         # strict must be false when none is leaf.
         if not structure_return.is_prefix(structure_out, strict=False):
@@ -219,11 +386,14 @@ def pytask_execute_task(session: Session, task: PTask) -> bool:
             )
             raise ValueError(msg)
 
-        nodes = tree_leaves(task.produces["return"])
         values = structure_return.flatten_up_to(out)
         for node, value in zip(nodes, values):
             if not isinstance(node, PProvisionalNode):
-                node.save(value)
+                session.product_writer.save(task.signature, node, value)
+
+    # Products were saved again, so cached values of them are outdated.
+    for node in get_flat_arguments(task, "produces").leaves:
+        session.value_cache.invalidate(node.signature)
 
     return True
 
@@ -235,7 +405,9 @@ def pytask_execute_task_teardown(session: Session, task: PTask) -> None:
         return
 
     collect_provisional_products(session, task)
-    missing_nodes = [node for node in tree_leaves(task.produces) if not node.state()]
+    missing_nodes = [
+        node for node in get_flat_arguments(task, "produces").leaves if not node.state()
+    ]
     if missing_nodes:
         paths = session.config["paths"]
         files = [format_node_name(i, paths).plain for i in missing_nodes]
@@ -260,26 +432,27 @@ def pytask_execute_task_process_report(
         update_states_in_database(session, task.signature)
     elif report.exc_info and isinstance(report.exc_info[1], WouldBeExecuted):
         report.outcome = TaskOutcome.WOULD_BE_EXECUTED
-
-        for descending_task_name in descending_tasks(task.signature, session.dag):
-            descending_task = session.dag.nodes[descending_task_name]["task"]
-            descending_task.markers.append(
-                Mark(
-                    "would_be_executed",
-                    (),
-                    {"reason": f"Previous task {task.name!r} would be executed."},
-                )
-            )
+        block_descending_tasks(
+            session,
+            task,
+            TaskOutcome.WOULD_BE_EXECUTED,
+            Mark(
+                "would_be_executed",
+                (),
+                {"reason": f"Previous task {task.name!r} would be executed."},
+            ),
+        )
     else:
-        for descending_task_name in descending_tasks(task.signature, session.dag):
-            descending_task = session.dag.nodes[descending_task_name]["task"]
-            descending_task.markers.append(
-                Mark(
-                    "skip_ancestor_failed",
-                    (),
-                    {"reason": f"Previous task {task.name!r} failed."},
-                )
-            )
+        block_descending_tasks(
+            session,
+            task,
+            TaskOutcome.FAIL,
+            Mark(
+                "skip_ancestor_failed",
+                (),
+                {"reason": f"Previous task {task.name!r} failed."},
+            ),
+        )
 
         session.n_tasks_failed += 1
         if session.n_tasks_failed >= session.config["max_failures"]:
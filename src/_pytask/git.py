@@ -40,6 +40,23 @@ def get_all_files(cwd: Path | None = None) -> list[Path]:
     return [Path(x) for x in str_paths]
 
 
+def get_not_ignored_files(cwd: Path) -> list[str] | None:
+    """Get files tracked by git and untracked files which are not ignored.
+
+    The paths are relative to ``cwd``. If git is not installed or ``cwd`` is not inside
+    a repository, ``None`` is returned.
+
+    """
+    if not is_git_installed():
+        return None
+    returncode, stdout, _ = cmd_output(
+        "git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", cwd=cwd
+    )
+    if returncode != 0:
+        return None
+    return zsplit(stdout)
+
+
 def get_root(cwd: Path) -> Path | None:
     """Get the root path of a git repository.
 
@@ -243,7 +243,9 @@ def pytask_execute_build(session: Session) -> Any:
 
 
 @hookspec(firstresult=True)
-def pytask_execute_task_protocol(session: Session, task: PTask) -> ExecutionReport:
+def pytask_execute_task_protocol(
+    session: Session, task: PTask
+) -> ExecutionReport | None:
     """Run the protocol for executing a test.
 
     This hook runs all stages of the execution process, setup, execution, and teardown
@@ -251,6 +253,9 @@ def pytask_execute_task_protocol(session: Session, task: PTask) -> ExecutionRepo
 
     Then, the exception or success is stored in a report and logged.
 
+    If products of the task are saved in the background, ``None`` is returned. The
+    teardown and the report follow once all products are saved.
+
     """
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from typing import Any
@@ -35,6 +36,9 @@ if TYPE_CHECKING:
     from _pytask.session import Session
 
 
+_MIN_SECONDS_BETWEEN_UPDATES = 0.1
+
+
 @hookimpl
 def pytask_extend_command_line_interface(cli: click.Group) -> None:
     """Extend command line interface."""
@@ -170,6 +174,8 @@ class LiveExecution:
     n_tasks: int | str = "x"
     _reports: list[_ReportEntry] = field(factory=list)
     _running_tasks: dict[str, _TaskEntry] = field(factory=dict)
+    _n_reports: int = 0
+    _last_update: float = 0.0
 
     @hookimpl(wrapper=True)
     def pytask_execute_build(self) -> Generator[None, None, None]:
@@ -209,24 +215,10 @@ class LiveExecution:
 
         """
         n_reports_to_display = self.n_entries_in_table - len(self._running_tasks)
-
-        if self.verbose < 2:  # noqa: PLR2004
-            reports = [
-                report
-                for report in self._reports
-                if report.outcome
-                not in (
-                    TaskOutcome.SKIP,
-                    TaskOutcome.SKIP_UNCHANGED,
-                    TaskOutcome.SKIP_PREVIOUS_FAILED,
-                    TaskOutcome.PERSISTENCE,
-                )
-            ]
-        else:
-            reports = self._reports
+        reports = self._reports
 
         if not reduce_table:
-            relevant_reports = reports
+            relevant_reports = list(reports)
         elif n_reports_to_display >= 1:
             relevant_reports = reports[-n_reports_to_display:]
         else:
@@ -239,7 +231,7 @@ class LiveExecution:
         if add_caption:
             table = Table(
                 caption=Text(
-                    f"Completed: {len(self._reports)}/{self.n_tasks}",
+                    f"Completed: {self._n_reports}/{self.n_tasks}",
                     style=Style(dim=True, italic=False),
                 ),
                 caption_justify="right",
@@ -294,16 +286,41 @@ class LiveExecution:
         self._update_table()
 
     def update_report(self, new_report: ExecutionReport) -> None:
-        """Update the status of a running task by adding its report."""
-        self._running_tasks.pop(new_report.task.signature)
-        self._reports.append(
-            _ReportEntry(
-                name=new_report.task.name,
-                outcome=new_report.outcome,
-                task=new_report.task,
-            )
+        """Update the status of a running task by adding its report.
+
+        Reports of unchanged tasks do not pass through the execution protocol and their
+        tasks are not marked as running before. Reports which are not displayed only
+        refresh the table from time to time since only the caption changes.
+
+        """
+        was_running = (
+            self._running_tasks.pop(new_report.task.signature, None) is not None
         )
-        self._update_table()
+        self._n_reports += 1
+
+        is_displayed = self.verbose >= 2 or new_report.outcome not in (  # noqa: PLR2004
+            TaskOutcome.SKIP,
+            TaskOutcome.SKIP_UNCHANGED,
+            TaskOutcome.SKIP_PREVIOUS_FAILED,
+            TaskOutcome.PERSISTENCE,
+        )
+        if is_displayed:
+            self._reports.append(
+                _ReportEntry(
+                    name=new_report.task.name,
+                    outcome=new_report.outcome,
+                    task=new_report.task,
+                )
+            )
+
+        now = time.monotonic()
+        if (
+            is_displayed
+            or was_running
+            or now - self._last_update > _MIN_SECONDS_BETWEEN_UPDATES
+        ):
+            self._last_update = now
+            self._update_table()
 
 
 @define(eq=False, kw_only=True)
@@ -17,14 +17,14 @@ import _pytask
 from _pytask.capture_utils import ShowCapture
 from _pytask.console import console
 from _pytask.pluginmanager import hookimpl
+from _pytask.pluginmanager import list_plugin_distributions
 from _pytask.reports import ExecutionReport
 from _pytask.traceback import Traceback
 
 if TYPE_CHECKING:
-    from pluggy._manager import DistFacade
-
     from _pytask.outcomes import CollectionOutcome
     from _pytask.outcomes import TaskOutcome
+    from _pytask.pluginmanager import PluginDistribution
     from _pytask.session import Session
 
 
@@ -72,7 +72,7 @@ def pytask_log_session_header(session: Session) -> None:
     if session.config["config"] is not None:
         console.print(f"Configuration: {session.config['config']}")
 
-    plugin_info = session.config["pm"].list_plugin_distinfo()
+    plugin_info = list_plugin_distributions(session.config["pm"])
     if plugin_info:
         formatted_plugins_w_versions = ", ".join(
             _format_plugin_names_and_versions(plugin_info)
@@ -81,7 +81,7 @@ def pytask_log_session_header(session: Session) -> None:
 
 
 def _format_plugin_names_and_versions(
-    plugininfo: list[tuple[str, DistFacade]],
+    plugininfo: list[tuple[object, PluginDistribution]],
 ) -> list[str]:
     """Format name and version of loaded plugins."""
     values: list[str] = []
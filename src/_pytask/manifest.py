@@ -0,0 +1,430 @@
+"""Contains the code for the persistent collection manifest.
+
+When ``--lazy-collection`` is used, the tasks collected from a task module are stored in
+the database together with the hashes of the module and of all modules within the
+project it imports. If none of these files changed, the tasks are restored from the
+manifest in the next run without importing the module.
+
+The functions of restored tasks are placeholders. The module is only imported when one
+of its tasks has to be executed. Then, the placeholders are replaced with the real task
+functions.
+
+Other inputs which a module reads while it is imported, for example, a file which
+parametrizes tasks or the files matched by :meth:`pathlib.Path.glob`, are not recorded.
+Such modules must opt out of the manifest by setting
+``__pytask_lazy_collection__ = False``. They are imported in every run.
+
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib.util
+import inspect
+import itertools
+import pickle
+import sys
+import sysconfig
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from _pytask import __version__
+from _pytask.coiled_utils import Function
+from _pytask.database_utils import BaseTable
+from _pytask.database_utils import DatabaseSession
+from _pytask.exceptions import NodeNotCollectedError
+from _pytask.nodes import Task
+from _pytask.outcomes import CollectionOutcome
+from _pytask.path import hash_path
+from _pytask.pluginmanager import hookimpl
+from _pytask.reports import CollectionReport
+from _pytask.task_utils import COLLECTED_TASKS
+from _pytask.task_utils import parse_collected_tasks_with_task_marker
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterator
+    from types import ModuleType
+    from typing import NoReturn
+
+    from _pytask.node_protocols import PTask
+    from _pytask.session import Session
+
+
+__all__ = [
+    "LAZY_TASKS",
+    "LazyCollectionPlugin",
+    "Manifest",
+    "create_entry",
+    "create_task_records",
+    "is_placeholder",
+    "load_entry",
+    "restore_task",
+    "restore_tasks",
+    "save_entry",
+]
+
+
+class Manifest(BaseTable):
+    """Record of the tasks collected from a task module."""
+
+    __tablename__ = "manifest"
+
+    path: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[bytes]
+
+
+_MANIFEST_VERSION = f"{__version__}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+_ENTRIES: dict[str, bytes] | None = None
+"""Cache the manifest entries which are loaded with a single query."""
+
+LAZY_TASKS: dict[Path, list[Task]] = {}
+"""Contains tasks restored from the manifest whose modules have not been imported."""
+
+_PLACEHOLDERS: weakref.WeakSet[Callable[..., Any]] = weakref.WeakSet()
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Register the plugin which restores tasks if lazy collection is requested."""
+    if (
+        config.get("lazy_collection", False)
+        or config.get("n_collection_workers", 1) > 1
+    ):
+        config["pm"].register(LazyCollectionPlugin)
+
+
+@hookimpl(wrapper=True)
+def pytask_collect_file_protocol(
+    session: Session, path: Path
+) -> Generator[None, list[CollectionReport], list[CollectionReport]]:
+    """Store the tasks of a task module which was imported in the manifest."""
+    reports = yield
+    if LAZY_TASKS:
+        _adopt_imported_tasks()
+    if _is_lazy_task_module(session, path) and path not in LAZY_TASKS:
+        entry = create_entry(session, path, reports)
+        if entry is not None:
+            save_entry(path, entry)
+    return reports
+
+
+@hookimpl
+def pytask_unconfigure() -> None:
+    """Clear the global variables after execution."""
+    global _ENTRIES  # noqa: PLW0603
+    _ENTRIES = None
+    LAZY_TASKS.clear()
+
+
+class LazyCollectionPlugin:
+    """Namespace for the plugin to restore tasks from the manifest."""
+
+    @staticmethod
+    @hookimpl(tryfirst=True)
+    def pytask_collect_file_protocol(
+        session: Session, path: Path
+    ) -> list[CollectionReport] | None:
+        """Restore the tasks of an unchanged task module from the manifest."""
+        if not _is_lazy_task_module(session, path) or COLLECTED_TASKS.get(path):
+            return None
+
+        entry = load_entry(path)
+        if entry is None:
+            return None
+
+        tasks = restore_tasks(path, entry)
+        reports = [
+            CollectionReport(outcome=CollectionOutcome.SUCCESS, node=task)
+            for task in tasks
+        ]
+        session.hook.pytask_collect_file_log(session=session, reports=reports)
+        return reports
+
+    @staticmethod
+    @hookimpl(wrapper=True)
+    def pytask_execute_task_setup(
+        session: Session, task: PTask
+    ) -> Generator[None, None, None]:
+        """Import the module of a restored task before it is executed."""
+        result = yield
+        if is_placeholder(task.function) and task.path in LAZY_TASKS:  # type: ignore[attr-defined]
+            _import_lazy_tasks(session, task.path)  # type: ignore[attr-defined]
+        return result
+
+
+def _is_lazy_task_module(session: Session, path: Path) -> bool:
+    return session.config.get("lazy_collection", False) and any(
+        path.match(pattern) for pattern in session.config["task_files"]
+    )
+
+
+def load_entry(path: Path) -> dict[str, Any] | None:
+    """Load the entry of a module if the module and its imports are unchanged."""
+    global _ENTRIES  # noqa: PLW0603
+    if _ENTRIES is None:
+        with DatabaseSession() as db_session:
+            rows = db_session.execute(select(Manifest.path, Manifest.value)).all()
+        _ENTRIES = dict(rows)  # type: ignore[arg-type]
+
+    value = _ENTRIES.get(path.as_posix())
+    if value is None:
+        return None
+
+    try:
+        entry = pickle.loads(value)  # noqa: S301
+    except Exception:  # noqa: BLE001
+        return None
+
+    if entry["version"] != _MANIFEST_VERSION:
+        return None
+    for dependency, hash_ in entry["dependencies"].items():
+        dependency_path = Path(dependency)
+        if not dependency_path.exists() or _hash_file(dependency_path) != hash_:
+            return None
+    return entry
+
+
+def create_entry(
+    session: Session, path: Path, reports: list[CollectionReport]
+) -> dict[str, Any] | None:
+    """Create the entry of a module if all of its tasks can be restored."""
+    if any(report.outcome != CollectionOutcome.SUCCESS for report in reports):
+        return None
+    modules_by_file = _get_modules_by_file()
+    if not getattr(modules_by_file.get(path), "__pytask_lazy_collection__", True):
+        return None
+    records = create_task_records([report.node for report in reports])
+    if records is None:
+        return None
+
+    return {
+        "version": _MANIFEST_VERSION,
+        "dependencies": _find_dependencies(
+            path, session.config["root"], modules_by_file
+        ),
+        "tasks": records,
+    }
+
+
+def create_task_records(tasks: list[Any]) -> list[dict[str, Any]] | None:
+    """Create records of tasks from which they can be restored without functions.
+
+    Returns ``None`` if any of the tasks cannot be restored.
+
+    """
+    records = []
+    for task in tasks:
+        if (
+            not isinstance(task, Task)
+            or isinstance(task.function, Function)
+            or (
+                isinstance(task.attributes.get("after"), list)
+                and task.attributes["after"]
+            )
+        ):
+            return None
+        records.append(
+            {
+                "base_name": task.base_name,
+                "depends_on": task.depends_on,
+                "produces": task.produces,
+                "markers": task.markers,
+                "attributes": task.attributes,
+                "name": getattr(task.function, "__name__", task.base_name),
+                "line_number": _get_line_number(task.function),
+                "keywords": list(getattr(task.function, "__dict__", {})),
+            }
+        )
+    return records
+
+
+def save_entry(path: Path, entry: dict[str, Any]) -> None:
+    """Save the entry of a module to the manifest if it can be serialized."""
+    try:
+        value = pickle.dumps(entry)
+    except Exception:  # noqa: BLE001
+        return
+
+    with DatabaseSession() as db_session:
+        db_session.merge(Manifest(path=path.as_posix(), value=value))
+        db_session.commit()
+
+
+def restore_tasks(path: Path, entry: dict[str, Any]) -> list[Task]:
+    """Restore the tasks of a module from its entry without importing the module."""
+    tasks = [restore_task(path, record) for record in entry["tasks"]]
+    LAZY_TASKS[path] = tasks
+    return tasks
+
+
+def restore_task(path: Path, record: dict[str, Any]) -> Task:
+    """Restore a task from its record with a placeholder for the task function."""
+    return Task(
+        base_name=record["base_name"],
+        path=path,
+        function=_create_placeholder(path, record),
+        depends_on=record["depends_on"],
+        produces=record["produces"],
+        markers=record["markers"],
+        attributes=record["attributes"],
+    )
+
+
+def _create_placeholder(path: Path, record: dict[str, Any]) -> Callable[..., Any]:
+    """Create a placeholder for a task function.
+
+    The placeholder pretends to be defined at the same location as the task function so
+    that links to the task still point to its source.
+
+    """
+    name = record["name"]
+
+    def placeholder(*args: Any, **kwargs: Any) -> NoReturn:  # noqa: ARG001
+        msg = f"The module {path} of the task function {name!r} was not imported."
+        raise RuntimeError(msg)
+
+    placeholder.__code__ = placeholder.__code__.replace(
+        co_filename=path.as_posix(),
+        co_firstlineno=record["line_number"],
+        co_name=name,
+    )
+    placeholder.__name__ = placeholder.__qualname__ = name
+    placeholder.__dict__.update(dict.fromkeys(record["keywords"]))
+    _PLACEHOLDERS.add(placeholder)
+    return placeholder
+
+
+def is_placeholder(function: Any) -> bool:
+    """Check whether a function is the placeholder of a restored task."""
+    return function in _PLACEHOLDERS
+
+
+def _get_line_number(function: Callable[..., Any]) -> int:
+    try:
+        return inspect.getsourcelines(inspect.unwrap(function))[1]
+    except (OSError, TypeError):
+        return 1
+
+
+def _adopt_imported_tasks() -> None:
+    """Use task functions of restored modules which were imported by other modules.
+
+    If a task module imports another task module that was restored from the manifest,
+    the decorated task functions are registered again. They replace the placeholders so
+    that the tasks are not reported as not collected and ``@task(after=...)`` refers to
+    the right tasks.
+
+    """
+    for path, tasks in LAZY_TASKS.items():
+        if not COLLECTED_TASKS.get(path):
+            continue
+        functions = parse_collected_tasks_with_task_marker(COLLECTED_TASKS.pop(path))
+        for task in tasks:
+            function = functions.get(task.base_name)
+            if function is not None:
+                task.function = function
+                task.attributes["collection_id"] = function.pytask_meta._id  # type: ignore[attr-defined]
+
+
+def _import_lazy_tasks(session: Session, path: Path) -> None:
+    """Import a module and replace the placeholders of its restored tasks."""
+    reports = itertools.chain.from_iterable(
+        session.hook.pytask_collect_file(session=session, path=path, reports=[])
+    )
+    functions = {
+        report.node.signature: report.node.function
+        for report in reports
+        if report.outcome == CollectionOutcome.SUCCESS and isinstance(report.node, Task)
+    }
+    for task in LAZY_TASKS.pop(path, []):
+        if task.signature in functions:
+            task.function = functions[task.signature]
+        else:
+            msg = (
+                f"The task {task.name!r} was restored from the collection manifest, "
+                f"but it was not found after importing {path}."
+            )
+            raise NodeNotCollectedError(msg)
+
+
+def _hash_file(path: Path) -> str:
+    return hash_path(path, path.stat().st_mtime)
+
+
+def _get_modules_by_file() -> dict[Path, ModuleType]:
+    return {
+        Path(file): module
+        for module in list(sys.modules.values())
+        if (file := getattr(module, "__file__", None))
+    }
+
+
+def _find_dependencies(
+    path: Path, root: Path, modules_by_file: dict[Path, ModuleType]
+) -> dict[str, str]:
+    """Find the hashes of a module and all modules within the project it imports."""
+    # Exclude installed packages unless the project itself lives inside a prefix.
+    excluded = {
+        Path(p) for p in (sys.prefix, sys.base_prefix, *sysconfig.get_paths().values())
+    }
+    excluded = {p for p in excluded if p != root and p not in root.parents}
+
+    dependencies: dict[str, str] = {}
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        if current.as_posix() in dependencies:
+            continue
+        dependencies[current.as_posix()] = _hash_file(current)
+
+        module = modules_by_file.get(current)
+        package = getattr(module, "__package__", None)
+        for name in _find_imported_modules(current, package):
+            imported_module = sys.modules.get(name)
+            file = getattr(imported_module, "__file__", None)
+            if not file:
+                continue
+            file_path = Path(file)
+            if (
+                file_path.suffix == ".py"
+                and root in file_path.parents
+                and excluded.isdisjoint(file_path.parents)
+            ):
+                stack.append(file_path)
+    return dependencies
+
+
+def _find_imported_modules(path: Path, package: str | None) -> Iterator[str]:
+    """Find the names of modules imported by a module including parent packages."""
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), package
+                )
+            except (ImportError, ValueError):
+                continue
+            names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        else:
+            continue
+
+        for name in names:
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                yield ".".join(parts[:i])
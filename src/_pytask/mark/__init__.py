@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import bisect
 import sys
 from typing import TYPE_CHECKING
 from typing import Any
 
 import click
 from attrs import define
+from attrs import field
 from rich.table import Table
 
 from _pytask.click import ColoredCommand
 from _pytask.console import console
-from _pytask.dag_utils import task_and_preceding_tasks
+from _pytask.dag_utils import tasks_and_descending_tasks
+from _pytask.dag_utils import tasks_and_preceding_tasks
 from _pytask.exceptions import ConfigurationError
 from _pytask.mark.expression import Expression
 from _pytask.mark.expression import ParseError
@@ -27,11 +30,11 @@ from _pytask.session import Session
 from _pytask.shared import parse_markers
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from collections.abc import Set as AbstractSet
     from typing import NoReturn
 
-    import networkx as nx
-
+    from _pytask.dag_graph import CompactDAG
     from _pytask.node_protocols import PTask
 
 
@@ -42,6 +45,7 @@ __all__ = [
     "MarkDecorator",
     "MarkGenerator",
     "ParseError",
+    "TaskIndex",
     "select_by_after_keyword",
     "select_by_keyword",
     "select_by_mark",
@@ -115,6 +119,19 @@ def pytask_post_parse(config: dict[str, Any]) -> None:
     config["markers"] = parse_markers(config["markers"])
 
 
+def _keywords_of_task(task: PTask) -> set[str]:
+    """Collect the names of a task which can be matched by keyword expressions."""
+    mapped_names = {task.name}
+
+    # Add the names attached to the current function through direct assignment.
+    mapped_names.update(task.function.__dict__)
+
+    # Add the markers to the keywords as we no longer handle them correctly.
+    mapped_names.update(mark.name for mark in task.markers)
+
+    return mapped_names
+
+
 @define(slots=True)
 class KeywordMatcher:
     """A matcher for keywords.
@@ -134,116 +151,261 @@ class KeywordMatcher:
 
     @classmethod
     def from_task(cls, task: PTask) -> KeywordMatcher:
-        mapped_names = {task.name}
+        return cls({name.lower() for name in _keywords_of_task(task)})
 
-        # Add the names attached to the current function through direct assignment.
-        mapped_names.update(task.function.__dict__)
+    def __call__(self, subname: str) -> bool:
+        subname = subname.lower()
+        return any(subname in name for name in self._names)
 
-        # Add the markers to the keywords as we no longer handle them correctly.
-        mapped_names.update(mark.name for mark in task.markers)
 
-        return cls(mapped_names)
+@define(slots=True)
+class MarkMatcher:
+    """A matcher for markers which are present.
 
-    def __call__(self, subname: str) -> bool:
-        subname = subname.lower()
-        names = (name.lower() for name in self._names)
+    Tries to match on any marker names, attached to the given task.
 
-        return any(subname in name for name in names)
+    """
 
+    own_mark_names: set[str]
 
-def select_by_keyword(session: Session, dag: nx.DiGraph) -> set[str] | None:
-    """Deselect tests by keywords."""
-    keywordexpr = session.config["expression"]
-    if not keywordexpr:
-        return None
+    @classmethod
+    def from_task(cls, task: PTask) -> MarkMatcher:
+        mark_names = {mark.name for mark in task.markers}
+        return cls(mark_names)
 
-    try:
-        expression = Expression.compile_(keywordexpr)
-    except ParseError as e:
-        msg = f"Wrong expression passed to '-k': {keywordexpr}: {e}"
-        raise ValueError(msg) from None
+    def __call__(self, name: str) -> bool:
+        return name in self.own_mark_names
 
-    remaining: set[str] = set()
-    for task in session.tasks:
-        if keywordexpr and expression.evaluate(KeywordMatcher.from_task(task)):
-            remaining.update(task_and_preceding_tasks(task.signature, dag))
 
-    return remaining
+@define(slots=True)
+class TaskIndex:
+    """An index to evaluate keyword and marker expressions for many tasks at once.
 
+    The lowercased names and the markers of the tasks are indexed once when they are
+    needed for the first time. Then, each identifier in an expression is resolved to
+    the set of matching tasks and the expression is evaluated with set operations
+    instead of once per task.
 
-def select_by_after_keyword(session: Session, after: str) -> set[str]:
-    """Select tasks defined by the after keyword."""
+    All names are joined into a single string separated by null characters which
+    cannot be part of an identifier. Finding the tasks whose names contain a substring
+    is a scan over this string.
+
+    """
+
+    tasks: list[PTask]
+    _keywords: str = ""
+    _starts: list[int] = field(factory=list)
+    _marks: dict[str, set[int]] | None = None
+    _keyword_matches: dict[str, AbstractSet[int]] = field(factory=dict)
+    _universe: frozenset[int] | None = None
+
+    def select_by_keyword(self, expression: Expression) -> set[str]:
+        """Select the tasks whose names match the expression."""
+        if not self._starts and self.tasks:
+            self._index_keywords()
+        positions = expression.evaluate_sets(self._match_keyword, self._all)
+        return {self.tasks[i].signature for i in positions}
+
+    def select_by_mark(self, expression: Expression) -> set[str]:
+        """Select the tasks whose markers match the expression."""
+        if self._marks is None:
+            self._index_marks()
+        positions = expression.evaluate_sets(self._match_mark, self._all)
+        return {self.tasks[i].signature for i in positions}
+
+    def extend(self, tasks: Iterable[PTask]) -> None:
+        """Add tasks to the index.
+
+        Names and markers which are already indexed are extended instead of being
+        indexed again.
+
+        """
+        start = len(self.tasks)
+        self.tasks.extend(tasks)
+        if self._starts:
+            parts = [self._keywords]
+            offset = len(self._keywords) + 1
+            for task in self.tasks[start:]:
+                part = "\0".join(name.lower() for name in _keywords_of_task(task))
+                parts.append(part)
+                self._starts.append(offset)
+                offset += len(part) + 1
+            self._keywords = "\0".join(parts)
+        if self._marks is not None:
+            for i, task in enumerate(self.tasks[start:], start=start):
+                for mark in task.markers:
+                    self._marks.setdefault(mark.name, set()).add(i)
+        self._keyword_matches.clear()
+        self._universe = None
+
+    def _index_keywords(self) -> None:
+        parts = []
+        offset = 0
+        for task in self.tasks:
+            part = "\0".join(name.lower() for name in _keywords_of_task(task))
+            parts.append(part)
+            self._starts.append(offset)
+            offset += len(part) + 1
+        self._keywords = "\0".join(parts)
+
+    def _index_marks(self) -> None:
+        self._marks = {}
+        for i, task in enumerate(self.tasks):
+            for mark in task.markers:
+                self._marks.setdefault(mark.name, set()).add(i)
+
+    def _match_keyword(self, subname: str) -> AbstractSet[int]:
+        subname = subname.lower()
+        if subname in self._keyword_matches:
+            return self._keyword_matches[subname]
+
+        if not subname:
+            matches: AbstractSet[int] = self._all()
+        else:
+            matches = set()
+            n_tasks = len(self.tasks)
+            position = self._keywords.find(subname)
+            while position != -1:
+                i = bisect.bisect_right(self._starts, position) - 1
+                matches.add(i)
+                if i + 1 == n_tasks:
+                    break
+                # Continue with the next task since one match per task is enough.
+                position = self._keywords.find(subname, self._starts[i + 1])
+
+        self._keyword_matches[subname] = matches
+        return matches
+
+    def _match_mark(self, name: str) -> AbstractSet[int]:
+        return self._marks.get(name, set())  # type: ignore[union-attr]
+
+    def _all(self) -> AbstractSet[int]:
+        if self._universe is None:
+            self._universe = frozenset(range(len(self.tasks)))
+        return self._universe
+
+
+def _compile_expression(expression: str, option: str) -> Expression:
     try:
-        expression = Expression.compile_(after)
+        return Expression.compile_(expression)
     except ParseError as e:
-        msg = f"Wrong expression passed to 'after': {after}: {e}"
+        msg = f"Wrong expression passed to {option}: {expression}: {e}"
         raise ValueError(msg) from None
 
-    ancestors: set[str] = set()
-    for task in session.tasks:
-        if after and expression.evaluate(KeywordMatcher.from_task(task)):
-            ancestors.add(task.signature)
 
-    return ancestors
+def _create_index(
+    session: Session, dag: CompactDAG, tasks: list[PTask] | None
+) -> TaskIndex:
+    """Create an index of all tasks or of the tasks and their descending tasks."""
+    if tasks is None:
+        return TaskIndex(session.tasks)
+    signatures = tasks_and_descending_tasks((task.signature for task in tasks), dag)
+    return TaskIndex([dag.nodes[signature]["task"] for signature in signatures])
 
 
-@define(slots=True)
-class MarkMatcher:
-    """A matcher for markers which are present.
+def _select_tasks(
+    dag: CompactDAG, matched: set[str], tasks: list[PTask] | None
+) -> set[str]:
+    """Select tasks that match and all their preceding tasks.
 
-    Tries to match on any marker names, attached to the given task.
+    If ``tasks`` is given, only these tasks are considered. A task is selected if it
+    matches or if any of its descending tasks matches.
 
     """
+    remaining = tasks_and_preceding_tasks(matched, dag)
+    if tasks is not None:
+        remaining &= {task.signature for task in tasks}
+    return remaining
 
-    own_mark_names: set[str]
 
-    @classmethod
-    def from_task(cls, task: PTask) -> MarkMatcher:
-        mark_names = {mark.name for mark in task.markers}
-        return cls(mark_names)
+def select_by_keyword(
+    session: Session,
+    dag: CompactDAG,
+    tasks: list[PTask] | None = None,
+    index: TaskIndex | None = None,
+) -> set[str] | None:
+    """Deselect tests by keywords."""
+    keywordexpr = session.config["expression"]
+    if not keywordexpr:
+        return None
 
-    def __call__(self, name: str) -> bool:
-        return name in self.own_mark_names
+    expression = _compile_expression(keywordexpr, "'-k'")
+    if index is None:
+        index = _create_index(session, dag, tasks)
+    return _select_tasks(dag, index.select_by_keyword(expression), tasks)
+
+
+def select_by_after_keyword(
+    session: Session,
+    after: str,
+    tasks: list[PTask] | None = None,
+    index: TaskIndex | None = None,
+) -> set[str]:
+    """Select tasks defined by the after keyword.
 
+    If ``tasks`` is given, only these tasks are evaluated instead of all tasks. Pass an
+    ``index`` of the same tasks to reuse it for multiple expressions.
 
-def select_by_mark(session: Session, dag: nx.DiGraph) -> set[str] | None:
+    """
+    expression = _compile_expression(after, "'after'")
+    if index is None:
+        index = TaskIndex(session.tasks if tasks is None else tasks)
+    return index.select_by_keyword(expression)
+
+
+def select_by_mark(
+    session: Session,
+    dag: CompactDAG,
+    tasks: list[PTask] | None = None,
+    index: TaskIndex | None = None,
+) -> set[str] | None:
     """Deselect tests by marks."""
     matchexpr = session.config["marker_expression"]
     if not matchexpr:
         return None
 
-    try:
-        expression = Expression.compile_(matchexpr)
-    except ParseError as e:
-        msg = f"Wrong expression passed to '-m': {matchexpr}: {e}"
-        raise ValueError(msg) from None
-
-    remaining: set[str] = set()
-    for task in session.tasks:
-        if expression.evaluate(MarkMatcher.from_task(task)):
-            remaining.update(task_and_preceding_tasks(task.signature, dag))
-
-    return remaining
+    expression = _compile_expression(matchexpr, "'-m'")
+    if index is None:
+        index = _create_index(session, dag, tasks)
+    return _select_tasks(dag, index.select_by_mark(expression), tasks)
 
 
 def _deselect_others_with_mark(
-    session: Session, remaining: set[str], mark: Mark
+    session: Session, remaining: set[str], mark: Mark, tasks: list[PTask] | None
 ) -> None:
     """Deselect tasks."""
-    for task in session.tasks:
+    for task in session.tasks if tasks is None else tasks:
         if task.signature not in remaining:
             task.markers.append(mark)
 
 
-def select_tasks_by_marks_and_expressions(session: Session, dag: nx.DiGraph) -> None:
-    """Modify the tasks which are executed with expressions and markers."""
-    remaining = select_by_keyword(session, dag)
+def select_tasks_by_marks_and_expressions(
+    session: Session, dag: CompactDAG, tasks: list[PTask] | None = None
+) -> None:
+    """Modify the tasks which are executed with expressions and markers.
+
+    If ``tasks`` is given, only these tasks are selected or deselected, for example,
+    when tasks are added to the DAG after they were created by a task generator.
+
+    """
+    if not session.config["expression"] and not session.config["marker_expression"]:
+        return
+
+    # Markers are indexed lazily, after tasks were deselected by keywords.
+    index = _create_index(session, dag, tasks)
+    remaining = select_by_keyword(session, dag, tasks, index)
     if remaining is not None:
         _deselect_others_with_mark(
-            session, remaining, Mark("skip", (), {"reason": "Deselected by keyword."})
+            session,
+            remaining,
+            Mark("skip", (), {"reason": "Deselected by keyword."}),
+            tasks,
         )
-    remaining = select_by_mark(session, dag)
+    remaining = select_by_mark(session, dag, tasks, index)
     if remaining is not None:
         _deselect_others_with_mark(
-            session, remaining, Mark("skip", (), {"reason": "Deselected by mark."})
+            session,
+            remaining,
+            Mark("skip", (), {"reason": "Deselected by mark."}),
+            tasks,
         )
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import ast
 import enum
+import functools
 import re
 from collections.abc import Iterator
 from collections.abc import Mapping
@@ -37,6 +38,7 @@ from attrs import define
 
 if TYPE_CHECKING:
     import types
+    from collections.abc import Set as AbstractSet
     from typing import NoReturn
 
 
@@ -201,32 +203,34 @@ class MatcherAdapter(Mapping[str, bool]):
 class Expression:
     """A compiled match expression as used by -k and -m.
 
-    The expression can be evaluated against different matchers.
+    The expression can be evaluated against different matchers or, with
+    :meth:`evaluate_sets`, against precomputed sets of matching items.
 
     """
 
-    __slots__ = ("code",)
+    __slots__ = ("code", "tree")
 
-    def __init__(self, code: types.CodeType) -> None:
+    def __init__(
+        self, code: types.CodeType, tree: ast.Expression | None = None
+    ) -> None:
         self.code = code
+        self.tree = tree
 
     @classmethod
     def compile_(cls, input_: str) -> Expression:
         """Compile a match expression.
 
+        Compiled expressions are cached since the same expression is often evaluated
+        many times, for example, with ``@task(after=...)``.
+
         Parameters
         ----------
         input_: str
             The input expression - one line.
 
         """
-        astexpr = expression(Scanner(input_))
-        code: types.CodeType = compile(
-            astexpr,
-            filename="<pytask match expression>",
-            mode="eval",
-        )
-        return cls(code)
+        tree, code = _compile(input_)
+        return cls(code, tree)
 
     def evaluate(self, matcher: Callable[[str], bool]) -> bool:
         """Evaluate the match expression.
@@ -247,3 +251,60 @@ class Expression:
             self.code, {"__builtins__": {}}, MatcherAdapter(matcher)
         )
         return ret
+
+    def evaluate_sets(
+        self,
+        lookup: Callable[[str], AbstractSet[int]],
+        universe: Callable[[], AbstractSet[int]],
+    ) -> AbstractSet[int]:
+        """Evaluate the match expression for many items at once.
+
+        Instead of evaluating the expression per item, each identifier is resolved to
+        the set of items it matches and the boolean operators become set operations.
+
+        Parameters
+        ----------
+        lookup : Callable[[str], AbstractSet[int]]
+            Given an identifier, return the set of items which match it.
+        universe : Callable[[], AbstractSet[int]]
+            Return the set of all items. It is only called for negations.
+
+        Returns
+        -------
+        AbstractSet[int]
+            The items for which the expression matches.
+
+        """
+        if self.tree is None:  # pragma: no cover
+            msg = "The expression was created without a syntax tree."
+            raise ValueError(msg)
+        return _evaluate_sets(self.tree.body, lookup, universe)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(input_: str) -> tuple[ast.Expression, types.CodeType]:
+    astexpr = expression(Scanner(input_))
+    code: types.CodeType = compile(
+        astexpr,
+        filename="<pytask match expression>",
+        mode="eval",
+    )
+    return astexpr, code
+
+
+def _evaluate_sets(
+    node: ast.expr,
+    lookup: Callable[[str], AbstractSet[int]],
+    universe: Callable[[], AbstractSet[int]],
+) -> AbstractSet[int]:
+    if isinstance(node, ast.Name):
+        return lookup(node.id[len(IDENT_PREFIX) :])
+    if isinstance(node, ast.UnaryOp):
+        return universe() - _evaluate_sets(node.operand, lookup, universe)
+    if isinstance(node, ast.BoolOp):
+        left, right = (_evaluate_sets(i, lookup, universe) for i in node.values)
+        return left & right if isinstance(node.op, ast.And) else left | right
+    if isinstance(node, ast.Constant) and not node.value:
+        return frozenset()
+    msg = f"Unexpected node in match expression: {ast.dump(node)}."  # pragma: no cover
+    raise ValueError(msg)  # pragma: no cover
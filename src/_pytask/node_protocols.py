@@ -14,7 +14,14 @@ if TYPE_CHECKING:
     from _pytask.tree_util import PyTree
 
 
-__all__ = ["PNode", "PPathNode", "PProvisionalNode", "PTask", "PTaskWithPath"]
+__all__ = [
+    "PNode",
+    "PPathNode",
+    "PProvisionalNode",
+    "PTask",
+    "PTaskWithPath",
+    "get_node_option",
+]
 
 
 @runtime_checkable
@@ -141,6 +148,17 @@ class PProvisionalNode(Protocol):
         """Collect the objects that are defined by the provisional nodes."""
 
 
+def get_node_option(node: PNode | PProvisionalNode | PTask, name: str) -> bool:
+    """Get an option of a node which enables a feature like caching its value.
+
+    Options are set per node with ``attributes={name: True}`` or per node type with a
+    class attribute ``name = True``. The attribute of the node takes precedence.
+
+    """
+    attributes = getattr(node, "attributes", {})
+    return bool(attributes.get(name, getattr(node, name, False)))
+
+
 def warn_about_upcoming_attributes_field_on_nodes() -> None:
     warnings.warn(
         "PNode and PProvisionalNode will require an 'attributes' field starting "
@@ -24,7 +24,12 @@ from _pytask.node_protocols import PPathNode
 from _pytask.node_protocols import PProvisionalNode
 from _pytask.node_protocols import PTask
 from _pytask.node_protocols import PTaskWithPath
+from _pytask.path import DIRECTORY_INDEX
 from _pytask.path import hash_path
+from _pytask.pickle_utils import dump_zero_copy
+from _pytask.pickle_utils import load_zero_copy
+from _pytask.pluginmanager import hookimpl
+from _pytask.tree_util import get_flat_arguments
 from _pytask.typing import NoDefault
 from _pytask.typing import no_default
 
@@ -34,6 +39,7 @@ if TYPE_CHECKING:
 
     from _pytask.mark import Mark
     from _pytask.models import NodeInfo
+    from _pytask.session import Session
     from _pytask.tree_util import PyTree
 
 
@@ -229,6 +235,12 @@ class PythonNode(PNode):
         The infos acquired while collecting the node.
     attributes: dict[Any, Any]
         A dictionary to store additional information of the task.
+    store
+        Whether the value of a product should be stored in the ``.pytask`` folder
+        with its state. In later runs, the state is known without executing the task
+        that produces the value, so the task and tasks depending on the value can be
+        skipped. The value is only loaded from disk when a task needs it. The value
+        must be picklable.
 
     Examples
     --------
@@ -248,6 +260,9 @@ class PythonNode(PNode):
     hash: bool | Callable[[Any], int | str] = False
     node_info: NodeInfo | None = None
     attributes: dict[Any, Any] = field(factory=dict)
+    store: bool = False
+    _storage_path: Path | None = field(default=None, init=False, repr=False, eq=False)
+    _stored_state: str | None = field(default=None, init=False, repr=False, eq=False)
 
     @property
     def signature(self) -> str:
@@ -266,6 +281,10 @@ class PythonNode(PNode):
         """Load the value."""
         if is_product:
             return self
+        if self.value is no_default and self._read_stored_state() is not None:
+            with self._storage_path.open("rb") as f:  # type: ignore[union-attr]
+                f.readline()
+                self.value = pickle.load(f)  # noqa: S301
         if isinstance(self.value, PythonNode):
             return self.value.load()
         return self.value
@@ -273,6 +292,27 @@ class PythonNode(PNode):
     def save(self, value: Any) -> None:
         """Save the value."""
         self.value = value
+        if self._storage_path is not None:
+            state = self.state()
+            tmp_path = self._storage_path.with_suffix(".tmp")
+            with tmp_path.open("wb") as f:
+                f.write(f"{state}\n".encode())
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self._storage_path)
+            self._stored_state = state
+
+    def set_storage_path(self, path: Path) -> None:
+        """Set the file which stores the value and the state of the node."""
+        if path != self._storage_path:
+            self._storage_path = path
+            self._stored_state = None
+
+    def _read_stored_state(self) -> str | None:
+        """Read the state from the first line of the file of a stored node."""
+        if self._stored_state is None and self._storage_path is not None:
+            with suppress(OSError), self._storage_path.open("rb") as f:
+                self._stored_state = f.readline().decode().rstrip("\n")
+        return self._stored_state
 
     def state(self) -> str | None:
         """Calculate state of the node.
@@ -292,9 +332,12 @@ class PythonNode(PNode):
         strings is salted with a random integer and it would confuse users. See
         {meth}`object.__hash__` for more information.
 
+        If the node is stored and the value has not been loaded, the state stored
+        with the value is returned.
+
         """
         if self.value is no_default:
-            return None
+            return self._read_stored_state()
         if self.hash:
             value = self.load()
             if callable(self.hash):
@@ -319,6 +362,10 @@ class PickleNode(PPathNode):
         A function to serialize the object. Defaults to :func:`pickle.dump`.
     deserializer
         A function to deserialize the object. Defaults to :func:`pickle.load`.
+    zero_copy
+        Whether large buffers of objects like arrays are stored page-aligned with
+        pickle protocol 5 and memory-mapped on load instead of being copied. The
+        serializer and deserializer are not used.
 
     """
 
@@ -327,6 +374,7 @@ class PickleNode(PPathNode):
     attributes: dict[Any, Any] = field(factory=dict)
     serializer: Callable[[Any, BufferedWriter], None] = field(default=pickle.dump)
     deserializer: Callable[[BufferedReader], Any] = field(default=pickle.load)
+    zero_copy: bool = False
 
     @property
     def signature(self) -> str:
@@ -349,11 +397,27 @@ class PickleNode(PPathNode):
         if is_product:
             return self
         with self.path.open("rb") as f:
+            if self.zero_copy:
+                return load_zero_copy(f)
             return self.deserializer(f)
 
     def save(self, value: Any) -> None:
-        with self.path.open("wb") as f:
-            self.serializer(value, f)
+        if not self.zero_copy:
+            with self.path.open("wb") as f:
+                self.serializer(value, f)
+            return
+
+        if isinstance(self.path, UPath):
+            with self.path.open("wb") as f:
+                dump_zero_copy(value, f)
+            return
+
+        # Replace the file instead of overwriting it since loaded values might still
+        # map the previous file.
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with tmp_path.open("wb") as f:
+            dump_zero_copy(value, f)
+        tmp_path.replace(self.path)
 
 
 @define(kw_only=True)
@@ -394,8 +458,15 @@ class DirectoryNode(PProvisionalNode):
         raise NotImplementedError(msg)  # pragma: no cover
 
     def collect(self) -> list[Path]:
-        """Collect paths defined by the pattern."""
-        return list(self.root_dir.glob(self.pattern))  # type: ignore[union-attr]
+        """Collect paths defined by the pattern.
+
+        Local directories are listed with an index that only lists directories again
+        if they changed.
+
+        """
+        if isinstance(self.root_dir, UPath):
+            return list(self.root_dir.glob(self.pattern))
+        return DIRECTORY_INDEX.glob(self.root_dir, self.pattern)  # type: ignore[arg-type]
 
 
 def get_state_of_path(path: Path) -> str | None:
@@ -432,3 +503,15 @@ def _get_state(path: Path) -> str | None:
 
     """
     return get_state_of_path(path)
+
+
+@hookimpl
+def pytask_collect_modify_tasks(session: Session, tasks: list[PTask]) -> None:
+    """Assign files to stored :class:`PythonNode` in the ``.pytask`` folder."""
+    directory = session.config["root"] / ".pytask" / "python_nodes"
+    for task in tasks:
+        for attribute in ("depends_on", "produces"):
+            for node in get_flat_arguments(task, attribute).leaves:
+                if isinstance(node, PythonNode) and node.store:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    node.set_storage_path(directory / f"{node.signature}.pkl")
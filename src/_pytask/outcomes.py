@@ -20,6 +20,7 @@ __all__ = [
     "ExitCode",
     "Persisted",
     "PytaskOutcome",
+    "Restored",
     "Skipped",
     "SkippedAncestorFailed",
     "SkippedUnchanged",
@@ -85,6 +86,9 @@ class TaskOutcome(Enum):
         Outcome for tasks which should persist. Even if dependencies or products have
         changed, skip the task, update all hashes to the new ones, mark it as
         successful.
+    RESTORED
+        Outcome for tasks whose products were restored from the build cache instead
+        of executing the task.
     SKIP
         Outcome for skipped tasks.
     SKIP_PREVIOUS_FAILED
@@ -100,6 +104,7 @@ class TaskOutcome(Enum):
 
     SUCCESS = auto()
     PERSISTENCE = auto()
+    RESTORED = auto()
     SKIP_UNCHANGED = auto()
     SKIP = auto()
     SKIP_PREVIOUS_FAILED = auto()
@@ -112,6 +117,7 @@ class TaskOutcome(Enum):
         symbols = {
             TaskOutcome.SUCCESS: ".",
             TaskOutcome.PERSISTENCE: "p",
+            TaskOutcome.RESTORED: "r",
             TaskOutcome.SKIP_UNCHANGED: "s",
             TaskOutcome.SKIP: "s",
             TaskOutcome.SKIP_PREVIOUS_FAILED: "F",
@@ -127,6 +133,7 @@ class TaskOutcome(Enum):
         descriptions = {
             TaskOutcome.SUCCESS: "Succeeded",
             TaskOutcome.PERSISTENCE: "Persisted",
+            TaskOutcome.RESTORED: "Restored from cache",
             TaskOutcome.SKIP_UNCHANGED: "Skipped because unchanged",
             TaskOutcome.SKIP: "Skipped",
             TaskOutcome.SKIP_PREVIOUS_FAILED: "Skipped because previous failed",
@@ -142,6 +149,7 @@ class TaskOutcome(Enum):
         styles = {
             TaskOutcome.SUCCESS: "success",
             TaskOutcome.PERSISTENCE: "success",
+            TaskOutcome.RESTORED: "success",
             TaskOutcome.SKIP_UNCHANGED: "success",
             TaskOutcome.SKIP: "skipped",
             TaskOutcome.SKIP_PREVIOUS_FAILED: "failed",
@@ -157,6 +165,7 @@ class TaskOutcome(Enum):
         styles_textonly = {
             TaskOutcome.SUCCESS: "success.textonly",
             TaskOutcome.PERSISTENCE: "success.textonly",
+            TaskOutcome.RESTORED: "success.textonly",
             TaskOutcome.SKIP_UNCHANGED: "success.textonly",
             TaskOutcome.SKIP: "skipped.textonly",
             TaskOutcome.SKIP_PREVIOUS_FAILED: "failed.textonly",
@@ -224,6 +233,10 @@ class Persisted(PytaskOutcome):
     """Outcome if task should persist."""
 
 
+class Restored(PytaskOutcome):
+    """Outcome if the products of a task were restored from the build cache."""
+
+
 class WouldBeExecuted(PytaskOutcome):
     """Outcome if a task would be executed."""
 
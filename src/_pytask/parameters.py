@@ -56,6 +56,18 @@ _IGNORE_OPTION = click.Option(
 """click.Option: An option for the --ignore flag."""
 
 
+_DISCOVER_WITH_GIT_OPTION = click.Option(
+    ["--discover-with-git"],
+    is_flag=True,
+    default=False,
+    help=(
+        "Find files with 'git ls-files' instead of walking directories. Files ignored "
+        "by git are not collected."
+    ),
+)
+"""click.Option: An option to find files with git."""
+
+
 _PATH_ARGUMENT = click.Argument(
     ["paths"],
     nargs=-1,
@@ -189,6 +201,8 @@ def pytask_extend_command_line_interface(cli: click.Group) -> None:
             (_CONFIG_OPTION, _HOOK_MODULE_OPTION, _PATH_ARGUMENT)
         )
     for command in ("build", "clean", "collect", "profile"):
-        cli.commands[command].params.extend([_IGNORE_OPTION, _EDITOR_URL_SCHEME_OPTION])
+        cli.commands[command].params.extend(
+            [_IGNORE_OPTION, _DISCOVER_WITH_GIT_OPTION, _EDITOR_URL_SCHEME_OPTION]
+        )
     for command in ("build",):
         cli.commands[command].params.append(_VERBOSE_OPTION)
@@ -3,28 +3,41 @@
 from __future__ import annotations
 
 import contextlib
+import fnmatch
 import functools
 import importlib.util
 import itertools
 import os
+import re
 import sys
+import sysconfig
+import time
 from pathlib import Path
 from types import ModuleType
 from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
 
 from _pytask._hashlib import file_digest
 from _pytask.cache import Cache
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from collections.abc import Sequence
 
 __all__ = [
+    "DIRECTORY_INDEX",
+    "DirectoryIndex",
+    "PatternMatcher",
     "find_case_sensitive_path",
     "find_closest_ancestor",
     "find_common_ancestor",
     "hash_path",
     "import_path",
     "relative_to",
+    "remove_project_modules",
     "shorten_path",
 ]
 
@@ -77,24 +90,55 @@ def find_closest_ancestor(
     'folder/subfolder'
 
     """
-    potential_closest_ancestors = []
-    for ancestor in potential_ancestors:
-        if ancestor == path:
-            return path
-
-        with contextlib.suppress(ValueError):
-            candidate = find_common_ancestor(path, ancestor)
-            potential_closest_ancestors.append(candidate)
-
-    return next(
-        (
-            i
-            for i in sorted(
-                potential_closest_ancestors, key=lambda x: len(x.parts), reverse=True
-            )
-        ),
-        None,
+    n_common_parts = _count_common_parts(path, potential_ancestors)
+    if n_common_parts is None:
+        return None
+
+    parts = _parts_without_anchor(path)
+    if n_common_parts == len(parts):
+        return path
+    return Path(path.anchor, *parts[:n_common_parts])
+
+
+def _count_common_parts(path: Path, potential_ancestors: Sequence[Path]) -> int | None:
+    """Count the parts of the deepest common ancestor without the anchor."""
+    trie = _create_ancestor_trie(tuple(potential_ancestors)).get(
+        _normalize_anchor(path)
     )
+    if trie is None:
+        return None
+
+    n_common_parts = 0
+    for part in _parts_without_anchor(path):
+        trie = trie.get(os.path.normcase(part))
+        if trie is None:
+            break
+        n_common_parts += 1
+    return n_common_parts
+
+
+def _parts_without_anchor(path: Path) -> tuple[str, ...]:
+    return path.parts[1:] if path.anchor else path.parts
+
+
+def _normalize_anchor(path: Path) -> str:
+    return os.path.normcase(path.anchor)
+
+
+@functools.lru_cache(maxsize=32)
+def _create_ancestor_trie(paths: tuple[Path, ...]) -> dict[str, dict[str, Any]]:
+    """Create tries of path parts for each anchor.
+
+    The deepest node reached by the parts of a path is its deepest common ancestor
+    with any of the paths. Paths with different anchors have no common ancestor.
+
+    """
+    tries: dict[str, dict[str, Any]] = {}
+    for path in paths:
+        node = tries.setdefault(_normalize_anchor(path), {})
+        for part in _parts_without_anchor(path):
+            node = node.setdefault(os.path.normcase(part), {})
+    return tries
 
 
 def find_common_ancestor(*paths: Path) -> Path:
@@ -320,6 +364,37 @@ def _insert_missing_modules(modules: dict[str, ModuleType], module_name: str) ->
         module_name = ".".join(module_parts)
 
 
+def remove_project_modules(names: Iterable[str], root: Path) -> None:
+    """Remove modules of the project from :data:`sys.modules`.
+
+    The modules are imported again the next time they are needed. Modules of installed
+    packages are kept unless the project itself lives inside the environment. Empty
+    parent modules created by :func:`import_path` are removed as well.
+
+    """
+    excluded = {
+        Path(p) for p in (sys.prefix, sys.base_prefix, *sysconfig.get_paths().values())
+    }
+    excluded = {p for p in excluded if p != root and p not in root.parents}
+
+    names = set(names)
+    removed = set()
+    for name in names:
+        file = getattr(sys.modules.get(name), "__file__", None)
+        if not file:
+            continue
+        parents = Path(file).parents
+        if root in parents and excluded.isdisjoint(parents):
+            removed.add(name)
+
+    for name in names:
+        if name in removed or (
+            getattr(sys.modules.get(name), "__file__", None) is None
+            and any(other.startswith(f"{name}.") for other in removed)
+        ):
+            sys.modules.pop(name, None)
+
+
 def shorten_path(path: Path, paths: Sequence[Path]) -> str:
     """Shorten a path.
 
@@ -330,14 +405,19 @@ def shorten_path(path: Path, paths: Sequence[Path]) -> str:
     path from one path in ``session.config["paths"]`` to the node.
 
     """
-    ancestor = find_closest_ancestor(path, paths)
-    if ancestor is None:
+    n_common_parts = _count_common_parts(path, paths)
+    if n_common_parts is None:
         try:
             ancestor = find_common_ancestor(path, *paths)
         except ValueError:
             ancestor = path.parents[-1]
+        return relative_to(path, ancestor).as_posix()
 
-    return relative_to(path, ancestor).as_posix()
+    # The relative path starts with the name of the closest ancestor.
+    parts = _parts_without_anchor(path)
+    if n_common_parts:
+        return "/".join(parts[n_common_parts - 1 :])
+    return "/".join(parts) or "."
 
 
 HashPathCache = Cache()
@@ -358,3 +438,239 @@ def hash_path(
     with path.open("rb") as f:
         hash_ = file_digest(f, digest)
     return hash_.hexdigest()
+
+
+@define
+class PatternMatcher:
+    """Match paths against many patterns at once.
+
+    The result is the same as calling :meth:`pathlib.PurePath.match` with every pattern,
+    but relative patterns are compiled into one regular expression per number of path
+    components. Paths are passed as strings to avoid creating :class:`pathlib.Path`
+    objects while walking large directory trees.
+
+    """
+
+    relative: dict[int, re.Pattern[str]]
+    absolute: list[str]
+
+    @classmethod
+    def from_patterns(cls, patterns: Sequence[str]) -> PatternMatcher:
+        flags = 0 if os.path.normcase("A") == "A" else re.IGNORECASE
+        grouped: dict[int, list[str]] = {}
+        absolute = []
+        for pattern in patterns:
+            pure_pattern = Path(pattern)
+            if pure_pattern.anchor:
+                absolute.append(pattern)
+                continue
+            regex = "/".join(_translate_glob(part) for part in pure_pattern.parts)
+            grouped.setdefault(len(pure_pattern.parts), []).append(regex)
+
+        relative = {
+            n_parts: re.compile("|".join(regexes), flags)
+            for n_parts, regexes in grouped.items()
+        }
+        return cls(relative=relative, absolute=absolute)
+
+    def match(self, path: str) -> bool:
+        """Check whether the path matches any pattern."""
+        if os.sep != "/":
+            path = path.replace(os.sep, "/")
+        for n_parts, regex in self.relative.items():
+            parts = path.rsplit("/", n_parts)
+            if len(parts) > n_parts or (len(parts) == n_parts and parts[0]):
+                tail = "/".join(parts[-n_parts:])
+                if regex.fullmatch(tail):
+                    return True
+        return any(Path(path).match(pattern) for pattern in self.absolute)
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate the glob pattern of one path component into a regular expression.
+
+    The semantics are the same as in :func:`fnmatch.translate`, but the expression is
+    not anchored and wildcards do not match ``/``. So, the expressions of multiple
+    components can be joined with ``/``.
+
+    """
+    regex = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                regex.append(re.escape(char))
+            else:
+                regex.append(_translate_glob_set(pattern[i:j]))
+                i = j + 1
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _translate_glob_set(content: str) -> str:
+    """Translate the content of a set like ``[a-z]`` or ``[!ab]`` in a glob pattern."""
+    negate = content.startswith("!")
+    if negate:
+        content = content[1:]
+
+    items = []
+    i = 0
+    while i < len(content):
+        # A hyphen between two characters forms a range. Empty ranges are dropped.
+        if i + 2 < len(content) and content[i + 1] == "-":
+            low, high = content[i], content[i + 2]
+            if low <= high:
+                items.append(f"{re.escape(low)}-{re.escape(high)}")
+            i += 3
+        else:
+            items.append(re.escape(content[i]))
+            i += 1
+
+    if negate:
+        return f"[^/{''.join(items)}]"
+    return f"[{''.join(items)}]" if items else "(?!)"
+
+
+_RACY_INTERVAL_NS = 2 * 10**9
+"""Listings taken shortly after a directory changed are not reused.
+
+The modification times of some file systems are coarse. If a directory is listed and
+changed again within the same tick, its modification time would not change. Thus, the
+listing is only trusted if it was taken some time after the last modification.
+
+"""
+
+
+@define
+class DirectoryIndex:
+    """An index of directory listings which are validated by modification times.
+
+    :meth:`glob` returns the same paths as :meth:`pathlib.Path.glob`, but directories
+    are only listed with :func:`os.scandir` if their modification time changed since
+    they were listed the last time. Unchanged directories only cost a call to
+    :func:`os.stat`.
+
+    The listings map a directory to its modification time, the time of the listing,
+    and the names of files, subdirectories, and subdirectories which are symlinks.
+
+    """
+
+    listings: dict[str, tuple[int, int, list[str], list[str], list[str]]] = field(
+        factory=dict
+    )
+    modified: bool = False
+
+    def glob(self, root_dir: Path, pattern: str) -> list[Path]:  # noqa: C901
+        """Find paths matching the pattern relative to the root directory."""
+        parts = Path(pattern).parts
+        if (
+            not parts
+            or Path(pattern).anchor
+            or parts[-1] == "**"
+            or any(part in (".", "..") for part in parts)
+        ):
+            return list(root_dir.glob(pattern))
+
+        flags = 0 if os.path.normcase("A") == "A" else re.IGNORECASE
+        regexes = [
+            None if part == "**" else re.compile(fnmatch.translate(part), flags)
+            for part in parts
+        ]
+        last = len(regexes) - 1
+
+        def expand(states: set[int]) -> frozenset[int]:
+            # ``**`` also matches zero directories.
+            for state in sorted(states):
+                if regexes[state] is None:
+                    states.add(state + 1)
+            return frozenset(states)
+
+        matches = []
+        stack = [(os.fspath(root_dir), expand({0}))]
+        while stack:
+            directory, states = stack.pop()
+            listing = self._list(directory)
+            if listing is None:
+                continue
+            _, _, files, dirs, symlinks = listing
+
+            for name, is_dir in itertools.chain(
+                zip(files, itertools.repeat(False)), zip(dirs, itertools.repeat(True))
+            ):
+                child_states = set()
+                for state in states:
+                    regex = regexes[state]
+                    if regex is None:
+                        # Like pathlib, do not follow symlinks for ``**``.
+                        if is_dir and name not in symlinks:
+                            child_states.add(state)
+                    elif regex.fullmatch(name):
+                        if state == last:
+                            matches.append(os.path.join(directory, name))  # noqa: PTH118
+                        elif is_dir:
+                            child_states.add(state + 1)
+                if child_states:
+                    stack.append(
+                        (
+                            os.path.join(directory, name),  # noqa: PTH118
+                            expand(child_states),
+                        )
+                    )
+
+        return list(map(type(root_dir), sorted(set(matches))))
+
+    def _list(
+        self, directory: str
+    ) -> tuple[int, int, list[str], list[str], list[str]] | None:
+        """List a directory or reuse the listing if the directory is unchanged."""
+        try:
+            modification_time = os.stat(directory).st_mtime_ns  # noqa: PTH116
+        except OSError:
+            return None
+
+        listing = self.listings.get(directory)
+        if (
+            listing is not None
+            and listing[0] == modification_time
+            and listing[1] - modification_time > _RACY_INTERVAL_NS
+        ):
+            return listing
+
+        files, dirs, symlinks = [], [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        dirs.append(entry.name)
+                        if entry.is_symlink():
+                            symlinks.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            return None
+
+        listing = (modification_time, time.time_ns(), files, dirs, symlinks)
+        self.listings[directory] = listing
+        self.modified = True
+        return listing
+
+
+DIRECTORY_INDEX = DirectoryIndex()
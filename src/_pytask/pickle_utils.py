@@ -0,0 +1,94 @@
+"""Contains functions to pickle objects with out-of-band buffers.
+
+Pickle protocol 5 allows objects like NumPy arrays or Arrow tables to hand their data
+buffers to a ``buffer_callback`` instead of copying them into the pickle stream. The
+functions store these buffers page-aligned in the same file, followed by the pickle
+stream and a trailer which points to it::
+
+    [buffer 0][padding][buffer 1]...[pickle stream and layout][offset][magic]
+
+On load, the file is memory-mapped and the objects are reconstructed with views on the
+mapping. So, opening a large array is fast, and only the pages which are accessed are
+read from disk. The mapping is copy-on-write. Objects can be modified in memory
+without changing the file.
+
+Small and non-contiguous buffers are stored in the pickle stream.
+
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import pickle
+import struct
+from typing import IO
+from typing import Any
+
+__all__ = ["dump_zero_copy", "load_zero_copy"]
+
+
+_MAGIC = b"PYTASKZ1"
+_TRAILER = struct.Struct(f"<Q{len(_MAGIC)}s")
+_MIN_OUT_OF_BAND_SIZE = mmap.PAGESIZE
+"""Smaller buffers are stored in the pickle stream to avoid padding."""
+
+
+def dump_zero_copy(value: Any, f: IO[bytes]) -> None:
+    """Pickle a value and store large buffers page-aligned in the same file."""
+    buffers: list[memoryview] = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        try:
+            raw = buffer.raw()
+        except BufferError:
+            return True
+        if raw.nbytes < _MIN_OUT_OF_BAND_SIZE:
+            return True
+        buffers.append(raw)
+        return False
+
+    data = pickle.dumps(value, protocol=5, buffer_callback=buffer_callback)
+
+    position = 0
+    layout = []
+    for raw in buffers:
+        offset = -(-position // mmap.PAGESIZE) * mmap.PAGESIZE
+        f.write(b"\0" * (offset - position))
+        f.write(raw)
+        layout.append((offset, raw.nbytes))
+        position = offset + raw.nbytes
+
+    f.write(pickle.dumps((layout, data), protocol=5))
+    f.write(_TRAILER.pack(position, _MAGIC))
+
+
+def load_zero_copy(f: IO[bytes]) -> Any:
+    """Load a value stored with :func:`dump_zero_copy`.
+
+    Buffers are views on a memory-mapped file if the file has a descriptor and copies
+    otherwise, for example, for remote files.
+
+    """
+    f.seek(-_TRAILER.size, io.SEEK_END)
+    position, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != _MAGIC:
+        msg = "The file was not written with 'dump_zero_copy'."
+        raise pickle.UnpicklingError(msg)
+
+    f.seek(position)
+    layout, data = pickle.load(f)  # noqa: S301
+    if not layout:
+        return pickle.loads(data)  # noqa: S301
+
+    try:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        buffers: list[Any] = []
+        for offset, size in layout:
+            f.seek(offset)
+            buffers.append(bytearray(f.read(size)))
+    else:
+        view = memoryview(mapping)
+        buffers = [view[offset : offset + size] for offset, size in layout]
+    return pickle.loads(data, buffers=buffers)  # noqa: S301
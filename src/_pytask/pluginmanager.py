@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import functools
 import importlib
+import importlib.metadata
 import sys
+import weakref
+from types import ModuleType
 from typing import TYPE_CHECKING
+from typing import NamedTuple
 
 from attrs import define
 from pluggy import HookimplMarker
@@ -15,9 +20,15 @@ from _pytask import hookspecs
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from pluggy import HookRelay
+
 __all__ = [
+    "PluginDistribution",
     "get_plugin_manager",
+    "has_only_builtin_hookimpls",
     "hookimpl",
+    "list_plugin_distributions",
+    "load_entry_points",
     "register_hook_impls_from_modules",
     "storage",
 ]
@@ -26,6 +37,18 @@ __all__ = [
 hookimpl = HookimplMarker("pytask")
 
 
+class PluginDistribution(NamedTuple):
+    """The name and the version of the distribution which provides a plugin."""
+
+    project_name: str
+    version: str
+
+
+_PLUGIN_DISTRIBUTIONS: weakref.WeakKeyDictionary[
+    PluginManager, list[tuple[object, PluginDistribution]]
+] = weakref.WeakKeyDictionary()
+
+
 def register_hook_impls_from_modules(
     plugin_manager: PluginManager, module_names: Iterable[str]
 ) -> None:
@@ -40,6 +63,7 @@ def pytask_add_hooks(pm: PluginManager) -> None:
     """Add hooks."""
     builtin_hook_impl_modules = (
         "_pytask.build",
+        "_pytask.build_cache",
         "_pytask.capture",
         "_pytask.clean",
         "_pytask.collect",
@@ -47,29 +71,52 @@ def pytask_add_hooks(pm: PluginManager) -> None:
         "_pytask.config",
         "_pytask.dag",
         "_pytask.dag_command",
+        "_pytask.daemon",
         "_pytask.database",
         "_pytask.debugging",
         "_pytask.provisional",
         "_pytask.execute",
         "_pytask.live",
         "_pytask.logging",
+        "_pytask.manifest",
         "_pytask.mark",
         "_pytask.nodes",
         "_pytask.parameters",
         "_pytask.persist",
+        "_pytask.prefetch",
         "_pytask.profile",
+        "_pytask.release",
         "_pytask.skipping",
         "_pytask.task",
+        "_pytask.temporary",
+        "_pytask.value_cache",
         "_pytask.warnings",
+        "_pytask.writer",
+        "_pytask.watch",
     )
     register_hook_impls_from_modules(pm, builtin_hook_impl_modules)
 
 
+def has_only_builtin_hookimpls(hook: HookRelay, names: Iterable[str]) -> bool:
+    """Check whether only pytask itself implements the hooks with the given names."""
+    for name in names:
+        for hookimpl_ in getattr(hook, name).get_hookimpls():
+            plugin = hookimpl_.plugin
+            module = (
+                plugin.__name__
+                if isinstance(plugin, ModuleType)
+                else getattr(plugin, "__module__", "")
+            )
+            if module.partition(".")[0] != "_pytask":
+                return False
+    return True
+
+
 def get_plugin_manager() -> PluginManager:
     """Get the plugin manager."""
     pm = PluginManager("pytask")
     pm.add_hookspecs(hookspecs)
-    pm.load_setuptools_entrypoints("pytask")
+    load_entry_points(pm, "pytask")
 
     pm.register(sys.modules[__name__])
     pm.hook.pytask_add_hooks.call_historic(kwargs={"pm": pm})
@@ -77,6 +124,49 @@ def get_plugin_manager() -> PluginManager:
     return pm
 
 
+def load_entry_points(pm: PluginManager, group: str) -> None:
+    """Load plugins from entry points.
+
+    The same as :meth:`pluggy.PluginManager.load_setuptools_entrypoints`, but the
+    entry points are only searched once per :data:`sys.path` since scanning the
+    metadata of all installed distributions is slow.
+
+    """
+    distributions = _PLUGIN_DISTRIBUTIONS.setdefault(pm, [])
+    for dist, entry_point in _find_entry_points(group, tuple(sys.path)):
+        if pm.get_plugin(entry_point.name) or pm.is_blocked(entry_point.name):
+            continue
+        plugin = entry_point.load()
+        pm.register(plugin, name=entry_point.name)
+        distributions.append((plugin, dist))
+
+
+def list_plugin_distributions(
+    pm: PluginManager,
+) -> list[tuple[object, PluginDistribution]]:
+    """List the registered plugins loaded from entry points with their distributions."""
+    return [
+        (plugin, dist)
+        for plugin, dist in _PLUGIN_DISTRIBUTIONS.get(pm, [])
+        if pm.is_registered(plugin)
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def _find_entry_points(
+    group: str, path: tuple[str, ...]
+) -> tuple[tuple[PluginDistribution, importlib.metadata.EntryPoint], ...]:
+    import importlib.metadata
+
+    entry_points = []
+    for dist in importlib.metadata.distributions(path=list(path)):
+        plugins = [ep for ep in dist.entry_points if ep.group == group]
+        if plugins:
+            info = PluginDistribution(dist.metadata["name"], dist.version)
+            entry_points.extend((info, entry_point) for entry_point in plugins)
+    return tuple(entry_points)
+
+
 @define
 class _PluginManagerStorage:
     """A class to store the plugin manager.
@@ -85,8 +175,8 @@ class _PluginManagerStorage:
     CLI or the API.
 
     When pytask is called from the CLI, the plugin manager is created in
-    :mod:`_pytask.cli` outside the click command to extend the command line interface.
-    Afterwards, it needs to be accessed in the different commands.
+    :mod:`_pytask.cli` outside the click command when the command line interface is
+    extended. Afterwards, it needs to be accessed in the different commands.
 
     When pytask is called from the API, the plugin manager needs to be created inside
     the function, for example, :func:`~pytask.build` to ensure each call can start from
@@ -106,6 +196,12 @@ class _PluginManagerStorage:
         assert self._plugin_manager
         return self._plugin_manager
 
+    def get_or_create(self) -> PluginManager:
+        """Get the plugin manager or create it if it does not exist."""
+        if self._plugin_manager is None:
+            return self.create()
+        return self._plugin_manager
+
     def store(self, pm: PluginManager) -> None:
         """Store the plugin manager."""
         self._plugin_manager = pm
@@ -0,0 +1,192 @@
+"""Contains the prefetcher which loads dependencies of upcoming tasks in the background.
+
+In the serial execution, the dependencies of a task are loaded right before the task is
+executed. Reading files from network storage or unpickling them does not overlap with
+the computations of other tasks.
+
+The prefetcher looks at the tasks which the scheduler hands out next and loads their
+dependencies in background threads while the current task runs. When an upcoming task
+is executed, it receives the prefetched values.
+
+The memory used by prefetched values is limited by ``prefetch_size``. When a load is
+started, the size of the file is reserved for nodes with paths. The reservation is
+replaced with the estimated size of the value once it is loaded. No value is prefetched
+if its reservation would exceed the budget. Prefetching is disabled by default since
+custom nodes need to support loading in threads.
+
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
+
+from _pytask.node_protocols import PPathNode
+from _pytask.node_protocols import PProvisionalNode
+from _pytask.pluginmanager import hookimpl
+from _pytask.tree_util import get_flat_arguments
+from _pytask.value_cache import estimate_size
+from _pytask.value_cache import parse_size
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from _pytask.node_protocols import PNode
+    from _pytask.session import Session
+    from _pytask.value_cache import ValueCache
+
+
+__all__ = ["Prefetcher"]
+
+
+@hookimpl
+def pytask_parse_config(config: dict[str, Any]) -> None:
+    """Parse the configuration."""
+    config["prefetch_size"] = parse_size(config.get("prefetch_size", 0))
+
+
+@hookimpl
+def pytask_unconfigure(session: Session) -> None:
+    """Stop the threads of the prefetcher."""
+    session.prefetcher.shutdown()
+
+
+@define
+class Prefetcher:
+    """Load the dependencies of upcoming tasks in background threads.
+
+    Attributes
+    ----------
+    max_size
+        The maximum size of all prefetched values in bytes. Values are not prefetched
+        if it is zero.
+    n_threads
+        The number of threads which load values.
+    size
+        The estimated size of all prefetched values and the reserved size of values
+        which are loading in bytes.
+
+    """
+
+    max_size: int = 0
+    n_threads: int = 4
+    size: int = 0
+    _futures: dict[str, dict[str, tuple[Future[tuple[Any, int]], int]]] = field(
+        factory=dict
+    )
+    _executor: ThreadPoolExecutor | None = None
+    _lock: threading.Lock = field(factory=threading.Lock)
+
+    def prefetch(self, session: Session, signatures: Iterable[str]) -> None:
+        """Start loading the dependencies of tasks in the background."""
+        if not self.max_size:
+            return
+
+        for signature in signatures:
+            if signature in self._futures:
+                continue
+            if self.size >= self.max_size:
+                return
+
+            task = session.dag.nodes[signature]["task"]
+            futures: dict[str, tuple[Future[tuple[Any, int]], int]] = {}
+            self._futures[signature] = futures
+            for node in get_flat_arguments(task, "depends_on").leaves:
+                if isinstance(node, PProvisionalNode) or node.signature in futures:
+                    continue
+                reserved = _get_expected_size(node)
+                if self.size + reserved > self.max_size:
+                    return
+                futures[node.signature] = self._submit(
+                    session.value_cache, node, reserved
+                )
+
+    def load(self, task_signature: str, node: PNode, value_cache: ValueCache) -> Any:
+        """Load the value of a dependency of a task.
+
+        The prefetched value is used if it exists. Otherwise, the value is loaded now.
+        Exceptions raised while prefetching the value are raised again.
+
+        """
+        entry = self._futures.get(task_signature, {}).pop(node.signature, None)
+        if entry is None:
+            return value_cache.load(node)
+
+        value, size = entry[0].result()
+        with self._lock:
+            self.size -= size
+        return value
+
+    def discard(self, task_signature: str) -> None:
+        """Discard the values prefetched for a task which were not used."""
+        for future, reserved in self._futures.pop(task_signature, {}).values():
+            if future.cancel():
+                with self._lock:
+                    self.size -= reserved
+            else:
+                future.add_done_callback(self._release)
+
+    def shutdown(self) -> None:
+        """Cancel pending loads and stop the threads."""
+        for task_signature in list(self._futures):
+            self.discard(task_signature)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_threads, thread_name_prefix="pytask-prefetch"
+            )
+        return self._executor
+
+    def _submit(
+        self, value_cache: ValueCache, node: PNode, reserved: int
+    ) -> tuple[Future[tuple[Any, int]], int]:
+        """Reserve the expected size of a value and start loading it."""
+        with self._lock:
+            self.size += reserved
+        future = self._get_executor().submit(self._load, value_cache, node, reserved)
+        return future, reserved
+
+    def _load(
+        self, value_cache: ValueCache, node: PNode, reserved: int
+    ) -> tuple[Any, int]:
+        try:
+            value = value_cache.load(node)
+        except BaseException:
+            with self._lock:
+                self.size -= reserved
+            raise
+        size = estimate_size(value)
+        with self._lock:
+            self.size += size - reserved
+        return value, size
+
+    def _release(self, future: Future[tuple[Any, int]]) -> None:
+        if future.exception() is None:
+            _, size = future.result()
+            with self._lock:
+                self.size -= size
+
+
+def _get_expected_size(node: PNode) -> int:
+    """Get the expected size of the value of a node before it is loaded.
+
+    The size of the file is used for nodes with paths. The size of other values is
+    unknown before they are loaded.
+
+    """
+    if isinstance(node, PPathNode):
+        try:
+            return node.path.stat().st_size
+        except OSError:
+            pass
+    return 0
@@ -58,6 +58,15 @@ class Runtime(BaseTable):
     duration: Mapped[float]
 
 
+class ReleasedMemory(BaseTable):
+    """Record of memory released after tasks finished."""
+
+    __tablename__ = "released_memory"
+
+    task: Mapped[str] = mapped_column(primary_key=True)
+    size: Mapped[int]
+
+
 @hookimpl(tryfirst=True)
 def pytask_extend_command_line_interface(cli: click.Group) -> None:
     """Extend the command line interface."""
@@ -70,6 +79,7 @@ def pytask_post_parse(config: dict[str, Any]) -> None:
     config["pm"].register(ExportNameSpace)
     config["pm"].register(DurationNameSpace)
     config["pm"].register(FileSizeNameSpace)
+    config["pm"].register(ReleasedMemoryNameSpace)
 
 
 @hookimpl(wrapper=True)
@@ -105,6 +115,13 @@ def _create_or_update_runtime(task_signature: str, start: float, end: float) ->
         session.commit()
 
 
+def update_released_memory(task_signature: str, size: int) -> None:
+    """Store the memory released after a task finished in the database."""
+    with DatabaseSession() as session:
+        session.merge(ReleasedMemory(task=task_signature, size=size))
+        session.commit()
+
+
 @click.command(cls=ColoredCommand)
 @click.option(
     "--export",
@@ -228,6 +245,24 @@ class FileSizeNameSpace:
                 )
 
 
+class ReleasedMemoryNameSpace:
+    """A namespace for adding the memory released after a task to the profile."""
+
+    @staticmethod
+    @hookimpl
+    def pytask_profile_add_info_on_task(
+        tasks: list[PTask], profile: dict[str, dict[str, Any]]
+    ) -> None:
+        """Add the memory which was last released after a task finished."""
+        with DatabaseSession() as session:
+            records = [session.get(ReleasedMemory, task.signature) for task in tasks]
+        for task, record in zip(tasks, records):
+            if record:
+                profile[task.name]["Released Memory"] = _to_human_readable_size(
+                    record.size
+                )
+
+
 def _to_human_readable_size(bytes_: int, units: list[str] | None = None) -> str:
     """Convert bytes to a human readable size."""
     units = [" bytes", " KB", " MB", " GB", " TB"] if units is None else units
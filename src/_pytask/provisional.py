@@ -2,26 +2,34 @@
 
 from __future__ import annotations
 
-import inspect
 import sys
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 
+from _pytask._inspect import get_parameter_names
 from _pytask.config import hookimpl
 from _pytask.exceptions import NodeLoadError
+from _pytask.exceptions import NodeNotCollectedError
+from _pytask.manifest import is_placeholder
 from _pytask.node_protocols import PNode
 from _pytask.node_protocols import PProvisionalNode
 from _pytask.node_protocols import PTask
 from _pytask.node_protocols import PTaskWithPath
 from _pytask.outcomes import CollectionOutcome
+from _pytask.provisional_utils import REPLAYED_TASKS
 from _pytask.provisional_utils import TASKS_WITH_PROVISIONAL_NODES
 from _pytask.provisional_utils import collect_provisional_nodes
+from _pytask.provisional_utils import hash_inputs_of_task_generator
+from _pytask.provisional_utils import load_generated_tasks
 from _pytask.provisional_utils import recreate_dag
+from _pytask.provisional_utils import save_generated_tasks
+from _pytask.reports import CollectionReport
 from _pytask.reports import ExecutionReport
+from _pytask.shared import unwrap_task_function
 from _pytask.task_utils import COLLECTED_TASKS
 from _pytask.task_utils import parse_collected_tasks_with_task_marker
-from _pytask.tree_util import tree_map
+from _pytask.tree_util import get_flat_arguments
 from _pytask.tree_util import tree_map_with_path
 from _pytask.typing import is_task_generator
 from pytask import TaskOutcome
@@ -55,31 +63,25 @@ def _safe_load(node: PNode | PProvisionalNode, task: PTask, is_product: bool) ->
 
 
 @hookimpl
-def pytask_execute_task(session: Session, task: PTask) -> None:
-    """Execute task generators and collect the tasks."""
-    if is_task_generator(task):
-        kwargs = {}
-        for name, value in task.depends_on.items():
-            kwargs[name] = tree_map(lambda x: _safe_load(x, task, False), value)
-
-        parameters = inspect.signature(task.function).parameters
-        for name, value in task.produces.items():
-            if name in parameters:
-                kwargs[name] = tree_map(lambda x: _safe_load(x, task, True), value)
-
-        task.execute(**kwargs)
-
-        # Parse tasks created with @task.
-        name_to_function: Mapping[str, Callable[..., Any] | PTask]
-        if isinstance(task, PTaskWithPath) and task.path in COLLECTED_TASKS:
-            tasks = COLLECTED_TASKS.pop(task.path)
-            name_to_function = parse_collected_tasks_with_task_marker(tasks)
-        elif None in COLLECTED_TASKS:
-            tasks = COLLECTED_TASKS.pop(None)
-            name_to_function = parse_collected_tasks_with_task_marker(tasks)
-        else:
-            msg = "The task generator {task.name!r} did not create any tasks."
-            raise RuntimeError(msg)
+def pytask_execute_task(session: Session, task: PTask) -> bool | None:
+    """Execute task generators and collect the tasks.
+
+    If the inputs of a task generator did not change since the last run, the tasks it
+    created are replayed without executing the task generator.
+
+    """
+    if not is_task_generator(task):
+        if task.signature in REPLAYED_TASKS and not session.config["dry_run"]:
+            _replace_placeholders_of_replayed_tasks(
+                session, REPLAYED_TASKS[task.signature]
+            )
+        return None
+
+    hash_ = None if session.config["force"] else hash_inputs_of_task_generator(task)
+    new_tasks = None if hash_ is None else load_generated_tasks(task, hash_)
+
+    if new_tasks is None:
+        name_to_function = _run_task_generator(session, task)
 
         new_reports = []
         for name, function in name_to_function.items():
@@ -92,23 +94,90 @@ def pytask_execute_task(session: Session, task: PTask) -> None:
             )
             new_reports.append(report)
 
-        session.tasks.extend(
+        new_tasks = [
             i.node
             for i in new_reports
             if i.outcome == CollectionOutcome.SUCCESS and isinstance(i.node, PTask)
+        ]
+        if hash_ is not None and len(new_tasks) == len(new_reports):
+            save_generated_tasks(task, hash_, new_tasks)
+    else:
+        new_reports = [
+            CollectionReport(outcome=CollectionOutcome.SUCCESS, node=new_task)
+            for new_task in new_tasks
+        ]
+
+    session.tasks.extend(new_tasks)
+    session.collection_reports.extend(new_reports)
+
+    try:
+        session.hook.pytask_collect_modify_tasks(session=session, tasks=session.tasks)
+    except Exception:  # noqa: BLE001  # pragma: no cover
+        report = ExecutionReport.from_task_and_exception(
+            task=task, exc_info=sys.exc_info()
         )
+        session.collection_reports.append(report)
 
-        try:
-            session.hook.pytask_collect_modify_tasks(
-                session=session, tasks=session.tasks
+    recreate_dag(session, task, new_tasks)
+    return True
+
+
+def _replace_placeholders_of_replayed_tasks(session: Session, generator: PTask) -> None:
+    """Run the task generator to replace the placeholders of replayed tasks.
+
+    Replayed tasks have placeholders instead of task functions. If one of them is not
+    skipped, the task generator is executed to create the task functions.
+
+    """
+    name_to_function = _run_task_generator(session, generator)
+    for signature in [s for s, t in REPLAYED_TASKS.items() if t is generator]:
+        replayed_task = session.dag.nodes[signature]["task"]
+        del REPLAYED_TASKS[signature]
+        if not is_placeholder(replayed_task.function):
+            continue
+
+        function = name_to_function.get(replayed_task.base_name)
+        if function is None:
+            msg = (
+                f"The task {replayed_task.name!r} was replayed from a previous run of "
+                f"the task generator {generator.name!r}, but the task generator did "
+                "not create it again."
             )
-        except Exception:  # noqa: BLE001  # pragma: no cover
-            report = ExecutionReport.from_task_and_exception(
-                task=task, exc_info=sys.exc_info()
+            raise NodeNotCollectedError(msg)
+        replayed_task.function = unwrap_task_function(function)
+
+
+def _run_task_generator(
+    session: Session,  # noqa: ARG001
+    task: PTask,
+) -> Mapping[str, Callable[..., Any] | PTask]:
+    """Execute a task generator and parse the tasks it created."""
+    kwargs = {}
+    for name, (leaves, treespec) in get_flat_arguments(
+        task, "depends_on"
+    ).arguments.items():
+        kwargs[name] = treespec.unflatten([_safe_load(x, task, False) for x in leaves])
+
+    parameters = get_parameter_names(task.function)
+    for name, (leaves, treespec) in get_flat_arguments(
+        task, "produces"
+    ).arguments.items():
+        if name in parameters:
+            kwargs[name] = treespec.unflatten(
+                [_safe_load(x, task, True) for x in leaves]
             )
-        session.collection_reports.append(report)
 
-        recreate_dag(session, task)
+    task.execute(**kwargs)
+
+    # Parse tasks created with @task.
+    if isinstance(task, PTaskWithPath) and task.path in COLLECTED_TASKS:
+        tasks = COLLECTED_TASKS.pop(task.path)
+        return parse_collected_tasks_with_task_marker(tasks)
+    if None in COLLECTED_TASKS:
+        tasks = COLLECTED_TASKS.pop(None)
+        return parse_collected_tasks_with_task_marker(tasks)
+    msg = "The task generator {task.name!r} did not create any tasks."
+    raise RuntimeError(msg)
 
 
 @hookimpl
@@ -129,3 +198,4 @@ def pytask_execute_task_process_report(report: ExecutionReport) -> bool | None:
 def pytask_unconfigure() -> None:
     """Clear the global variable after execution."""
     TASKS_WITH_PROVISIONAL_NODES.clear()
+    REPLAYED_TASKS.clear()
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
+import pickle
 import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
 from _pytask.collect_utils import collect_dependency
-from _pytask.dag import create_dag_from_session
+from _pytask.dag import update_dag
 from _pytask.dag_utils import TopologicalSorter
+from _pytask.database_utils import BaseTable
+from _pytask.database_utils import DatabaseSession
+from _pytask.manifest import create_task_records
+from _pytask.manifest import restore_task
 from _pytask.models import NodeInfo
 from _pytask.node_protocols import PNode
 from _pytask.node_protocols import PProvisionalNode
@@ -18,6 +27,7 @@ from _pytask.node_protocols import PTaskWithPath
 from _pytask.nodes import Task
 from _pytask.reports import ExecutionReport
 from _pytask.tree_util import PyTree
+from _pytask.tree_util import get_flat_arguments
 from _pytask.tree_util import tree_map_with_path
 from _pytask.typing import is_task_generator
 
@@ -27,6 +37,19 @@ if TYPE_CHECKING:
 
 TASKS_WITH_PROVISIONAL_NODES = set()
 
+REPLAYED_TASKS: dict[str, PTask] = {}
+"""Maps the signatures of replayed tasks to the task generators which created them."""
+
+
+class GeneratedTasks(BaseTable):
+    """Record of the tasks created by a task generator and the state of its inputs."""
+
+    __tablename__ = "generated_tasks"
+
+    task: Mapped[str] = mapped_column(primary_key=True)
+    hash_: Mapped[str]
+    value: Mapped[bytes]
+
 
 def collect_provisional_nodes(
     session: Session, task: PTask, node: Any, path: tuple[Any, ...]
@@ -69,18 +92,27 @@ def collect_provisional_nodes(
     )
 
 
-def recreate_dag(session: Session, task: PTask) -> None:
-    """Recreate the DAG when provisional nodes are resolved.
+def recreate_dag(
+    session: Session, task: PTask, new_tasks: list[PTask] | None = None
+) -> None:
+    """Update the DAG when provisional nodes are resolved or tasks are generated.
+
+    The DAG and the scheduler are patched in place with the nodes of ``task`` and the
+    ``new_tasks`` created by a task generator instead of being rebuilt from scratch.
 
     If the DAG resolution fails, the error is attached as an execution report since
     there is not better mechanic yet to display the error.
 
     """
+    tasks = [task] if new_tasks is None else new_tasks
     try:
-        session.dag = create_dag_from_session(session)
-        session.scheduler = TopologicalSorter.from_dag_and_sorter(
-            session.dag, session.scheduler
-        )
+        update_dag(session, tasks)
+        if isinstance(session.scheduler, TopologicalSorter):
+            session.scheduler.update(session.dag, [t.signature for t in tasks])
+        else:
+            session.scheduler = TopologicalSorter.from_dag_and_sorter(
+                session.dag, session.scheduler
+            )
 
     except Exception:  # noqa: BLE001
         report = ExecutionReport.from_task_and_exception(task, sys.exc_info())
@@ -105,3 +137,65 @@ def collect_provisional_products(session: Session, task: PTask) -> None:
 
     if task.signature in TASKS_WITH_PROVISIONAL_NODES:
         recreate_dag(session, task)
+
+
+def hash_inputs_of_task_generator(task: PTask) -> str | None:
+    """Hash the states of the task generator and its dependencies and products.
+
+    Returns ``None`` if any state is unknown and the generated tasks cannot be cached.
+
+    """
+    states = [f"{task.signature}:{task.state()}"]
+    for node in (
+        *get_flat_arguments(task, "depends_on").leaves,
+        *get_flat_arguments(task, "produces").leaves,
+    ):
+        if isinstance(node, PProvisionalNode):
+            # Provisional dependencies are resolved before. Provisional products do
+            # not have a state, but they do not change the generated tasks.
+            states.append(node.signature)
+            continue
+        state = node.state()
+        if state is None:
+            return None
+        states.append(f"{node.signature}:{state}")
+    return hashlib.sha256("\n".join(states).encode()).hexdigest()
+
+
+def load_generated_tasks(task: PTask, hash_: str) -> list[PTask] | None:
+    """Restore the tasks created by a task generator if its inputs are unchanged."""
+    if not isinstance(task, Task):
+        return None
+
+    with DatabaseSession() as db_session:
+        record = db_session.get(GeneratedTasks, task.signature)
+    if record is None or record.hash_ != hash_:
+        return None
+
+    try:
+        records = pickle.loads(record.value)  # noqa: S301
+    except Exception:  # noqa: BLE001
+        return None
+
+    new_tasks: list[PTask] = [restore_task(task.path, record) for record in records]
+    for new_task in new_tasks:
+        REPLAYED_TASKS[new_task.signature] = task
+    return new_tasks
+
+
+def save_generated_tasks(task: PTask, hash_: str, new_tasks: list[PTask]) -> None:
+    """Save the tasks created by a task generator if they can be serialized."""
+    if not isinstance(task, Task):
+        return
+
+    records = create_task_records(new_tasks)
+    if records is None:
+        return
+    try:
+        value = pickle.dumps(records)
+    except Exception:  # noqa: BLE001
+        return
+
+    with DatabaseSession() as db_session:
+        db_session.merge(GeneratedTasks(task=task.signature, hash_=hash_, value=value))
+        db_session.commit()
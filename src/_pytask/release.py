@@ -0,0 +1,112 @@
+"""Contains the code to release values of nodes which are no longer needed.
+
+Values returned by tasks are stored in :class:`~pytask.PythonNode` which are referenced
+by the DAG and the tasks until the session ends. Thus, the peak memory grows with the
+whole pipeline.
+
+Instead, the number of tasks which depend on a node is counted. When the last of them
+has finished, the value of the node is released if it was produced in this session,
+and the value is removed from the cache of loaded values. Values of nodes without
+dependent tasks are kept since they are the results of the build.
+
+The released memory is stored in the database and shown by ``pytask profile``.
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
+
+from _pytask.dag_utils import count_dependent_tasks
+from _pytask.nodes import PythonNode
+from _pytask.outcomes import TaskOutcome
+from _pytask.pluginmanager import hookimpl
+from _pytask.profile import update_released_memory
+from _pytask.typing import no_default
+from _pytask.value_cache import estimate_size
+
+if TYPE_CHECKING:
+    from _pytask.reports import ExecutionReport
+    from _pytask.session import Session
+
+
+__all__ = ["ValueReleaser"]
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Register the plugin which releases values."""
+    config["pm"].register(ValueReleaser())
+
+
+@define(eq=False)
+class ValueReleaser:
+    """A plugin which releases values once all dependent tasks have finished.
+
+    Attributes
+    ----------
+    n_remaining_tasks
+        The number of dependent tasks which have not finished yet for each node.
+    produced
+        The signatures of nodes whose values were returned by tasks in this session.
+
+    """
+
+    n_remaining_tasks: dict[str, int] = field(factory=dict)
+    produced: set[str] = field(factory=set)
+
+    @hookimpl(tryfirst=True)
+    def pytask_execute_task_log_end(
+        self, session: Session, report: ExecutionReport
+    ) -> None:
+        """Release the values of dependencies after their last dependent task.
+
+        The hook runs first since the hook returns the first result.
+
+        """
+        dag = session.dag
+        signature = report.task.signature
+
+        if report.outcome == TaskOutcome.SUCCESS:
+            for name in dag.successors(signature):
+                node = dag.get(name)
+                if isinstance(node, PythonNode) and not isinstance(
+                    node.value, PythonNode
+                ):
+                    self.produced.add(name)
+
+        released = 0
+        for name in dag.predecessors(signature):
+            released += self._release(session, name)
+            # Products of other tasks which are dependencies are wrapped in another
+            # PythonNode which is the only successor of the product in the DAG.
+            node = dag.get(name)
+            if isinstance(node, PythonNode) and isinstance(node.value, PythonNode):
+                released += self._release(session, node.value.signature)
+
+        if released:
+            update_released_memory(signature, released)
+
+    def _release(self, session: Session, name: str) -> int:
+        """Count down the dependent tasks of a node and release it after the last."""
+        n_remaining = self.n_remaining_tasks.get(name)
+        if n_remaining is None:
+            n_remaining = count_dependent_tasks(name, session.dag)
+        n_remaining -= 1
+        if n_remaining > 0:
+            self.n_remaining_tasks[name] = n_remaining
+            return 0
+
+        self.n_remaining_tasks.pop(name, None)
+        released = session.value_cache.invalidate(name)
+        if name in self.produced:
+            self.produced.discard(name)
+            node = session.dag.get(name)
+            if node.value is not no_default:  # type: ignore[union-attr]
+                released += estimate_size(node.value)  # type: ignore[union-attr]
+                node.value = no_default  # type: ignore[union-attr]
+        return released
@@ -13,6 +13,7 @@ from rich.text import Text
 from _pytask.capture_utils import ShowCapture
 from _pytask.console import format_task_name
 from _pytask.outcomes import CollectionOutcome
+from _pytask.outcomes import SkippedUnchanged
 from _pytask.outcomes import TaskOutcome
 from _pytask.traceback import OptionalExceptionInfo
 from _pytask.traceback import Traceback
@@ -100,6 +101,12 @@ class ExecutionReport:
         """Create a report from a task."""
         return cls(task, TaskOutcome.SUCCESS, None, task.report_sections)
 
+    @classmethod
+    def from_unchanged_task(cls, task: PTask) -> ExecutionReport:
+        """Create a report for an unchanged task without raising an exception."""
+        exc_info = (SkippedUnchanged, SkippedUnchanged(), None)
+        return cls(task, TaskOutcome.SKIP_UNCHANGED, exc_info, task.report_sections)
+
     def __rich_console__(
         self, console: Console, console_options: ConsoleOptions
     ) -> RenderResult:
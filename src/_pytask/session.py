@@ -5,12 +5,16 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from typing import Any
 
-import networkx as nx
 from attrs import define
 from attrs import field
 from pluggy import HookRelay
 
+from _pytask.dag_graph import CompactDAG
+from _pytask.dag_utils import AfterIndex
 from _pytask.outcomes import ExitCode
+from _pytask.prefetch import Prefetcher
+from _pytask.value_cache import ValueCache
+from _pytask.writer import ProductWriter
 
 if TYPE_CHECKING:
     from _pytask.node_protocols import PTask
@@ -32,6 +36,8 @@ class Session:
         Reports for collected items.
     dag
         The DAG of the project.
+    after_index
+        The index of tasks which is used to create dependencies with ``after``.
     hook
         Holds all hooks collected by pytask.
     tasks
@@ -46,12 +52,19 @@ class Session:
         Indicates whether the session should be stopped.
     warnings
         A list of warnings captured during the run.
+    value_cache
+        The cache of values loaded from dependencies.
+    prefetcher
+        The prefetcher which loads dependencies of upcoming tasks in the background.
+    product_writer
+        The writer which saves products in the background.
 
     """
 
     config: dict[str, Any] = field(factory=dict)
     collection_reports: list[CollectionReport] = field(factory=list)
-    dag: nx.DiGraph = field(factory=nx.DiGraph)
+    dag: CompactDAG = field(factory=CompactDAG)
+    after_index: AfterIndex = field(factory=AfterIndex)
     hook: HookRelay = field(factory=HookRelay)
     tasks: list[PTask] = field(factory=list)
     dag_report: DagReport | None = None
@@ -67,9 +80,21 @@ class Session:
     scheduler: Any = None
     should_stop: bool = False
     warnings: list[WarningReport] = field(factory=list)
+    value_cache: ValueCache = field(factory=ValueCache)
+    prefetcher: Prefetcher = field(factory=Prefetcher)
+    product_writer: ProductWriter = field(factory=ProductWriter)
 
     @classmethod
     def from_config(cls, config: dict[str, Any]) -> Session:
         """Construct the class from a config."""
         hook = config["pm"].hook if "pm" in config else HookRelay()
-        return cls(config=config, hook=hook)
+        value_cache = ValueCache(max_size=config.get("value_cache_size", 0))
+        prefetcher = Prefetcher(max_size=config.get("prefetch_size", 0))
+        product_writer = ProductWriter(n_workers=config.get("n_save_workers", 0))
+        return cls(
+            config=config,
+            hook=hook,
+            value_cache=value_cache,
+            prefetcher=prefetcher,
+            product_writer=product_writer,
+        )
@@ -5,7 +5,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from typing import Any
 
-from _pytask.dag_utils import descending_tasks
+from _pytask.dag_utils import TopologicalSorter
+from _pytask.dag_utils import block_descending_tasks
 from _pytask.mark import Mark
 from _pytask.mark_utils import get_marks
 from _pytask.mark_utils import has_mark
@@ -46,17 +47,29 @@ def pytask_parse_config(config: dict[str, Any]) -> None:
     config["markers"] = {**config["markers"], **markers}
 
 
+def _get_blocking_tasks(session: Session, task: PTask) -> dict[str, TaskOutcome]:
+    """Get the preceding tasks which block the task and their outcomes."""
+    if isinstance(session.scheduler, TopologicalSorter):
+        return session.scheduler.blocked_by(task.signature)
+    return {}
+
+
 @hookimpl
 def pytask_execute_task_setup(session: Session, task: PTask) -> None:
     """Take a short-cut for skipped tasks during setup with an exception."""
-    is_unchanged = has_mark(task, "skip_unchanged") and not has_mark(
-        task, "would_be_executed"
+    blocking_tasks = _get_blocking_tasks(session, task)
+    outcomes = set(blocking_tasks.values())
+
+    is_unchanged = (
+        has_mark(task, "skip_unchanged")
+        and not has_mark(task, "would_be_executed")
+        and TaskOutcome.WOULD_BE_EXECUTED not in outcomes
     )
     if is_unchanged and not session.config["force"]:
         collect_provisional_products(session, task)
         raise SkippedUnchanged
 
-    is_skipped = has_mark(task, "skip")
+    is_skipped = has_mark(task, "skip") or TaskOutcome.SKIP in outcomes
     if is_skipped:
         raise Skipped
 
@@ -68,13 +81,17 @@ def pytask_execute_task_setup(session: Session, task: PTask) -> None:
         if should_skip:
             raise Skipped(message)
 
-    ancestor_failed_marks = get_marks(task, "skip_ancestor_failed")
-    if ancestor_failed_marks:
-        message = "\n".join(
-            skip_ancestor_failed(*mark.args, **mark.kwargs)
-            for mark in ancestor_failed_marks
-        )
-        raise SkippedAncestorFailed(message)
+    reasons = [
+        skip_ancestor_failed(*mark.args, **mark.kwargs)
+        for mark in get_marks(task, "skip_ancestor_failed")
+    ]
+    reasons.extend(
+        f"Previous task {session.dag.nodes[signature]['task'].name!r} failed."
+        for signature, outcome in blocking_tasks.items()
+        if outcome == TaskOutcome.FAIL
+    )
+    if reasons:
+        raise SkippedAncestorFailed("\n".join(reasons))
 
 
 @hookimpl
@@ -95,16 +112,14 @@ def pytask_execute_task_process_report(
 
         if isinstance(report.exc_info[1], Skipped):
             report.outcome = TaskOutcome.SKIP
-
-            for descending_task_name in descending_tasks(task.signature, session.dag):
-                descending_task = session.dag.nodes[descending_task_name]["task"]
-                descending_task.markers.append(
-                    Mark(
-                        "skip",
-                        (),
-                        {"reason": f"Previous task {task.name!r} was skipped."},
-                    )
-                )
+            block_descending_tasks(
+                session,
+                task,
+                TaskOutcome.SKIP,
+                Mark(
+                    "skip", (), {"reason": f"Previous task {task.name!r} was skipped."}
+                ),
+            )
             return True
 
         if isinstance(report.exc_info[1], SkippedAncestorFailed):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import itertools
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
@@ -9,7 +10,9 @@ from typing import Callable
 from _pytask.console import format_strings_as_flat_tree
 from _pytask.pluginmanager import hookimpl
 from _pytask.shared import find_duplicates
+from _pytask.task_utils import COLLECTED_GRIDS
 from _pytask.task_utils import COLLECTED_TASKS
+from _pytask.task_utils import materialize_task_grid
 from _pytask.task_utils import parse_collected_tasks_with_task_marker
 
 if TYPE_CHECKING:
@@ -34,20 +37,23 @@ def pytask_collect_file(
     session: Session, path: Path, reports: list[CollectionReport]
 ) -> list[CollectionReport] | None:
     """Collect a file."""
-    if (
-        any(path.match(pattern) for pattern in session.config["task_files"])
-        and COLLECTED_TASKS[path]
+    if any(path.match(pattern) for pattern in session.config["task_files"]) and (
+        COLLECTED_TASKS[path] or COLLECTED_GRIDS.get(path)
     ):
         # Remove tasks from the global to avoid re-collection if programmatic interface
         # is used.
         tasks = COLLECTED_TASKS.pop(path)
+        grids = COLLECTED_GRIDS.pop(path, [])
 
         _raise_error_when_task_functions_are_duplicated(tasks)
 
         name_to_function = parse_collected_tasks_with_task_marker(tasks)
 
+        # Tasks of grids are created one at a time while they are collected.
         collected_reports = []
-        for name, function in name_to_function.items():
+        for name, function in itertools.chain(
+            name_to_function.items(), *map(materialize_task_grid, grids)
+        ):
             report = session.hook.pytask_collect_task_protocol(
                 session=session, reports=reports, path=path, name=name, obj=function
             )
@@ -87,3 +93,4 @@ def _raise_error_when_task_functions_are_duplicated(
 @hookimpl
 def pytask_unconfigure() -> None:
     COLLECTED_TASKS.clear()
+    COLLECTED_GRIDS.clear()
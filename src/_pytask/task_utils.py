@@ -5,13 +5,18 @@ from __future__ import annotations
 import functools
 import inspect
 from collections import defaultdict
+from collections.abc import Mapping
 from types import BuiltinFunctionType
+from types import FunctionType
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 
 import attrs
+from attrs import define
 
+from _pytask._inspect import get_parameter_names
+from _pytask._inspect import is_plain_function
 from _pytask.coiled_utils import Function
 from _pytask.coiled_utils import extract_coiled_function_kwargs
 from _pytask.console import get_file
@@ -22,11 +27,16 @@ from _pytask.shared import unwrap_task_function
 from _pytask.typing import is_task_function
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
     from pathlib import Path
 
 
 __all__ = [
+    "COLLECTED_GRIDS",
     "COLLECTED_TASKS",
+    "TaskGrid",
+    "materialize_task_grid",
     "parse_collected_tasks_with_task_marker",
     "parse_keyword_arguments_from_signature_defaults",
     "task",
@@ -42,6 +52,36 @@ dictionary mapping from paths of modules to a list of tasks per module.
 
 """
 
+COLLECTED_GRIDS: dict[Path | None, list[TaskGrid]] = defaultdict(list)
+"""A container for grids of tasks declared with :func:`@task.grid <pytask.task>`."""
+
+
+@define
+class TaskGrid:
+    """A task function parametrized with the rows of a table.
+
+    The tasks are only created during the collection, one row at a time, instead of
+    creating a task function for every row when the module is imported.
+
+    Attributes
+    ----------
+    function
+        The task function.
+    columns
+        A mapping from parameter names to sequences of values. All sequences have the
+        same length.
+    n_rows
+        The number of rows and, thus, tasks in the grid.
+    ids
+        Ids for every row. If not given, ids are generated from the values.
+
+    """
+
+    function: Callable[..., Any]
+    columns: dict[str, Any]
+    n_rows: int
+    ids: Sequence[str] | None = None
+
 
 def task(  # noqa: PLR0913
     name: str | None = None,
@@ -179,6 +219,212 @@ def task(  # noqa: PLR0913
     return wrapper
 
 
+def _task_grid(
+    table: Any,
+    *,
+    name: str | None = None,
+    after: str | Callable[..., Any] | list[Callable[..., Any]] | None = None,
+    ids: Sequence[str] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Parametrize a task function with the rows of a table.
+
+    Every row of the table becomes one task. Compared to repeating a task in a loop,
+    the tasks are created during the collection from the columns of the table and no
+    task function is created per row while the module is imported.
+
+    Parameters
+    ----------
+    table
+        A column-oriented table which is a mapping from parameter names to sequences of
+        values, like a dictionary of lists or arrays, or a data frame.
+    name
+        Use it to override the name of the tasks that is, by default, the name of the
+        task function.
+    after
+        An expression or a task function or a list of task functions that need to be
+        executed before the tasks can be executed.
+    ids
+        Ids for every row. By default, ids are generated from the values in every row.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from pathlib import Path
+        from typing import Annotated
+
+        from pytask import Product
+        from pytask import task
+
+        table = {
+            "seed": [0, 1, 2],
+            "path": [Path(f"data_{i}.pkl") for i in range(3)],
+        }
+
+        @task.grid(table)
+        def task_simulate(seed: int, path: Annotated[Path, Product]) -> None: ...
+
+    """
+
+    def wrapper(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not is_plain_function(func):
+            msg = (
+                "'@task.grid' can only be applied to functions and should be the "
+                "innermost decorator besides markers."
+            )
+            raise TypeError(msg)
+
+        columns = _parse_table(table)
+        n_rows = _validate_table(func, columns)
+        if ids is not None and len(ids) != n_rows:
+            msg = f"'ids' must have one id per row, but it has {len(ids)} for {n_rows}."
+            raise ValueError(msg)
+
+        parsed_name = _parse_name(func, name)
+        parsed_after = _parse_after(after)
+        if hasattr(func, "pytask_meta"):
+            func.pytask_meta.after = parsed_after
+            func.pytask_meta.markers.append(Mark("task", (), {}))
+            func.pytask_meta.name = parsed_name
+        else:
+            func.pytask_meta = CollectionMetadata(  # type: ignore[attr-defined]
+                after=parsed_after, markers=[Mark("task", (), {})], name=parsed_name
+            )
+
+        COLLECTED_GRIDS[get_file(func)].append(
+            TaskGrid(function=func, columns=columns, n_rows=n_rows, ids=ids)
+        )
+        return func
+
+    return wrapper
+
+
+task.grid = _task_grid  # type: ignore[attr-defined]
+
+
+def _parse_table(table: Any) -> dict[str, Any]:
+    """Parse a column-oriented table to a mapping from column names to values."""
+    if isinstance(table, Mapping):
+        columns = dict(table)
+    elif hasattr(table, "columns"):
+        # Data frames.
+        columns = {
+            column: (
+                table[column].to_numpy()
+                if hasattr(table[column], "to_numpy")
+                else table[column]
+            )
+            for column in table.columns
+        }
+    else:
+        msg = (
+            "The table of '@task.grid' must be a mapping from parameter names to "
+            f"sequences of values or a data frame, but it is {type(table)}."
+        )
+        raise TypeError(msg)
+
+    if not all(isinstance(column, str) for column in columns):
+        msg = "The column names of the table of '@task.grid' must be strings."
+        raise TypeError(msg)
+    return columns
+
+
+def _validate_table(func: Callable[..., Any], columns: dict[str, Any]) -> int:
+    """Validate the columns of a table and return the number of rows."""
+    parameters = get_parameter_names(func)
+    if not func.__code__.co_flags & inspect.CO_VARKEYWORDS:
+        unknown = [column for column in columns if column not in parameters]
+        if unknown:
+            msg = (
+                f"The table of '@task.grid' has columns {unknown} which are not "
+                f"parameters of the task function {func.__name__!r}."
+            )
+            raise ValueError(msg)
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        msg = "All columns of the table of '@task.grid' must have the same length."
+        raise ValueError(msg)
+    return lengths.pop() if lengths else 0
+
+
+def materialize_task_grid(
+    grid: TaskGrid,
+) -> Iterator[tuple[str, Callable[..., Any]]]:
+    """Create the names and task functions for every row of a grid.
+
+    The task functions share the code of the original function and only differ in their
+    metadata.
+
+    """
+    func = grid.function
+    meta = func.pytask_meta  # type: ignore[attr-defined]
+    name = meta.name or func.__name__
+    signature_kwargs = parse_keyword_arguments_from_signature_defaults(func)
+
+    seen = set()
+    for i in range(grid.n_rows):
+        row = {column: _get_value(values, i) for column, values in grid.columns.items()}
+        if grid.ids is not None:
+            id_ = str(grid.ids[i])
+        elif row:
+            id_ = "-".join(
+                _arg_value_to_id_component(column, value, i, None)
+                for column, value in row.items()
+            )
+        else:
+            id_ = str(i)
+
+        task_name = f"{name}[{id_}]"
+        if task_name in seen:
+            msg = (
+                f"The task {name!r} with the id {id_!r} is duplicated in the grid. "
+                "Pass unique ids with '@task.grid(..., ids=...)'."
+            )
+            raise ValueError(msg)
+        seen.add(task_name)
+
+        yield task_name, _copy_task_function(func, signature_kwargs | row, id_)
+
+
+def _get_value(values: Any, i: int) -> Any:
+    """Get a value from a column and convert scalars of arrays to Python objects."""
+    value = values[i]
+    if getattr(value, "ndim", None) == 0 and hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _copy_task_function(
+    func: Callable[..., Any], kwargs: dict[str, Any], id_: str
+) -> Callable[..., Any]:
+    """Copy a task function and attach the metadata of one row of a grid."""
+    meta = func.pytask_meta  # type: ignore[attr-defined]
+    copy = FunctionType(
+        func.__code__,
+        func.__globals__,
+        func.__name__,
+        func.__defaults__,
+        func.__closure__,
+    )
+    copy.__kwdefaults__ = func.__kwdefaults__
+    copy.__qualname__ = func.__qualname__
+    copy.__doc__ = func.__doc__
+    copy.__annotations__ = func.__annotations__
+    copy.__dict__.update(func.__dict__)
+    copy.pytask_meta = CollectionMetadata(  # type: ignore[attr-defined]
+        after=meta.after,
+        attributes=dict(meta.attributes),
+        is_generator=meta.is_generator,
+        id_=id_,
+        kwargs=kwargs,
+        markers=list(meta.markers),
+        name=meta.name,
+        produces=meta.produces,
+    )
+    return copy
+
+
 def _parse_name(func: Callable[..., Any], name: str | None) -> str:
     """Parse name from task function."""
     if name:
@@ -293,6 +539,18 @@ def parse_keyword_arguments_from_signature_defaults(
     task: Callable[..., Any],
 ) -> dict[str, Any]:
     """Parse keyword arguments from signature defaults."""
+    if is_plain_function(task):
+        # Read the defaults directly since the signature is slow to create.
+        positional = task.__code__.co_varnames[: task.__code__.co_argcount]
+        defaults = task.__defaults__ or ()
+        kwargs = (
+            dict(zip(positional[len(positional) - len(defaults) :], defaults))
+            if defaults
+            else {}
+        )
+        kwargs.update(task.__kwdefaults__ or {})
+        return kwargs
+
     parameters = inspect.signature(task).parameters
     kwargs = {}
     for parameter in parameters.values():
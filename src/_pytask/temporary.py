@@ -0,0 +1,215 @@
+"""Contains the code to delete temporary products once they are consumed.
+
+Intermediate files are often only needed by the next tasks and occupy disk space until
+the build ends. A product is declared temporary with ``attributes={"temporary": True}``
+or with a class attribute ``temporary = True`` of the node type.
+
+A temporary product is deleted when all tasks depending on it have succeeded. The state
+of the product at the time of the deletion is stored in the database. In the next run,
+the recorded state substitutes the state of the missing product. So, the producing task
+and the dependent tasks are skipped unless one of the dependent tasks needs to be
+executed. Then, the producing task is executed again to recreate the product.
+
+Temporary products without dependent tasks are kept since they are results of the build.
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
+from sqlalchemy import select
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from _pytask.dag_utils import count_dependent_tasks
+from _pytask.dag_utils import tasks_and_descending_tasks
+from _pytask.database_utils import BaseTable
+from _pytask.database_utils import DatabaseSession
+from _pytask.database_utils import find_changed_tasks
+from _pytask.node_protocols import PPathNode
+from _pytask.node_protocols import get_node_option
+from _pytask.outcomes import SkippedUnchanged
+from _pytask.outcomes import TaskOutcome
+from _pytask.pluginmanager import hookimpl
+
+if TYPE_CHECKING:
+    from _pytask.node_protocols import PNode
+    from _pytask.node_protocols import PProvisionalNode
+    from _pytask.node_protocols import PTask
+    from _pytask.reports import ExecutionReport
+    from _pytask.session import Session
+
+
+__all__ = ["DeletedProduct", "TemporaryProductRemover", "is_temporary"]
+
+
+_SUCCESSFUL_OUTCOMES = frozenset(
+    {
+        TaskOutcome.SUCCESS,
+        TaskOutcome.PERSISTENCE,
+        TaskOutcome.RESTORED,
+        TaskOutcome.SKIP_UNCHANGED,
+    }
+)
+
+
+class DeletedProduct(BaseTable):
+    """Record of a temporary product which was deleted after it was consumed."""
+
+    __tablename__ = "deleted_product"
+
+    node: Mapped[str] = mapped_column(primary_key=True)
+    hash_: Mapped[str]
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Register the plugin which deletes temporary products."""
+    config["pm"].register(TemporaryProductRemover())
+
+
+def is_temporary(node: PTask | PNode | PProvisionalNode) -> bool:
+    """Check whether a node is a temporary product which can be deleted."""
+    return isinstance(node, PPathNode) and get_node_option(node, "temporary")
+
+
+@define(eq=False)
+class TemporaryProductRemover:
+    """A plugin which deletes temporary products after all dependent tasks succeeded.
+
+    Attributes
+    ----------
+    n_remaining_tasks
+        The number of dependent tasks which have not finished yet for each product.
+    kept
+        The signatures of products which are kept because a dependent task failed.
+    skipped
+        The signatures of tasks which are skipped although temporary products were
+        deleted since no dependent task needs the products.
+
+    """
+
+    n_remaining_tasks: dict[str, int] = field(factory=dict)
+    kept: set[str] = field(factory=set)
+    skipped: set[str] = field(factory=set)
+
+    @hookimpl(tryfirst=True)
+    def pytask_execute_build(self, session: Session) -> None:
+        """Find the tasks which are unchanged except for deleted temporary products.
+
+        The hook runs before the implementations executing the tasks and returns
+        nothing so that they are called.
+
+        """
+        deleted = _load_deleted_products(session)
+        if deleted:
+            self.skipped = _find_tasks_without_need_for_products(session, deleted)
+
+    @hookimpl
+    def pytask_execute_task_setup(self, session: Session, task: PTask) -> None:
+        """Skip tasks which do not need their deleted temporary products.
+
+        The hook runs before the default implementation which would notice the missing
+        products.
+
+        """
+        if task.signature in self.skipped and not session.config["force"]:
+            raise SkippedUnchanged
+
+    @hookimpl(tryfirst=True)
+    def pytask_execute_task_log_end(
+        self, session: Session, report: ExecutionReport
+    ) -> None:
+        """Delete temporary dependencies after their last dependent task.
+
+        The hook runs first since the hook returns the first result.
+
+        """
+        dag = session.dag
+        is_successful = report.outcome in _SUCCESSFUL_OUTCOMES
+
+        for name in dag.predecessors(report.task.signature):
+            node = dag.get(name)
+            if not is_temporary(node):
+                continue
+            if not is_successful:
+                self.kept.add(name)
+
+            n_remaining = self.n_remaining_tasks.get(name)
+            if n_remaining is None:
+                n_remaining = count_dependent_tasks(name, dag)
+            n_remaining -= 1
+            if n_remaining > 0:
+                self.n_remaining_tasks[name] = n_remaining
+                continue
+
+            self.n_remaining_tasks.pop(name, None)
+            if name not in self.kept:
+                _delete_product(node)  # type: ignore[arg-type]
+
+
+def _delete_product(node: PPathNode) -> None:
+    """Record the state of a product and delete it."""
+    state = node.state()
+    if state is None:
+        return
+
+    with DatabaseSession() as session:
+        session.merge(DeletedProduct(node=node.signature, hash_=state))
+        session.commit()
+    node.path.unlink(missing_ok=True)
+
+
+def _load_deleted_products(session: Session) -> dict[str, str]:
+    """Load the recorded states of temporary products which are missing."""
+    with DatabaseSession() as db_session:
+        rows = db_session.execute(select(DeletedProduct.node, DeletedProduct.hash_))
+        recorded = dict(rows.tuples().all())
+
+    deleted = {}
+    for name, state in recorded.items():
+        if name not in session.dag:
+            continue
+        node = session.dag.get(name)
+        if is_temporary(node) and node.state() is None:  # type: ignore[union-attr]
+            deleted[name] = state
+    return deleted
+
+
+def _find_tasks_without_need_for_products(
+    session: Session, deleted: dict[str, str]
+) -> set[str]:
+    """Find tasks which can be skipped although their temporary products are deleted.
+
+    The states of deleted products are substituted with the recorded states to find the
+    tasks which need to be executed like for unchanged tasks. If a task which depends on
+    a deleted product needs to be executed, the producing task and its descendants need
+    to be executed as well. The remaining producers and dependent tasks of deleted
+    products can be skipped.
+
+    """
+    dag = session.dag
+    changed = find_changed_tasks(dag, session.tasks, node_states=dict(deleted))
+
+    needed = tasks_and_descending_tasks(changed, dag)
+    producers = {name: set(dag.predecessors(name)) for name in deleted}
+    while True:
+        recreated = {
+            producer
+            for name, producers_ in producers.items()
+            if not needed.isdisjoint(dag.successors(name))
+            for producer in producers_ - needed
+        }
+        if not recreated:
+            break
+        needed |= tasks_and_descending_tasks(recreated, dag)
+
+    involved = set()
+    for name, producers_ in producers.items():
+        involved |= producers_
+        involved.update(dag.successors(name))
+    return involved - needed
@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 import functools
+import weakref
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
 
 import optree
+from attrs import define
 from optree import PyTree
+from optree import tree_flatten as _optree_tree_flatten
 from optree import tree_flatten_with_path as _optree_tree_flatten_with_path
 from optree import tree_leaves as _optree_tree_leaves
 from optree import tree_map as _optree_tree_map
 from optree import tree_map_with_path as _optree_tree_map_with_path
 from optree import tree_structure as _optree_tree_structure
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from optree import PyTreeSpec
+
+
 __all__ = [
     "TREE_UTIL_LIB_DIRECTORY",
+    "FlatArguments",
     "PyTree",
+    "clear_flat_arguments",
+    "get_flat_arguments",
+    "tree_flatten",
+    "tree_flatten_arguments",
     "tree_flatten_with_path",
     "tree_leaves",
     "tree_map",
@@ -39,3 +55,85 @@ tree_structure = functools.partial(
 tree_flatten_with_path = functools.partial(
     _optree_tree_flatten_with_path, none_is_leaf=True, namespace="pytask"
 )
+tree_flatten = functools.partial(
+    _optree_tree_flatten, none_is_leaf=True, namespace="pytask"
+)
+
+
+@define(frozen=True)
+class FlatArguments:
+    """The flattened trees of a mapping from argument names to trees.
+
+    Attributes
+    ----------
+    values
+        The trees which were flattened. They are used to detect whether the mapping
+        changed.
+    arguments
+        A mapping from argument names to the leaves and the structure of the tree.
+    leaves
+        The leaves of all arguments in the same order as :func:`tree_leaves` returns
+        them for the whole mapping.
+
+    """
+
+    values: tuple[Any, ...]
+    arguments: dict[str, tuple[list[Any], PyTreeSpec]]
+    leaves: list[Any]
+
+
+def tree_flatten_arguments(arguments: Mapping[str, PyTree[Any]]) -> FlatArguments:
+    """Flatten the tree of every argument."""
+    flattened = {name: tree_flatten(value) for name, value in arguments.items()}
+    return FlatArguments(
+        values=tuple(arguments.values()),
+        arguments=flattened,
+        # Like optree, sort the keys of the mapping.
+        leaves=[
+            leaf for name in sorted(flattened, key=str) for leaf in flattened[name][0]
+        ],
+    )
+
+
+_FLAT_ARGUMENTS: dict[tuple[int, str], tuple[weakref.ref[Any], FlatArguments]] = {}
+
+
+def get_flat_arguments(obj: Any, attribute: str) -> FlatArguments:
+    """Get the flattened arguments stored in an attribute of an object.
+
+    The result is cached for the lifetime of the object and computed again if the
+    attribute was replaced or an argument was assigned a new tree. Trees which are
+    modified in place are not detected. Call :func:`clear_flat_arguments` afterwards.
+    Objects which do not support weak references are flattened on every call.
+
+    """
+    arguments = getattr(obj, attribute)
+    key = (id(obj), attribute)
+    cached = _FLAT_ARGUMENTS.get(key)
+    if cached is not None and cached[0]() is obj:
+        flat = cached[1]
+        values = flat.values
+        if len(values) == len(arguments) and all(
+            a is b for a, b in zip(values, arguments.values())
+        ):
+            return flat
+
+    flat = tree_flatten_arguments(arguments)
+    try:
+        ref = weakref.ref(obj, lambda _: _FLAT_ARGUMENTS.pop(key, None))
+    except TypeError:
+        return flat
+    _FLAT_ARGUMENTS[key] = (ref, flat)
+    return flat
+
+
+def clear_flat_arguments(obj: Any, attribute: str | None = None) -> None:
+    """Clear the cached flattened arguments of an object.
+
+    Call it after the trees stored in an attribute were modified in place. If no
+    attribute is given, the arguments of ``depends_on`` and ``produces`` are cleared.
+
+    """
+    attributes = ("depends_on", "produces") if attribute is None else (attribute,)
+    for name in attributes:
+        _FLAT_ARGUMENTS.pop((id(obj), name), None)
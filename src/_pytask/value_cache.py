@@ -0,0 +1,160 @@
+"""Contains the cache of values loaded from dependencies.
+
+When many tasks depend on the same node, each task calls :meth:`~pytask.PNode.load` and,
+for example, unpickles the same file again. The value cache keeps loaded values in
+memory and passes the same object to every task. Entries are keyed by the signature of
+the node and validated with its state, so a node which was saved again is loaded again.
+
+Caching is opt-in because tasks receive the same object and must not modify it in
+place. Opt in per node with ``attributes={"cache_value": True}`` or per node type with a
+class attribute ``cache_value = True``. The attribute of the node takes precedence.
+
+The memory used by the cache is limited by ``value_cache_size``. The size of a value is
+estimated with the size of the file for nodes with paths and with :func:`estimate_size`
+otherwise. When the budget is exceeded, the least recently used
+values are evicted.
+
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from typing import TYPE_CHECKING
+from typing import Any
+
+from attrs import define
+from attrs import field
+
+from _pytask.node_protocols import PPathNode
+from _pytask.node_protocols import get_node_option
+from _pytask.pluginmanager import hookimpl
+
+if TYPE_CHECKING:
+    from _pytask.node_protocols import PNode
+
+
+__all__ = ["ValueCache", "estimate_size", "parse_size"]
+
+
+@hookimpl
+def pytask_parse_config(config: dict[str, Any]) -> None:
+    """Parse the configuration."""
+    config["value_cache_size"] = parse_size(config.get("value_cache_size", 0))
+
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def parse_size(value: float | str) -> int:
+    """Parse a size in bytes from a number or a string like ``"512MB"``.
+
+    Examples
+    --------
+    >>> parse_size("1.5 KB")
+    1536
+    >>> parse_size(100)
+    100
+
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([a-zA-Z]*)\s*", value)
+    if match is None or match.group(2).upper() not in _UNITS:
+        msg = (
+            f"The size {value!r} is invalid. Use a number of bytes or a number with a "
+            f"unit like '512MB' or '2GB'."
+        )
+        raise ValueError(msg)
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+@define
+class ValueCache:
+    """A cache for loaded values of nodes with a least recently used eviction.
+
+    Attributes
+    ----------
+    max_size
+        The maximum size of all values in bytes. Values are not cached if it is zero.
+    size
+        The estimated size of all cached values in bytes.
+
+    """
+
+    max_size: int = 0
+    size: int = 0
+    _entries: OrderedDict[str, tuple[str, Any, int]] = field(factory=OrderedDict)
+    _lock: threading.Lock = field(factory=threading.Lock)
+
+    def load(self, node: PNode) -> Any:
+        """Load the value of a node from the cache or the node itself."""
+        if not self.max_size or not get_node_option(node, "cache_value"):
+            return node.load(is_product=False)
+
+        signature = node.signature
+        state = node.state()
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is not None and entry[0] == state:
+                self._entries.move_to_end(signature)
+                return entry[1]
+
+        value = node.load(is_product=False)
+        if state is not None:
+            self._add(signature, state, value, _estimate_size(node, value))
+        return value
+
+    def invalidate(self, signature: str) -> int:
+        """Remove the value of a node and return the size of the removed value."""
+        with self._lock:
+            entry = self._entries.pop(signature, None)
+            if entry is None:
+                return 0
+            self.size -= entry[2]
+            return entry[2]
+
+    def _add(self, signature: str, state: str, value: Any, size: int) -> None:
+        with self._lock:
+            old_entry = self._entries.pop(signature, None)
+            if old_entry is not None:
+                self.size -= old_entry[2]
+            if size > self.max_size:
+                return
+
+            while self._entries and self.size + size > self.max_size:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+            self._entries[signature] = (state, value, size)
+            self.size += size
+
+
+def _estimate_size(node: PNode, value: Any) -> int:
+    """Estimate the memory used by the value of a node."""
+    if isinstance(node, PPathNode):
+        try:
+            return node.path.stat().st_size
+        except OSError:
+            pass
+    return estimate_size(value)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory used by a value.
+
+    The sizes of arrays and data frames are the sizes of their data. Other values fall
+    back to :func:`sys.getsizeof` which ignores referenced objects.
+
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        with suppress(Exception):
+            return int(memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
@@ -0,0 +1,391 @@
+"""Contains the implementation of ``pytask watch``.
+
+The command builds the project and waits for changes to task modules, other modules of
+the project, and the dependencies and products of tasks. After a change, the project is
+built again in the same process.
+
+Changed paths are mapped to tasks with an index created from the last session. Changes
+to files which are unknown to pytask, for example, a README, are ignored. Task modules
+are collected lazily, so only task modules which changed are imported again. The cache
+of file hashes stays in memory and the states of unchanged tasks are checked quickly,
+so only tasks affected by the changes and their descendants are executed.
+
+On Linux, changes are detected with inotify. On other platforms, watched directories
+are polled.
+
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+import click
+from attrs import define
+from attrs import field
+
+from _pytask.build import build
+from _pytask.build import build_command
+from _pytask.click import ColoredCommand
+from _pytask.collect import create_ignore_predicate
+from _pytask.console import console
+from _pytask.dag_utils import tasks_and_descending_tasks
+from _pytask.node_protocols import PPathNode
+from _pytask.node_protocols import PTaskWithPath
+from _pytask.nodes import DirectoryNode
+from _pytask.outcomes import ExitCode
+from _pytask.path import remove_project_modules
+from _pytask.pluginmanager import get_plugin_manager
+from _pytask.pluginmanager import hookimpl
+from _pytask.pluginmanager import storage
+from _pytask.tree_util import get_flat_arguments
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from typing import NoReturn
+
+    from _pytask.session import Session
+
+
+__all__ = ["InotifyWatcher", "PollingWatcher", "create_watcher", "watch_builds"]
+
+
+@hookimpl(tryfirst=True)
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    cli.add_command(watch)
+
+
+@click.command(cls=ColoredCommand)
+def watch(**raw_config: Any) -> NoReturn:
+    """Build the project and build it again whenever files change."""
+    raw_config["command"] = "build"
+    # Only task modules which changed need to be imported again.
+    raw_config["lazy_collection"] = True
+
+    watcher = create_watcher()
+    try:
+        for session in watch_builds(raw_config, watcher):
+            if session.exit_code == ExitCode.CONFIGURATION_FAILED:
+                sys.exit(session.exit_code)
+            console.print("Waiting for changes. Press Ctrl+C to stop.")
+    except KeyboardInterrupt:
+        sys.exit(ExitCode.OK)
+    finally:
+        watcher.close()
+    sys.exit(ExitCode.OK)  # pragma: no cover
+
+
+# Share the parameters with the build command so that options added by plugins to the
+# build command are available for both commands.
+watch.params = build_command.params
+
+
+class Watcher(Protocol):
+    """The protocol of watchers which report changed paths in directories."""
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        """Start watching the directories."""
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Wait for changes and return the changed paths.
+
+        An empty set is returned if nothing changed within the timeout.
+
+        """
+
+    def close(self) -> None:
+        """Stop watching all directories."""
+
+
+def create_watcher() -> Watcher:
+    """Create a watcher using inotify if possible and polling otherwise."""
+    if sys.platform == "linux":
+        try:
+            return InotifyWatcher()
+        except (AttributeError, OSError):
+            pass
+    return PollingWatcher()
+
+
+class InotifyWatcher:
+    """A watcher using inotify on Linux."""
+
+    _MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000004  # IN_ATTRIB
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+        | 0x00000400  # IN_DELETE_SELF
+    )
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_IGNORED = 0x00008000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._directories: dict[int, Path] = {}
+        self._descriptors: dict[Path, int] = {}
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        for directory in directories:
+            if directory in self._descriptors:
+                continue
+            descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), self._MASK
+            )
+            if descriptor >= 0:
+                self._directories[descriptor] = directory
+                self._descriptors[directory] = descriptor
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        poll = select.poll()
+        poll.register(self._fd, select.POLLIN)
+        if not poll.poll(None if timeout is None else timeout * 1000):
+            return set()
+
+        changes: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & self._IN_Q_OVERFLOW:
+                    # Events were lost. Treat all watched directories as changed.
+                    changes.update(self._descriptors)
+                    continue
+
+                directory = self._directories.get(descriptor)
+                if directory is None:
+                    continue
+                if mask & self._IN_IGNORED:
+                    del self._directories[descriptor]
+                    del self._descriptors[directory]
+                    continue
+                changes.add(directory / os.fsdecode(name) if name else directory)
+        return changes
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+@define
+class PollingWatcher:
+    """A watcher which polls the entries of directories."""
+
+    interval: float = 0.5
+    _snapshots: dict[Path, dict[str, tuple[int, int]]] = field(factory=dict)
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        for directory in directories:
+            if directory not in self._snapshots:
+                self._snapshots[directory] = _scan_directory(directory)
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self._poll()
+            if changes:
+                return changes
+            if deadline is None:
+                time.sleep(self.interval)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return changes
+                time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        self._snapshots.clear()
+
+    def _poll(self) -> set[Path]:
+        changes: set[Path] = set()
+        for directory, old in self._snapshots.items():
+            new = _scan_directory(directory)
+            if new != old:
+                changes.update(
+                    directory / name
+                    for name in old.keys() | new.keys()
+                    if old.get(name) != new.get(name)
+                )
+                self._snapshots[directory] = new
+        return changes
+
+
+def _scan_directory(directory: Path) -> dict[str, tuple[int, int]]:
+    """Scan the modification times and sizes of the entries of a directory."""
+    snapshot = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return snapshot
+
+
+@define
+class _PathIndex:
+    """An index which maps paths to the tasks which use them.
+
+    Attributes
+    ----------
+    tasks
+        Maps task modules, and paths of dependencies and products to the signatures of
+        the tasks which use them.
+    products
+        The paths of products which are modified by pytask itself.
+    roots
+        The root directories of :class:`~pytask.DirectoryNode`. Any change inside
+        affects the tasks using them.
+    directories
+        The directories which need to be watched.
+
+    """
+
+    tasks: dict[Path, set[str]] = field(factory=lambda: defaultdict(set))
+    products: set[Path] = field(factory=set)
+    roots: dict[Path, set[str]] = field(factory=lambda: defaultdict(set))
+    directories: set[Path] = field(factory=set)
+
+    @classmethod
+    def from_session(cls, session: Session) -> _PathIndex:
+        index = cls()
+        for task in session.tasks:
+            if isinstance(task, PTaskWithPath):
+                index.tasks[task.path].add(task.signature)
+            for attribute in ("depends_on", "produces"):
+                for node in get_flat_arguments(task, attribute).leaves:
+                    if isinstance(node, PPathNode):
+                        index.tasks[node.path].add(task.signature)
+                        if attribute == "produces":
+                            index.products.add(node.path)
+                    elif isinstance(node, DirectoryNode) and node.root_dir:
+                        index.roots[node.root_dir].add(task.signature)
+
+        index.directories.update(path.parent for path in index.tasks)
+        index.directories.update(index.roots)
+        index.directories.update(_walk_directories(session))
+        return index
+
+    def find_affected_tasks(
+        self, paths: Iterable[Path], is_ignored: Callable[[str], bool]
+    ) -> tuple[set[Path], set[str]]:
+        """Find the relevant paths among changed paths and the tasks they affect."""
+        relevant = set()
+        affected = set()
+        for path in paths:
+            if path in self.tasks:
+                relevant.add(path)
+                affected.update(self.tasks[path])
+            elif roots := [p for p in path.parents if p in self.roots]:
+                relevant.add(path)
+                affected.update(*(self.roots[root] for root in roots))
+            elif (path.suffix == ".py" or path.is_dir()) and not is_ignored(
+                os.fspath(path)
+            ):
+                relevant.add(path)
+        return relevant, affected
+
+
+def _walk_directories(session: Session) -> Iterator[Path]:
+    """Yield the directories which are searched for task modules."""
+    is_ignored = create_ignore_predicate(session)
+    for path in session.config["paths"]:
+        for dirpath, dirnames, _ in os.walk(path):
+            if is_ignored(dirpath):
+                dirnames.clear()
+                continue
+            yield Path(dirpath)
+
+
+def watch_builds(raw_config: dict[str, Any], watcher: Watcher) -> Iterator[Session]:
+    """Build the project and build it again whenever relevant files change.
+
+    Yields the session of every build. The next build starts when the iterator is
+    advanced and relevant files have changed since the last session was yielded.
+
+    """
+    plugins = storage.get().get_plugins()
+    modules = set(sys.modules)
+
+    while True:
+        session = build(**raw_config)
+        if session.exit_code == ExitCode.CONFIGURATION_FAILED:
+            yield session
+            return
+
+        index = _PathIndex.from_session(session)
+        is_ignored = create_ignore_predicate(session)
+        watcher.watch(index.directories)
+
+        # Changes while the project was built, except for products written by tasks.
+        changes = watcher.wait(0) - index.products
+        yield session
+
+        relevant, affected = index.find_affected_tasks(changes, is_ignored)
+        while not relevant:
+            changes = watcher.wait(None)
+            relevant, affected = index.find_affected_tasks(changes, is_ignored)
+
+        # Wait briefly and collect changes from files which are saved together.
+        time.sleep(0.1)
+        relevant |= index.find_affected_tasks(watcher.wait(0), is_ignored)[0]
+
+        if session.dag is not None:
+            affected = tasks_and_descending_tasks(affected, session.dag)
+        n_files = len(relevant)
+        console.print()
+        console.rule(
+            f"Detected changes in {n_files} file{'s' if n_files > 1 else ''} "
+            f"affecting {len(affected)} task{'' if len(affected) == 1 else 's'}",
+            style="default",
+        )
+
+        remove_project_modules(set(sys.modules) - modules, session.config["root"])
+        _store_new_plugin_manager(plugins)
+
+
+def _store_new_plugin_manager(plugins: set[Any]) -> None:
+    """Store a new plugin manager for the next build.
+
+    Plugins register themselves for every build. So, the next build needs a fresh plugin
+    manager. Plugins which were registered while parsing the command line, like hook
+    modules, are registered again.
+
+    """
+    pm = get_plugin_manager()
+    for plugin in plugins:
+        if not pm.is_registered(plugin):
+            pm.register(plugin)
+    storage.store(pm)
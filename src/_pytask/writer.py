@@ -0,0 +1,156 @@
+"""Contains the writer which saves products in the background.
+
+Saving large products, for example, pickling a data frame, blocks the serial execution
+until the file is written. With ``n_save_workers`` greater than zero, products are
+saved by a pool of threads instead. The execution continues with other tasks, and only
+tasks depending on the producing task wait until all its products are saved. The
+producing task is finished, reported, and its states are stored in the database once
+all its products are saved.
+
+Products with paths are written to a temporary file in the same directory which is
+renamed to the path of the product. So, other processes never see partially written
+products.
+
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import TYPE_CHECKING
+from typing import Any
+
+import attrs
+from attrs import define
+from attrs import field
+from upath import UPath
+
+from _pytask.node_protocols import PPathNode
+from _pytask.pluginmanager import hookimpl
+
+if TYPE_CHECKING:
+    from _pytask.node_protocols import PNode
+    from _pytask.session import Session
+
+
+__all__ = ["ProductWriter", "save_atomically"]
+
+
+@hookimpl
+def pytask_unconfigure(session: Session) -> None:
+    """Wait for pending products and stop the threads of the writer."""
+    session.product_writer.shutdown()
+
+
+@define
+class ProductWriter:
+    """Save products in background threads.
+
+    Attributes
+    ----------
+    n_workers
+        The number of threads which save products. Products are saved immediately if
+        it is zero.
+
+    """
+
+    n_workers: int = 0
+    _pending: dict[str, list[Future[None]]] = field(factory=dict)
+    _executor: ThreadPoolExecutor | None = None
+    _lock: threading.Lock = field(factory=threading.Lock)
+
+    def save(self, task_signature: str, node: PNode, value: Any) -> None:
+        """Save the value of a product of a task now or in the background."""
+        if not self.n_workers:
+            node.save(value)
+            return
+
+        future = self._get_executor().submit(save_atomically, node, value)
+        with self._lock:
+            self._pending.setdefault(task_signature, []).append(future)
+
+    def is_saving(self, task_signature: str | None = None) -> bool:
+        """Check whether products of a task or of any task are being saved."""
+        if task_signature is None:
+            return bool(self._pending)
+        return task_signature in self._pending
+
+    def finished(self, *, block: bool = False) -> list[str]:
+        """Return the tasks whose products are saved.
+
+        If ``block`` is true, wait until the products of at least one task are saved.
+
+        """
+        with self._lock:
+            pending = dict(self._pending)
+        done = _find_finished(pending)
+        while block and pending and not done:
+            wait(
+                [
+                    future
+                    for futures in pending.values()
+                    for future in futures
+                    if not future.done()
+                ],
+                return_when=FIRST_COMPLETED,
+            )
+            done = _find_finished(pending)
+        return done
+
+    def wait(self, task_signature: str) -> None:
+        """Wait until all products of a task are saved and raise the first error."""
+        with self._lock:
+            futures = self._pending.pop(task_signature, [])
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Wait for pending products and stop the threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_workers, thread_name_prefix="pytask-writer"
+            )
+        return self._executor
+
+
+def _find_finished(pending: dict[str, list[Future[None]]]) -> list[str]:
+    return [
+        signature
+        for signature, futures in pending.items()
+        if all(future.done() for future in futures)
+    ]
+
+
+def save_atomically(node: PNode, value: Any) -> None:
+    """Save the value of a node without exposing partially written files.
+
+    Nodes with local paths defined with :mod:`attrs` are saved to a temporary file which
+    is renamed afterwards. Other nodes are saved directly.
+
+    """
+    if (
+        not isinstance(node, PPathNode)
+        or isinstance(node.path, UPath)
+        or not attrs.has(type(node))
+        or "path" not in attrs.fields_dict(type(node))  # type: ignore[arg-type]
+    ):
+        node.save(value)
+        return
+
+    path = node.path
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        attrs.evolve(node, path=tmp_path).save(value)  # type: ignore[misc]
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
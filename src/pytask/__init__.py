@@ -1,88 +1,199 @@
-"""Contains the main namespace for pytask."""
+"""Contains the main namespace for pytask.
 
-from __future__ import annotations  # noqa: I001
+Public objects are imported when they are accessed for the first time. Importing pytask
+in task modules or plugins is fast, and modules with heavy dependencies like the
+database are only imported if they are needed.
+
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
 
 from _pytask import __version__
-from _pytask._hashlib import hash_value
-from _pytask.build import build
-from _pytask.capture_utils import CaptureMethod
-from _pytask.capture_utils import ShowCapture
-from _pytask.logging_utils import TaskExecutionStatus
+
+if TYPE_CHECKING:
+    from _pytask._hashlib import hash_value
+    from _pytask.build import build
+    from _pytask.capture_utils import CaptureMethod
+    from _pytask.capture_utils import ShowCapture
+    from _pytask.cli import cli
+    from _pytask.click import ColoredCommand
+    from _pytask.click import ColoredGroup
+    from _pytask.click import EnumChoice
+    from _pytask.collect_utils import parse_dependencies_from_task_function
+    from _pytask.collect_utils import parse_products_from_task_function
+    from _pytask.compat import check_for_optional_program
+    from _pytask.compat import import_optional_dependency
+    from _pytask.console import console
+    from _pytask.dag_command import build_dag
+    from _pytask.data_catalog import DataCatalog
+    from _pytask.database_utils import BaseTable
+    from _pytask.database_utils import DatabaseSession
+    from _pytask.database_utils import State
+    from _pytask.database_utils import create_database
+    from _pytask.exceptions import CollectionError
+    from _pytask.exceptions import ConfigurationError
+    from _pytask.exceptions import ExecutionError
+    from _pytask.exceptions import NodeLoadError
+    from _pytask.exceptions import NodeNotCollectedError
+    from _pytask.exceptions import NodeNotFoundError
+    from _pytask.exceptions import PytaskError
+    from _pytask.exceptions import ResolvingDependenciesError
+    from _pytask.logging_utils import TaskExecutionStatus
+    from _pytask.mark import MARK_GEN as mark  # noqa: N811
+    from _pytask.mark import Mark
+    from _pytask.mark import MarkDecorator
+    from _pytask.mark import MarkGenerator
+    from _pytask.mark_utils import get_all_marks
+    from _pytask.mark_utils import get_marks
+    from _pytask.mark_utils import has_mark
+    from _pytask.mark_utils import remove_marks
+    from _pytask.mark_utils import set_marks
+    from _pytask.models import CollectionMetadata
+    from _pytask.models import NodeInfo
+    from _pytask.node_protocols import PNode
+    from _pytask.node_protocols import PPathNode
+    from _pytask.node_protocols import PProvisionalNode
+    from _pytask.node_protocols import PTask
+    from _pytask.node_protocols import PTaskWithPath
+    from _pytask.nodes import DirectoryNode
+    from _pytask.nodes import PathNode
+    from _pytask.nodes import PickleNode
+    from _pytask.nodes import PythonNode
+    from _pytask.nodes import Task
+    from _pytask.nodes import TaskWithoutPath
+    from _pytask.nodes import get_state_of_path
+    from _pytask.outcomes import CollectionOutcome
+    from _pytask.outcomes import Exit
+    from _pytask.outcomes import ExitCode
+    from _pytask.outcomes import Persisted
+    from _pytask.outcomes import Restored
+    from _pytask.outcomes import Skipped
+    from _pytask.outcomes import SkippedAncestorFailed
+    from _pytask.outcomes import SkippedUnchanged
+    from _pytask.outcomes import TaskOutcome
+    from _pytask.outcomes import count_outcomes
+    from _pytask.pluginmanager import get_plugin_manager
+    from _pytask.pluginmanager import hookimpl
+    from _pytask.pluginmanager import storage
+    from _pytask.profile import Runtime
+    from _pytask.reports import CollectionReport
+    from _pytask.reports import DagReport
+    from _pytask.reports import ExecutionReport
+    from _pytask.session import Session
+    from _pytask.task_utils import task
+    from _pytask.traceback import Traceback
+    from _pytask.typing import Product
+    from _pytask.typing import is_task_function
+    from _pytask.warnings_utils import WarningReport
+    from _pytask.warnings_utils import parse_warning_filter
+    from _pytask.warnings_utils import warning_record_to_str
+
+
+_LAZY_ATTRIBUTES: dict[str, tuple[str, str]] = {
+    "BaseTable": ("_pytask.database_utils", "BaseTable"),
+    "CaptureMethod": ("_pytask.capture_utils", "CaptureMethod"),
+    "CollectionError": ("_pytask.exceptions", "CollectionError"),
+    "CollectionMetadata": ("_pytask.models", "CollectionMetadata"),
+    "CollectionOutcome": ("_pytask.outcomes", "CollectionOutcome"),
+    "CollectionReport": ("_pytask.reports", "CollectionReport"),
+    "ColoredCommand": ("_pytask.click", "ColoredCommand"),
+    "ColoredGroup": ("_pytask.click", "ColoredGroup"),
+    "ConfigurationError": ("_pytask.exceptions", "ConfigurationError"),
+    "DagReport": ("_pytask.reports", "DagReport"),
+    "DataCatalog": ("_pytask.data_catalog", "DataCatalog"),
+    "DatabaseSession": ("_pytask.database_utils", "DatabaseSession"),
+    "DirectoryNode": ("_pytask.nodes", "DirectoryNode"),
+    "EnumChoice": ("_pytask.click", "EnumChoice"),
+    "ExecutionError": ("_pytask.exceptions", "ExecutionError"),
+    "ExecutionReport": ("_pytask.reports", "ExecutionReport"),
+    "Exit": ("_pytask.outcomes", "Exit"),
+    "ExitCode": ("_pytask.outcomes", "ExitCode"),
+    "Mark": ("_pytask.mark", "Mark"),
+    "MarkDecorator": ("_pytask.mark", "MarkDecorator"),
+    "MarkGenerator": ("_pytask.mark", "MarkGenerator"),
+    "NodeInfo": ("_pytask.models", "NodeInfo"),
+    "NodeLoadError": ("_pytask.exceptions", "NodeLoadError"),
+    "NodeNotCollectedError": ("_pytask.exceptions", "NodeNotCollectedError"),
+    "NodeNotFoundError": ("_pytask.exceptions", "NodeNotFoundError"),
+    "PNode": ("_pytask.node_protocols", "PNode"),
+    "PPathNode": ("_pytask.node_protocols", "PPathNode"),
+    "PProvisionalNode": ("_pytask.node_protocols", "PProvisionalNode"),
+    "PTask": ("_pytask.node_protocols", "PTask"),
+    "PTaskWithPath": ("_pytask.node_protocols", "PTaskWithPath"),
+    "PathNode": ("_pytask.nodes", "PathNode"),
+    "Persisted": ("_pytask.outcomes", "Persisted"),
+    "PickleNode": ("_pytask.nodes", "PickleNode"),
+    "Product": ("_pytask.typing", "Product"),
+    "PytaskError": ("_pytask.exceptions", "PytaskError"),
+    "PythonNode": ("_pytask.nodes", "PythonNode"),
+    "ResolvingDependenciesError": ("_pytask.exceptions", "ResolvingDependenciesError"),
+    "Restored": ("_pytask.outcomes", "Restored"),
+    "Runtime": ("_pytask.profile", "Runtime"),
+    "Session": ("_pytask.session", "Session"),
+    "ShowCapture": ("_pytask.capture_utils", "ShowCapture"),
+    "Skipped": ("_pytask.outcomes", "Skipped"),
+    "SkippedAncestorFailed": ("_pytask.outcomes", "SkippedAncestorFailed"),
+    "SkippedUnchanged": ("_pytask.outcomes", "SkippedUnchanged"),
+    "State": ("_pytask.database_utils", "State"),
+    "Task": ("_pytask.nodes", "Task"),
+    "TaskExecutionStatus": ("_pytask.logging_utils", "TaskExecutionStatus"),
+    "TaskOutcome": ("_pytask.outcomes", "TaskOutcome"),
+    "TaskWithoutPath": ("_pytask.nodes", "TaskWithoutPath"),
+    "Traceback": ("_pytask.traceback", "Traceback"),
+    "WarningReport": ("_pytask.warnings_utils", "WarningReport"),
+    "build": ("_pytask.build", "build"),
+    "build_dag": ("_pytask.dag_command", "build_dag"),
+    "check_for_optional_program": ("_pytask.compat", "check_for_optional_program"),
+    "cli": ("_pytask.cli", "cli"),
+    "console": ("_pytask.console", "console"),
+    "count_outcomes": ("_pytask.outcomes", "count_outcomes"),
+    "create_database": ("_pytask.database_utils", "create_database"),
+    "get_all_marks": ("_pytask.mark_utils", "get_all_marks"),
+    "get_marks": ("_pytask.mark_utils", "get_marks"),
+    "get_plugin_manager": ("_pytask.pluginmanager", "get_plugin_manager"),
+    "get_state_of_path": ("_pytask.nodes", "get_state_of_path"),
+    "has_mark": ("_pytask.mark_utils", "has_mark"),
+    "hash_value": ("_pytask._hashlib", "hash_value"),
+    "hookimpl": ("_pytask.pluginmanager", "hookimpl"),
+    "import_optional_dependency": ("_pytask.compat", "import_optional_dependency"),
+    "is_task_function": ("_pytask.typing", "is_task_function"),
+    "mark": ("_pytask.mark", "MARK_GEN"),
+    "parse_dependencies_from_task_function": (
+        "_pytask.collect_utils",
+        "parse_dependencies_from_task_function",
+    ),
+    "parse_products_from_task_function": (
+        "_pytask.collect_utils",
+        "parse_products_from_task_function",
+    ),
+    "parse_warning_filter": ("_pytask.warnings_utils", "parse_warning_filter"),
+    "remove_marks": ("_pytask.mark_utils", "remove_marks"),
+    "set_marks": ("_pytask.mark_utils", "set_marks"),
+    "storage": ("_pytask.pluginmanager", "storage"),
+    "task": ("_pytask.task_utils", "task"),
+    "warning_record_to_str": ("_pytask.warnings_utils", "warning_record_to_str"),
+}
+"""Maps public names to the modules and attributes they are imported from."""
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
 
 
-from _pytask.click import ColoredCommand
-from _pytask.click import ColoredGroup
-from _pytask.click import EnumChoice
-from _pytask.collect_utils import parse_dependencies_from_task_function
-from _pytask.collect_utils import parse_products_from_task_function
-from _pytask.compat import check_for_optional_program
-from _pytask.compat import import_optional_dependency
-from _pytask.console import console
-from _pytask.dag_command import build_dag
-from _pytask.data_catalog import DataCatalog
-from _pytask.database_utils import BaseTable
-from _pytask.database_utils import DatabaseSession
-from _pytask.database_utils import State
-from _pytask.database_utils import create_database
-from _pytask.exceptions import CollectionError
-from _pytask.exceptions import ConfigurationError
-from _pytask.exceptions import ExecutionError
-from _pytask.exceptions import NodeNotCollectedError
-from _pytask.exceptions import NodeLoadError
-from _pytask.exceptions import NodeNotFoundError
-from _pytask.exceptions import PytaskError
-from _pytask.exceptions import ResolvingDependenciesError
-from _pytask.mark import MARK_GEN as mark  # noqa: N811
-from _pytask.mark import Mark
-from _pytask.mark import MarkDecorator
-from _pytask.mark import MarkGenerator
-from _pytask.mark_utils import get_all_marks
-from _pytask.mark_utils import get_marks
-from _pytask.mark_utils import has_mark
-from _pytask.mark_utils import remove_marks
-from _pytask.mark_utils import set_marks
-from _pytask.models import CollectionMetadata
-from _pytask.models import NodeInfo
-from _pytask.node_protocols import PNode
-from _pytask.node_protocols import PPathNode
-from _pytask.node_protocols import PProvisionalNode
-from _pytask.node_protocols import PTask
-from _pytask.node_protocols import PTaskWithPath
-from _pytask.nodes import DirectoryNode
-from _pytask.nodes import PathNode
-from _pytask.nodes import PickleNode
-from _pytask.nodes import PythonNode
-from _pytask.nodes import Task
-from _pytask.nodes import TaskWithoutPath, get_state_of_path
-from _pytask.outcomes import CollectionOutcome
-from _pytask.outcomes import Exit
-from _pytask.outcomes import ExitCode
-from _pytask.outcomes import Persisted
-from _pytask.outcomes import Skipped
-from _pytask.outcomes import SkippedAncestorFailed
-from _pytask.outcomes import SkippedUnchanged
-from _pytask.outcomes import TaskOutcome
-from _pytask.outcomes import count_outcomes
-from _pytask.pluginmanager import get_plugin_manager
-from _pytask.pluginmanager import hookimpl
-from _pytask.pluginmanager import storage
-from _pytask.profile import Runtime
-from _pytask.reports import CollectionReport
-from _pytask.reports import DagReport
-from _pytask.reports import ExecutionReport
-from _pytask.session import Session
-from _pytask.task_utils import task
-from _pytask.traceback import Traceback
-from _pytask.typing import Product
-from _pytask.typing import is_task_function
-from _pytask.warnings_utils import WarningReport
-from _pytask.warnings_utils import parse_warning_filter
-from _pytask.warnings_utils import warning_record_to_str
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
 
-# _pytask.cli needs to be imported last because it triggers extending the cli and
-# therefore loading plugins which will attempt to import modules that might only be
-# partially initialized. Maybe not here, but definitely for plugins.
-from _pytask.cli import cli
 
 __all__ = [
     "BaseTable",
@@ -122,6 +233,7 @@ __all__ = [
     "PytaskError",
     "PythonNode",
     "ResolvingDependenciesError",
+    "Restored",
     "Runtime",
     "Session",
     "ShowCapture",
@@ -14,9 +14,17 @@ from click.testing import CliRunner
 from nbmake.pytest_items import NotebookItem
 from packaging import version
 
+import pytask
+from pytask import cli
 from pytask import console
 from pytask import storage
 
+# Import all public objects and plugins of pytask which are otherwise imported lazily.
+# Modules imported during a test are removed from sys.modules after the test.
+for _name in pytask.__all__:
+    getattr(pytask, _name)
+cli.commands  # noqa: B018
+
 
 @pytest.fixture(autouse=True)
 def _add_objects_to_doctest_namespace(doctest_namespace):
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import shutil
+import textwrap
+
+import pytest
+
+from pytask import ExitCode
+from pytask import Restored
+from pytask import TaskOutcome
+from pytask import build
+from tests.conftest import restore_sys_path_and_module_after_test_execution
+
+_SOURCE = """
+from pathlib import Path
+from typing import Annotated
+from pytask import Product
+
+def task_example(
+    path: Path = Path("in.txt"), out: Annotated[Path, Product] = Path("out.txt")
+) -> None:
+    out.write_text(path.read_text())
+"""
+
+
+def _create_project(path, content):
+    path.mkdir()
+    path.joinpath("pyproject.toml").write_text("[tool.pytask.ini_options]")
+    path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+    path.joinpath("in.txt").write_text(content)
+    return path
+
+
+def _build(path, **kwargs):
+    with restore_sys_path_and_module_after_test_execution():
+        return build(paths=path, **kwargs)
+
+
+@pytest.mark.end_to_end
+def test_restore_products_in_another_copy_of_the_project(tmp_path):
+    cache = tmp_path / "cache"
+    first = _create_project(tmp_path / "first", "Hello")
+
+    session = _build(first, build_cache=cache)
+    assert session.exit_code == ExitCode.OK
+    assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+    assert len(list(cache.glob("*/*/*"))) == 1
+
+    second = tmp_path / "second"
+    shutil.copytree(first, second, ignore=shutil.ignore_patterns(".pytask", "out.txt"))
+
+    session = _build(second, build_cache=cache)
+    assert session.exit_code == ExitCode.OK
+    report = session.execution_reports[0]
+    assert report.outcome == TaskOutcome.RESTORED
+    assert isinstance(report.exc_info[1], Restored)
+    assert second.joinpath("out.txt").read_text() == "Hello"
+
+    # The states of restored tasks are stored in the database.
+    session = _build(second, build_cache=cache)
+    assert session.execution_reports[0].outcome == TaskOutcome.SKIP_UNCHANGED
+
+    # Restored products can be overwritten without modifying the cache.
+    second.joinpath("in.txt").write_text("World")
+    session = _build(second, build_cache=cache)
+    assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+    assert second.joinpath("out.txt").read_text() == "World"
+    assert first.joinpath("out.txt").read_text() == "Hello"
+    assert len(list(cache.glob("*/*/*"))) == 2
+
+    second.joinpath("in.txt").write_text("Hello")
+    session = _build(second, build_cache=cache)
+    assert session.execution_reports[0].outcome == TaskOutcome.RESTORED
+    assert second.joinpath("out.txt").read_text() == "Hello"
+
+
+@pytest.mark.end_to_end
+def test_hard_links_of_the_user_are_kept(tmp_path):
+    cache = tmp_path / "cache"
+    project = _create_project(tmp_path / "project", "Hello")
+    _build(project, build_cache=cache)
+
+    out = project.joinpath("out.txt")
+    backup = project.joinpath("backup.txt")
+    os.link(out, backup)
+
+    project.joinpath("in.txt").write_text("World")
+    session = _build(project, build_cache=cache)
+    assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+    assert out.samefile(backup)
+    assert backup.read_text() == "World"
+
+
+@pytest.mark.end_to_end
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"force": True}, {"dry_run": True}], ids=["no_cache", "force", "dry"]
+)
+def test_products_are_not_restored(tmp_path, kwargs):
+    cache = tmp_path / "cache"
+    first = _create_project(tmp_path / "first", "Hello")
+    _build(first, build_cache=cache)
+    second = _create_project(tmp_path / "second", "Hello")
+
+    build_cache = None if not kwargs else cache
+    session = _build(second, build_cache=build_cache, **kwargs)
+    assert session.exit_code == ExitCode.OK
+    assert session.execution_reports[0].outcome in (
+        TaskOutcome.SUCCESS,
+        TaskOutcome.WOULD_BE_EXECUTED,
+    )
+
+
+@pytest.mark.end_to_end
+def test_tasks_with_python_nodes_as_products_are_not_cached(tmp_path):
+    source = """
+    from typing import Annotated
+    from pytask import PythonNode
+
+    def task_example() -> Annotated[int, PythonNode(name="value")]:
+        return 1
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    cache = tmp_path / "cache"
+
+    session = _build(tmp_path, build_cache=cache)
+    assert session.exit_code == ExitCode.OK
+    assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+    assert not cache.exists()
+
+
+def test_relative_build_cache_is_resolved_from_the_root(tmp_path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\nbuild_cache = 'cache'"
+    )
+    session = _build(tmp_path)
+    assert session.config["build_cache"] == tmp_path.joinpath("cache").resolve()
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import sys
+
 import pytest
 
+import pytask
+from _pytask.build import build
 from pytask import ExitCode
 from pytask import __version__
 from pytask import cli
@@ -13,6 +17,22 @@ def test_version_option():
     assert "pytask, version " + __version__ in result.stdout
 
 
+def test_import_pytask_does_not_load_plugins():
+    code = (
+        "import sys, pytask; "
+        "print(sorted({'_pytask.build', 'networkx', 'sqlalchemy'} & set(sys.modules)))"
+    )
+    result = run_in_subprocess((sys.executable, "-c", code))
+    assert result.stdout.strip() == "[]"
+
+
+def test_public_objects_are_imported_lazily():
+    assert pytask.build is build
+    assert "build" in dir(pytask)
+    with pytest.raises(AttributeError, match="has no attribute 'unknown'"):
+        pytask.unknown  # noqa: B018
+
+
 @pytest.mark.parametrize("help_option", ["-h", "--help"])
 @pytest.mark.parametrize(
     "commands",
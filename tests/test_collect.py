@@ -278,6 +278,14 @@ def test_find_shortest_uniquely_identifiable_names_for_tasks(tmp_path):
     assert result == expected
 
 
+def test_find_shortest_name_if_path_is_suffix_of_another_path():
+    short = Task(base_name="task_a", path=Path("a", "t.py"), function=None)
+    long_ = Task(base_name="task_a", path=Path("root", "a", "t.py"), function=None)
+
+    result = _find_shortest_uniquely_identifiable_name_for_tasks([short, long_])
+    assert result == {short.name: "a/t.py::task_a", long_.name: "root/a/t.py::task_a"}
+
+
 def test_collect_dependencies_from_args_if_depends_on_is_missing(tmp_path):
     source = """
     from pathlib import Path
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import textwrap
+
+import pytest
+
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Parallel collection requires fork.",
+)
+
+
+def _create_task_modules(tmp_path):
+    for i in range(3):
+        source = f"""
+        from pathlib import Path
+
+        with Path(__file__).parent.joinpath("imports.txt").open("a") as f:
+            f.write("imported\\n")
+
+        def task_write(produces=Path("out_{i}.txt")):
+            produces.write_text("{i}")
+        """
+        tmp_path.joinpath(f"task_parallel_{i}.py").write_text(textwrap.dedent(source))
+
+
+def _n_imports_in_main_process():
+    return sum(f"task_parallel_{i}" in sys.modules for i in range(3))
+
+
+def test_collect_task_modules_in_worker_processes(tmp_path):
+    _create_task_modules(tmp_path)
+
+    session = build(paths=tmp_path, n_collection_workers=2)
+    assert session.exit_code == ExitCode.OK
+    assert len(session.tasks) == 3
+    assert tmp_path.joinpath("imports.txt").read_text().count("imported") == 6
+    assert [tmp_path.joinpath(f"out_{i}.txt").read_text() for i in range(3)] == [
+        "0",
+        "1",
+        "2",
+    ]
+
+    for i in range(3):
+        sys.modules.pop(f"task_parallel_{i}", None)
+    tmp_path.joinpath("out_1.txt").unlink()
+
+    session = build(paths=tmp_path, n_collection_workers=2)
+    assert session.exit_code == ExitCode.OK
+    assert [report.outcome for report in session.execution_reports].count(
+        TaskOutcome.SUCCESS
+    ) == 1
+    assert tmp_path.joinpath("out_1.txt").read_text() == "1"
+    assert _n_imports_in_main_process() == 1
+
+
+def test_collection_errors_are_reported_from_main_process(tmp_path):
+    _create_task_modules(tmp_path)
+    tmp_path.joinpath("task_error.py").write_text("raise Exception")
+
+    session = build(paths=tmp_path, n_collection_workers=2)
+    assert session.exit_code == ExitCode.COLLECTION_FAILED
+    assert len(session.tasks) == 3
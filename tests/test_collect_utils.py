@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import functools
+import inspect
+from pathlib import Path
 from typing import Annotated
 
+import pytest
+
+from _pytask._inspect import get_parameter_names
+from _pytask.collect_utils import _ANNOTATIONS_CACHE
+from _pytask.collect_utils import _find_args_with_node_annotation
 from _pytask.collect_utils import _find_args_with_product_annotation
 from pytask import Product
+from pytask import PythonNode
 
 
 def test_find_args_with_product_annotation():
@@ -14,3 +23,41 @@ def test_find_args_with_product_annotation():
 
     result = _find_args_with_product_annotation(func)
     assert result == ["a"]
+
+
+def test_parse_annotations_is_cached_for_functions_with_same_code():
+    functions = []
+    for i in range(2):
+
+        def func(a: Annotated[Path, Product] = Path(f"{i}.txt")):  # pragma: no cover
+            return a
+
+        functions.append(func)
+
+    first = _find_args_with_product_annotation(functions[0])
+    first.append("return")
+    assert functions[0].__code__ in _ANNOTATIONS_CACHE
+    assert _find_args_with_product_annotation(functions[1]) == ["a"]
+
+
+def test_parse_annotations_does_not_cache_mutable_nodes():
+    def func(a: Annotated[int, PythonNode(value=1)]):  # pragma: no cover
+        return a
+
+    first = _find_args_with_node_annotation(func)
+    second = _find_args_with_node_annotation(func)
+    assert func.__code__ not in _ANNOTATIONS_CACHE
+    assert first["a"] is not second["a"]
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda a, b=1, *args, c, d=2, **kwargs: None,  # noqa: ARG005
+        lambda a, /, b, *, c: None,  # noqa: ARG005
+        lambda: None,
+        functools.partial(lambda a, b: None, 1),  # noqa: ARG005
+    ],
+)
+def test_get_parameter_names(func):
+    assert get_parameter_names(func) == tuple(inspect.signature(func).parameters)
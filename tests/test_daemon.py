@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from _pytask.daemon import _handle_connection
+from _pytask.daemon import _is_running
+from _pytask.daemon import _stop
+from _pytask.daemon_utils import MessageType
+from _pytask.daemon_utils import _is_forwarded
+from _pytask.daemon_utils import find_socket_path
+from _pytask.daemon_utils import get_socket_path
+from _pytask.daemon_utils import receive_message
+from _pytask.daemon_utils import run_client
+from _pytask.daemon_utils import send_message
+from pytask import ExitCode
+from tests.conftest import enter_directory
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="The daemon requires Unix sockets."
+)
+
+
+def test_send_and_receive_message():
+    left, right = socket.socketpair()
+    with left, right:
+        send_message(left, MessageType.OUTPUT, b"a" * 100_000)
+        send_message(left, MessageType.EXIT, b"0")
+        assert receive_message(right) == (MessageType.OUTPUT, b"a" * 100_000)
+        assert receive_message(right) == (MessageType.EXIT, b"0")
+        left.close()
+        assert receive_message(right) is None
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ([], True),
+        (["collect", "--nodes"], True),
+        (["daemon"], False),
+        (["watch", "-m", "slow"], False),
+        (["clean"], True),
+        (["clean", "--mode", "interactive"], False),
+        (["clean", "--mode=interactive"], False),
+        (["--pdb"], False),
+        (["build", "--pdbcls=IPython.terminal.debugger:TerminalPdb"], False),
+    ],
+)
+def test_is_forwarded(args, expected):
+    assert _is_forwarded(args) is expected
+
+
+def test_run_client_without_daemon(tmp_path):
+    assert find_socket_path(tmp_path) is None
+    assert run_client([], get_socket_path(tmp_path)) is None
+
+
+def test_daemon_rejects_clients_with_other_interpreter(tmp_path):
+    left, right = socket.socketpair()
+    request = {"args": [], "cwd": str(tmp_path), "env": {}, "executable": "python"}
+    with left, right:
+        send_message(left, MessageType.REQUEST, json.dumps(request).encode())
+        assert _handle_connection(right, tmp_path) is True
+        assert receive_message(left) == (MessageType.REJECT, b"")
+
+
+@pytest.mark.end_to_end
+def test_daemon_runs_commands(tmp_path, capsys, monkeypatch):
+    source = """
+    import os
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import Product
+
+    def task_example(path: Annotated[Path, Product] = Path("out.txt")) -> None:
+        path.write_text("1" + os.environ.get("PYTASK_DAEMON_TEST", ""))
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("pyproject.toml").touch()
+    socket_path = get_socket_path(tmp_path)
+
+    process = subprocess.Popen(
+        (sys.executable, "-m", "pytask", "daemon"),
+        cwd=tmp_path,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            if _is_running(socket_path):
+                break
+            time.sleep(0.1)
+        assert find_socket_path(tmp_path.joinpath("subfolder")) == socket_path
+
+        with enter_directory(tmp_path):
+            assert run_client([], socket_path) == ExitCode.OK
+            assert tmp_path.joinpath("out.txt").read_text() == "1"
+
+            # Commands run with the environment variables of the client.
+            monkeypatch.setenv("PYTASK_DAEMON_TEST", "a")
+            assert run_client(["-f"], socket_path) == ExitCode.OK
+            monkeypatch.delenv("PYTASK_DAEMON_TEST")
+            assert tmp_path.joinpath("out.txt").read_text() == "1a"
+
+            # Changes to task modules are picked up by the next command.
+            tmp_path.joinpath("task_example.py").write_text(
+                textwrap.dedent(source).replace('"1" + ', '"2" + ')
+            )
+            assert run_client([], socket_path) == ExitCode.OK
+            assert tmp_path.joinpath("out.txt").read_text() == "2"
+
+            assert run_client(["--unknown-option"], socket_path) == 2
+
+        assert _stop(socket_path) == ExitCode.OK
+        process.wait(timeout=10)
+    finally:
+        process.kill()
+
+    captured = capsys.readouterr().out
+    assert "Collected 1 task" in captured
+    assert "No such option" in captured
+    assert not socket_path.exists()
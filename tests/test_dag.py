@@ -6,9 +6,14 @@ from pathlib import Path
 
 import pytest
 
+from _pytask.dag import _add_task_to_dag
 from _pytask.dag import _create_dag_from_tasks
+from _pytask.dag import _modify_dag
+from _pytask.dag import update_dag
+from _pytask.exceptions import ResolvingDependenciesError
 from pytask import ExitCode
 from pytask import PathNode
+from pytask import Session
 from pytask import Task
 from pytask import build
 from pytask import cli
@@ -36,6 +41,83 @@ def test_create_dag():
         assert signature in dag.nodes
 
 
+def _noop():
+    pass
+
+
+class _UniterableList(list):
+    def __iter__(self):
+        msg = "All tasks are visited."
+        raise AssertionError(msg)
+
+
+def test_modify_dag_for_updated_tasks_visits_only_tasks_with_after():
+    root = Path("src")
+    first = Task(
+        base_name="task_first",
+        path=root,
+        function=_noop,
+        produces={"return": PathNode.from_path(root / "first.txt")},
+        attributes={"collection_id": "first"},
+    )
+    second = Task(
+        base_name="task_second",
+        path=root,
+        function=_noop,
+        attributes={"after": ["first"]},
+    )
+    third = Task(
+        base_name="task_third", path=root, function=_noop, attributes={"after": "new"}
+    )
+    session = Session(tasks=[first, second, third])
+    dag = _create_dag_from_tasks(session.tasks)
+    _modify_dag(session, dag)
+    assert second.signature in dag.descendants(first.signature)
+    assert dag.in_degree(third.signature) == 0
+
+    new = Task(
+        base_name="task_new",
+        path=root,
+        function=_noop,
+        produces={"return": PathNode.from_path(root / "new.txt")},
+    )
+    session.tasks = _UniterableList([*session.tasks, new])
+    _add_task_to_dag(dag, new)
+    _modify_dag(session, dag, tasks=[new])
+    assert third.signature in dag.descendants(new.signature)
+
+
+def test_failed_update_leaves_dag_unchanged():
+    root = Path("src")
+    first = Task(
+        base_name="task_first",
+        path=root,
+        function=_noop,
+        depends_on={"in": PathNode.from_path(root / "in.txt")},
+        produces={"return": PathNode.from_path(root / "first.txt")},
+    )
+    session = Session(tasks=[first], config={"paths": [root]})
+    session.dag = _create_dag_from_tasks(session.tasks)
+    nodes = {signature: session.dag.nodes[signature] for signature in session.dag}
+    edges = {(u, v) for u in session.dag for v in session.dag.successors(u)}
+
+    # The generated task closes the cycle in.txt -> first -> first.txt -> new -> in.txt.
+    new = Task(
+        base_name="task_new",
+        path=root,
+        function=_noop,
+        depends_on={"in": PathNode.from_path(root / "first.txt")},
+        produces={"return": PathNode.from_path(root / "in.txt")},
+    )
+    with pytest.raises(ResolvingDependenciesError, match="The DAG contains cycles"):
+        update_dag(session, [new])
+
+    dag = session.dag
+    assert new.signature not in dag
+    assert {signature: dag.nodes[signature] for signature in dag} == nodes
+    assert {(u, v) for u in dag for v in dag.successors(u)} == edges
+
+
 def test_cycle_in_dag(tmp_path, runner, snapshot_cli):
     source = """
     from pathlib import Path
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from _pytask.dag_graph import CompactDAG
+from pytask import PathNode
+from pytask import Task
+
+
+@pytest.fixture
+def dag():
+    """Create a dag where two tasks are connected by a node."""
+    dag = CompactDAG()
+    first = Task(base_name="1", path=Path(), function=None)
+    second = Task(base_name="2", path=Path(), function=None)
+    node = PathNode(name="node", path=Path("node"))
+    dag.add_node(first.signature, task=first)
+    dag.add_node(node.signature, node=node)
+    dag.add_node(second.signature, task=second)
+    dag.add_edge(first.signature, node.signature)
+    dag.add_edge(node.signature, second.signature)
+    return dag
+
+
+def test_node_view(dag):
+    assert len(dag.nodes) == 3
+    signatures = list(dag.nodes)
+    assert "task" in dag.nodes[signatures[0]]
+    assert "node" in dag.nodes[signatures[1]]
+    assert signatures[2] in dag
+    with pytest.raises(KeyError):
+        dag.nodes["missing"]
+
+
+def test_node_view_raises_error_for_modifications(dag):
+    signature = next(iter(dag))
+    with pytest.raises(TypeError, match="cannot be modified"):
+        dag.nodes[signature]["data"] = 1
+    with pytest.raises(TypeError, match="cannot be modified"):
+        dag.nodes[signature].update(data=1)
+    assert "data" not in dag.nodes[signature]
+
+
+def test_neighbors_and_reachability(dag):
+    first, node, second = list(dag)
+    assert list(dag.successors(first)) == [node]
+    assert list(dag.predecessors(second)) == [node]
+    assert dag.descendants(first) == {node, second}
+    assert dag.ancestors(second) == {first, node}
+    assert dag.task_successors() == {first: [second], second: []}
+
+
+def test_duplicated_edges_are_ignored(dag):
+    first, node, _ = list(dag)
+    dag.add_edge(first, node)
+    dag.compact()
+    dag.add_edge(first, node)
+    assert dag.number_of_edges() == 2
+    assert dag.in_degree(node) == 1
+
+
+def test_edges_survive_compaction(dag):
+    first, node, second = list(dag)
+    dag.compact()
+    third = Task(base_name="3", path=Path(), function=None)
+    dag.add_node(third.signature, task=third)
+    dag.add_edge(node, third.signature)
+    assert list(dag.successors(node)) == [second, third.signature]
+    dag.compact()
+    assert list(dag.successors(node)) == [second, third.signature]
+    assert dag.descendants(first) == {node, second, third.signature}
+
+
+def test_find_cycle(dag):
+    first, node, second = list(dag)
+    assert dag.find_cycle() == []
+    dag.add_edge(second, first)
+    assert dag.find_cycle() == [(first, node), (node, second), (second, first)]
+
+
+def test_roundtrip_with_networkx(dag):
+    nx_dag = dag.to_networkx()
+    assert isinstance(nx_dag, nx.DiGraph)
+    assert list(nx_dag.nodes) == list(dag)
+    assert nx_dag.number_of_edges() == dag.number_of_edges()
+
+    new_dag = CompactDAG.from_networkx(nx_dag)
+    assert list(new_dag) == list(dag)
+    assert new_dag.tasks() == dag.tasks()
+
+
+def test_remove_edge_and_node(dag):
+    first, node, second = list(dag)
+    dag.compact()
+    dag.remove_edge(first, node)
+    assert list(dag.successors(first)) == []
+    assert dag.number_of_edges() == 1
+    dag.remove_node(node)
+    assert node not in dag
+    assert list(dag) == [first, second]
+    assert list(dag.predecessors(second)) == []
+    dag.compact()
+    assert dag.number_of_edges() == 0
+    assert dag.find_cycle() == []
+
+
+def _edges(dag):
+    return {(u, v) for u in dag for v in dag.successors(u)}
+
+
+def test_transaction_reverts_modifications(dag):
+    first, node, second = list(dag)
+    dag.compact()
+    nodes = {signature: dag.nodes[signature] for signature in dag}
+    edges = _edges(dag)
+
+    third = Task(base_name="3", path=Path(), function=None)
+    with pytest.raises(ValueError, match="Fail"), dag.transaction():  # noqa: PT012
+        dag.add_node(third.signature, task=third)
+        dag.add_edge(second, third.signature)
+        dag.remove_edge(first, node)
+        dag.remove_node(second)
+        dag.add_node(node, node=PathNode(name="other", path=Path("other")))
+        msg = "Fail"
+        raise ValueError(msg)
+
+    assert {signature: dag.nodes[signature] for signature in dag} == nodes
+    assert _edges(dag) == edges
+    assert dag.number_of_edges() == 2
+
+    with dag.transaction():
+        dag.add_node(third.signature, task=third)
+    assert third.signature in dag
+
+
+def test_reachability_from_many_vertices(dag):
+    first, node, second = list(dag)
+    assert dag.ancestors_of([node, second]) == {first, node}
+    assert dag.descendants_of([first, node]) == {node, second}
+
+
+def test_typed_accessors(dag):
+    first, node, _ = list(dag)
+    assert dag.get_task(first) is dag.get(first)
+    assert dag.get_node(node) is dag.get(node)
+    with pytest.raises(KeyError):
+        dag.get_task(node)
+    with pytest.raises(KeyError):
+        dag.get_node(first)
+
+
+def test_networkx_interface_is_delegated_with_warning(dag):
+    first, node, second = list(dag)
+    with pytest.warns(FutureWarning, match="CompactDAG"):
+        assert list(dag.edges) == [(first, node), (node, second)]
+    assert dict(dag.nodes(data="task"))[first] is dag.get(first)
+    assert dict(dag.in_degree()) == {first: 0, node: 1, second: 1}
+    assert nx.ancestors(dag, second) == {first, node}
+    assert list(nx.topological_sort(dag)) == [first, node, second]
+
+    # The export is frozen and recreated after the graph is modified.
+    with pytest.raises(nx.NetworkXError, match="Frozen"):
+        dag.add_edges_from([(first, second)])
+    dag.add_edge(first, second)
+    with pytest.warns(FutureWarning):
+        assert dag.has_edge(first, second)
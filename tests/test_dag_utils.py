@@ -6,13 +6,17 @@ from pathlib import Path
 import networkx as nx
 import pytest
 
+from _pytask.dag_graph import CompactDAG
 from _pytask.dag_utils import TopologicalSorter
 from _pytask.dag_utils import _extract_priorities_from_tasks
+from _pytask.dag_utils import block_descending_tasks
 from _pytask.dag_utils import descending_tasks
 from _pytask.dag_utils import node_and_neighbors
 from _pytask.dag_utils import task_and_descending_tasks
 from pytask import Mark
+from pytask import Session
 from pytask import Task
+from pytask import TaskOutcome
 
 
 @pytest.fixture
@@ -181,3 +185,98 @@ def test_instantiate_sorter_from_other_sorter(dag):
         task_name = new_scheduler.get_ready()[0]
         new_scheduler.done(task_name)
     assert new_scheduler._nodes_done == set(name_to_sig.values()) | {task.signature}
+
+
+def test_deprecated_dag_of_sorter(dag):
+    sorter = TopologicalSorter.from_dag(dag)
+    first = sorter.get_ready()[0]
+    sorter.done(first)
+
+    with pytest.warns(FutureWarning, match="'TopologicalSorter.dag' is deprecated"):
+        task_dag = sorter.dag
+    assert first not in task_dag
+    assert task_dag.number_of_nodes() == 4
+    assert task_dag.number_of_edges() == 3
+
+
+def test_peek_ready_tasks_without_marking_them():
+    dag = CompactDAG()
+    tasks = [Task(base_name=str(i), path=Path(), function=None) for i in range(3)]
+    for task in tasks:
+        dag.add_node(task.signature, task=task)
+    sorter = TopologicalSorter.from_dag(dag)
+
+    assert sorter.get_ready() == [tasks[0].signature]
+    assert sorter.peek_ready(5) == [tasks[1].signature, tasks[2].signature]
+    assert sorter.get_ready(5) == [tasks[1].signature, tasks[2].signature]
+    assert sorter.peek_ready() == []
+
+
+def test_update_sorter_with_new_tasks():
+    dag = CompactDAG()
+    first = Task(base_name="1", path=Path(), function=None)
+    dag.add_node(first.signature, task=first)
+    sorter = TopologicalSorter.from_dag(dag)
+    assert sorter.get_ready() == [first.signature]
+
+    second = Task(base_name="2", path=Path(), function=None)
+    dag.add_node(second.signature, task=second)
+    dag.add_edge(first.signature, second.signature)
+    sorter.update(dag, [second.signature])
+    assert sorter.get_ready() == []
+
+    sorter.done(first.signature)
+    assert sorter.get_ready() == [second.signature]
+    sorter.done(second.signature)
+    assert not sorter.is_active()
+
+
+def test_blocking_is_propagated_to_descending_tasks(dag):
+    sorter = TopologicalSorter.from_dag(dag)
+    signatures = []
+    while sorter.is_active():
+        signature = sorter.get_ready()[0]
+        signatures.append(signature)
+        if len(signatures) == 2:
+            sorter.block(signature, TaskOutcome.FAIL)
+        if len(signatures) == 4:
+            sorter.block(signature, TaskOutcome.SKIP)
+        sorter.done(signature)
+
+    assert sorter.blocked_by(signatures[1]) == {}
+    assert sorter.blocked_by(signatures[2]) == {signatures[1]: TaskOutcome.FAIL}
+    assert sorter.blocked_by(signatures[4]) == {
+        signatures[1]: TaskOutcome.FAIL,
+        signatures[3]: TaskOutcome.SKIP,
+    }
+
+
+def test_blocking_with_the_same_outcome_is_ignored(dag):
+    sorter = TopologicalSorter.from_dag(dag)
+    signatures = []
+    while sorter.is_active():
+        signature = sorter.get_ready()[0]
+        signatures.append(signature)
+        sorter.block(signature, TaskOutcome.SKIP)
+        sorter.done(signature)
+
+    assert sorter.blocked_by(signatures[-1]) == {signatures[0]: TaskOutcome.SKIP}
+
+
+@pytest.mark.parametrize("scheduler", [None, "sorter"])
+def test_block_descending_tasks(dag, scheduler):
+    signatures = list(dag.nodes)
+    sorter = TopologicalSorter.from_dag(dag)
+    session = Session(dag=dag, scheduler=sorter if scheduler else None)
+    task = dag.nodes[signatures[1]]["task"]
+    mark = Mark("skip_ancestor_failed", (), {"reason": "Previous task failed."})
+
+    block_descending_tasks(session, task, TaskOutcome.FAIL, mark)
+
+    markers = [dag.nodes[signature]["task"].markers for signature in signatures]
+    if scheduler:
+        assert markers == [[]] * 5
+        sorter.done(*signatures[:2])
+        assert sorter.blocked_by(signatures[2]) == {signatures[1]: TaskOutcome.FAIL}
+    else:
+        assert markers == [[], [], [mark], [mark], [mark]]
@@ -4,6 +4,7 @@ import textwrap
 
 from sqlalchemy.engine import make_url
 
+from _pytask.database_utils import find_changed_tasks
 from pytask import DatabaseSession
 from pytask import ExitCode
 from pytask import State
@@ -71,3 +72,32 @@ def test_rename_database_w_cli(tmp_path, runner):
     )
     assert result.exit_code == ExitCode.OK
     assert path_to_db.exists()
+
+
+def test_find_changed_tasks(tmp_path):
+    source = """
+    from pathlib import Path
+
+    def task_write(path=Path("in.txt"), produces=Path("out.txt")):
+        produces.touch()
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("in.txt").touch()
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+
+    create_database(
+        make_url(
+            "sqlite:///" + tmp_path.joinpath(".pytask", "pytask.sqlite3").as_posix()
+        )
+    )
+    task = session.tasks[0]
+    assert find_changed_tasks(session.dag, [task]) == set()
+
+    in_id = task.depends_on["path"].signature
+    node_states = {in_id: "changed"}
+    assert find_changed_tasks(session.dag, [task], node_states) == {task.signature}
+
+    out_id = task.produces["produces"].signature
+    assert find_changed_tasks(session.dag, [task], {out_id: None}) == {task.signature}
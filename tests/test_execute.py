@@ -7,14 +7,20 @@ import re
 import subprocess
 import sys
 import textwrap
+from pathlib import Path
 
 import pytest
 
 import pytask
+from _pytask.dag_graph import CompactDAG
+from _pytask.dag_utils import TopologicalSorter
+from _pytask.execute import _get_ready_task
 from pytask import CaptureMethod
 from pytask import ExitCode
 from pytask import NodeNotFoundError
 from pytask import PathNode
+from pytask import Session
+from pytask import Task
 from pytask import TaskOutcome
 from pytask import TaskWithoutPath
 from pytask import build
@@ -512,6 +518,37 @@ def test_pytree_and_python_node_as_return(runner, tmp_path):
     assert "1  Succeeded" in result.output
 
 
+def test_stored_python_node_allows_skipping_tasks(runner, tmp_path):
+    source = """
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import PythonNode
+
+    node = PythonNode(name="value", hash=True, store=True)
+
+    def task_first() -> Annotated[str, node]:
+        return "Hello"
+
+    def task_second(value: Annotated[str, node]) -> Annotated[str, Path("out.txt")]:
+        return value
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "2  Succeeded" in result.output
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "2  Skipped because unchanged" in result.output
+
+    for path in tmp_path.joinpath(".pytask", "python_nodes").iterdir():
+        path.unlink()
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "1  Succeeded" in result.output
+    assert "1  Skipped because unchanged" in result.output
+
+
 def test_more_nested_pytree_and_python_node_as_return_with_names(runner, tmp_path):
     source = """
     from pathlib import Path
@@ -955,3 +992,57 @@ def test_download_file(runner, tmp_path):
     assert result.exit_code == ExitCode.OK
     assert "1  Succeeded" in result.output
     assert "Hello, World!" in tmp_path.joinpath("data.csv").read_text()
+
+
+def test_unchanged_tasks_are_skipped_without_execution_protocol(tmp_path):
+    source = """
+    from pathlib import Path
+    from typing import Annotated
+
+    def task_first(path: Path = Path("in.txt")) -> Annotated[str, Path("out.txt")]:
+        return path.read_text()
+
+    def task_second(path: Path = Path("out.txt")) -> Annotated[str, Path("copy.txt")]:
+        return path.read_text()
+
+    def task_third() -> Annotated[str, Path("other.txt")]:
+        return "Hello"
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("in.txt").write_text("Hello")
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    for report in session.execution_reports:
+        assert report.outcome == TaskOutcome.SKIP_UNCHANGED
+        # Reports of the fast path are created without raising an exception.
+        assert report.exc_info[2] is None
+
+    tmp_path.joinpath("in.txt").write_text("World")
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    outcomes = {
+        report.task.name.rsplit("::", 1)[-1]: report.outcome
+        for report in session.execution_reports
+    }
+    assert outcomes == {
+        "task_first": TaskOutcome.SUCCESS,
+        "task_second": TaskOutcome.SUCCESS,
+        "task_third": TaskOutcome.SKIP_UNCHANGED,
+    }
+    assert tmp_path.joinpath("copy.txt").read_text() == "World"
+
+
+def test_get_ready_task_fails_if_no_task_can_become_ready():
+    dag = CompactDAG()
+    task = Task(base_name="example", path=Path(), function=None)
+    dag.add_node(task.signature, task=task)
+    session = Session(dag=dag, scheduler=TopologicalSorter.from_dag(dag))
+
+    assert _get_ready_task(session) == task.signature
+    # The task is never marked as done and no products are saved in the background.
+    with pytest.raises(RuntimeError, match="No task is ready to be executed"):
+        _get_ready_task(session)
@@ -6,6 +6,8 @@ import pytest
 
 from _pytask.collect import pytask_ignore_collect
 from _pytask.config import _IGNORED_FOLDERS
+from _pytask.git import init_repo
+from _pytask.git import is_git_installed
 from pytask import ExitCode
 from pytask import build
 
@@ -47,3 +49,21 @@ def test_ignore_paths(tmp_path, ignore, new_line):
 def test_pytask_ignore_collect(path, ignored_paths, expected):
     is_ignored = pytask_ignore_collect(path, {"ignore": ignored_paths})
     assert is_ignored == expected
+
+
+@pytest.mark.skipif(not is_git_installed(), reason="git is not installed.")
+@pytest.mark.parametrize(("discover_with_git", "expected"), [(False, 3), (True, 2)])
+def test_discover_files_with_git(tmp_path, discover_with_git, expected):
+    init_repo(tmp_path)
+    tmp_path.joinpath(".gitignore").write_text("ignored_by_git\n")
+    for folder in ("", "untracked", "ignored_by_git", "ignored_by_pytask"):
+        tmp_path.joinpath(folder).mkdir(exist_ok=True)
+        tmp_path.joinpath(folder, "task_module.py").write_text("def task_d(): pass")
+
+    session = build(
+        paths=tmp_path,
+        ignore=["ignored_by_pytask/*"],
+        discover_with_git=discover_with_git,
+    )
+    assert session.exit_code == ExitCode.OK
+    assert len(session.tasks) == expected
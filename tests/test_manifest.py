@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+
+
+def _create_project(tmp_path, content="Hello"):
+    source = f"""
+    from pathlib import Path
+    from typing_extensions import Annotated
+
+    with Path(__file__).parent.joinpath("imports.txt").open("a") as f:
+        f.write("imported\\n")
+
+    def task_write(produces=Path("out.txt")):
+        produces.write_text({content!r})
+
+    def task_copy(path=Path("out.txt")) -> Annotated[str, Path("copy.txt")]:
+        return path.read_text()
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+
+
+def _build(tmp_path):
+    # Remove the module imported by a previous build to simulate a new process.
+    sys.modules.pop("task_module", None)
+    return build(paths=tmp_path, lazy_collection=True)
+
+
+def _n_imports(tmp_path):
+    return tmp_path.joinpath("imports.txt").read_text().count("imported")
+
+
+def test_unchanged_task_module_is_not_imported(tmp_path):
+    _create_project(tmp_path)
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert _n_imports(tmp_path) == 1
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert len(session.tasks) == 2
+    assert all(
+        report.outcome == TaskOutcome.SKIP_UNCHANGED
+        for report in session.execution_reports
+    )
+    assert _n_imports(tmp_path) == 1
+
+
+def test_task_module_is_imported_when_task_is_executed(tmp_path):
+    _create_project(tmp_path)
+    assert _build(tmp_path).exit_code == ExitCode.OK
+
+    tmp_path.joinpath("copy.txt").unlink()
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert session.execution_reports[1].outcome == TaskOutcome.SUCCESS
+    assert tmp_path.joinpath("copy.txt").read_text() == "Hello"
+    assert _n_imports(tmp_path) == 2
+
+
+def test_changed_task_module_is_collected_again(tmp_path):
+    _create_project(tmp_path)
+    assert _build(tmp_path).exit_code == ExitCode.OK
+
+    _create_project(tmp_path, content="World")
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("copy.txt").read_text() == "World"
+    assert _n_imports(tmp_path) == 2
+
+
+def test_task_module_can_opt_out_of_the_manifest(tmp_path):
+    source = """
+    from pathlib import Path
+    from pytask import task
+
+    __pytask_lazy_collection__ = False
+
+    # Tasks depend on an input which is read while the module is imported.
+    names = Path(__file__).parent.joinpath("names.txt").read_text().split()
+
+    for name in names:
+
+        @task(id=name)
+        def task_write(name=name, produces=Path(f"{name}.txt")):
+            produces.write_text(name)
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("names.txt").write_text("a")
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert len(session.tasks) == 1
+
+    tmp_path.joinpath("names.txt").write_text("a b")
+
+    session = _build(tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert len(session.tasks) == 2
+    assert tmp_path.joinpath("b.txt").read_text() == "b"
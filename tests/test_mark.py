@@ -2,16 +2,24 @@ from __future__ import annotations
 
 import sys
 import textwrap
+from pathlib import Path
 
 import pytest
 
 import pytask
+from _pytask.mark import Expression
+from _pytask.mark import TaskIndex
 from pytask import ExitCode
+from pytask import Mark
 from pytask import MarkGenerator
+from pytask import Task
 from pytask import build
 from pytask import cli
 
 
+def _func(): ...
+
+
 @pytest.mark.parametrize("attribute", ["hookimpl", "mark"])
 def test_mark_exists_in_pytask_namespace(attribute):
     assert attribute in sys.modules["pytask"].__all__
@@ -380,3 +388,41 @@ def test_error_with_d(runner, tmp_path):
     result = runner.invoke(cli, [tmp_path.as_posix()])
     assert result.exit_code == ExitCode.COLLECTION_FAILED
     assert "@pytask.mark.parametrize" in result.output
+
+
+def test_task_index_selects_tasks_by_keyword_and_mark():
+    tasks = [
+        Task(base_name="task_Alpha", path=Path(), function=_func),
+        Task(
+            base_name="task_beta",
+            path=Path(),
+            function=_func,
+            markers=[Mark("slow", (), {})],
+        ),
+        Task(base_name="task_alphabet", path=Path(), function=_func),
+    ]
+    index = TaskIndex(tasks)
+    alpha, beta, alphabet = (task.signature for task in tasks)
+
+    assert index.select_by_keyword(Expression.compile_("alpha")) == {alpha, alphabet}
+    assert index.select_by_keyword(Expression.compile_("not bet")) == {alpha}
+    assert index.select_by_keyword(Expression.compile_("slow")) == {beta}
+    assert index.select_by_mark(Expression.compile_("not slow")) == {alpha, alphabet}
+
+
+def test_task_index_is_extended_with_tasks():
+    alpha = Task(base_name="task_alpha", path=Path(), function=_func)
+    beta = Task(
+        base_name="task_beta", path=Path(), function=_func, markers=[Mark("slow", (), {})]
+    )
+    index = TaskIndex([alpha])
+    assert index.select_by_keyword(Expression.compile_("task")) == {alpha.signature}
+    assert index.select_by_mark(Expression.compile_("slow")) == set()
+
+    index.extend([beta])
+    assert index.select_by_keyword(Expression.compile_("task")) == {
+        alpha.signature,
+        beta.signature,
+    }
+    assert index.select_by_keyword(Expression.compile_("beta")) == {beta.signature}
+    assert index.select_by_mark(Expression.compile_("slow")) == {beta.signature}
@@ -52,6 +52,22 @@ def test_basic(expr: str, expected: bool) -> None:
     assert evaluate(expr, matcher) is expected
 
 
+def test_evaluate_sets() -> None:
+    lookup = {"a": {0, 1}, "b": {1, 2}}.__getitem__
+
+    def universe():
+        return {0, 1, 2, 3}
+
+    expression = Expression.compile_("a and not b or (b and not a)")
+    assert expression.evaluate_sets(lookup, universe) == {0, 2}
+    assert Expression.compile_("not (a or b)").evaluate_sets(lookup, universe) == {3}
+    assert not Expression.compile_("").evaluate_sets(lookup, universe)
+
+
+def test_compiled_expressions_are_cached() -> None:
+    assert Expression.compile_("a and b").code is Expression.compile_("a and b").code
+
+
 @pytest.mark.parametrize(
     ("expr", "expected"),
     [
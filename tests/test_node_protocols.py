@@ -3,10 +3,35 @@ from __future__ import annotations
 import pickle
 import textwrap
 
+import pytest
+
+from _pytask.node_protocols import get_node_option
 from pytask import ExitCode
+from pytask import PathNode
+from pytask import PickleNode
+from pytask import PythonNode
 from pytask import cli
 
 
+class _CachedNode(PythonNode):
+    cache_value = True
+
+
+@pytest.mark.parametrize(
+    ("node", "expected"),
+    [
+        (PythonNode(value=1), False),
+        (PythonNode(value=1, attributes={"cache_value": True}), True),
+        (_CachedNode(value=1), True),
+        (_CachedNode(value=1, attributes={"cache_value": False}), False),
+        (PickleNode(path="a.pkl"), False),
+        (PathNode(path="a.txt", attributes={"temporary": True}), False),
+    ],
+)
+def test_get_node_option(node, expected):
+    assert get_node_option(node, "cache_value") is expected
+
+
 def test_node_protocol_for_custom_nodes(runner, tmp_path):
     source = """
     from typing import Annotated
@@ -6,6 +6,7 @@ from pathlib import Path
 import cloudpickle
 import pytest
 
+from _pytask.typing import no_default
 from pytask import NodeInfo
 from pytask import PathNode
 from pytask import PickleNode
@@ -124,6 +125,22 @@ def test_comply_with_protocol(node, protocol, expected):
     assert isinstance(node, protocol) is expected
 
 
+def test_stored_python_node_is_loaded_lazily(tmp_path):
+    node = PythonNode(name="node", hash=True, store=True)
+    node.set_storage_path(tmp_path / "node.pkl")
+    assert node.state() is None
+
+    node.save("Hello")
+    state = node.state()
+
+    new_node = PythonNode(name="node", hash=True, store=True)
+    new_node.set_storage_path(tmp_path / "node.pkl")
+    assert new_node.state() == state
+    assert new_node.value is no_default
+    assert new_node.load() == "Hello"
+    assert new_node.state() == state
+
+
 def test_custom_serializer_deserializer_pickle_node(tmp_path):
     """Test that PickleNode correctly uses cloudpickle for de-/serialization."""
 
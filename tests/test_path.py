@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 import textwrap
 from contextlib import ExitStack as does_not_raise  # noqa: N813
@@ -11,6 +12,8 @@ from typing import Any
 
 import pytest
 
+from _pytask.path import DirectoryIndex
+from _pytask.path import PatternMatcher
 from _pytask.path import _insert_missing_modules
 from _pytask.path import _module_name_from_path
 from _pytask.path import find_case_sensitive_path
@@ -389,3 +392,77 @@ class TestImportLibMode:
         # Ensure we do not import the same module again (#11475).
         mod2 = import_path(init, root=tmp_path)
         assert mod is mod2
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/project/.git",
+        "/project/.git/HEAD",
+        "/project/src/pyproject.toml",
+        "/project/task_data.py",
+        "task_data.py",
+        "/project/data/raw/file.csv",
+        "/project/pkg.egg-info/PKG-INFO",
+        "/project/sub/__pycache__",
+        "/project/sub/module.py",
+        "/project/sub/[x].py",
+        "/absolute/file.txt",
+        "/absolute/sub/file.txt",
+    ],
+)
+def test_pattern_matcher_is_equal_to_path_match(path):
+    patterns = [
+        ".git/*",
+        "pyproject.toml",
+        "task_*.py",
+        "data/r?w/*",
+        "*.egg-info/*",
+        "__pycache__",
+        "sub/[!_]*.py",
+        "sub/[[]x].py",
+        "/absolute/*.txt",
+    ]
+    matcher = PatternMatcher.from_patterns(patterns)
+    expected = any(Path(path).match(pattern) for pattern in patterns)
+    assert matcher.match(path) is expected
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["*", "*.txt", "**/*.txt", "a/**/*.csv", "**/c/*", "?/b*/[xy].*", "**/*", "[!a]*"],
+)
+def test_directory_index_is_equal_to_glob(tmp_path, pattern):
+    for path in ("x.txt", "a/b/x.csv", "a/b/c/y.txt", "a/bb/y.csv", "d/c/x.txt"):
+        tmp_path.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(path).touch()
+
+    result = DirectoryIndex().glob(tmp_path, pattern)
+    assert result == sorted(tmp_path.glob(pattern))
+
+
+def test_directory_index_lists_only_changed_directories(tmp_path):
+    tmp_path.joinpath("a").mkdir()
+    tmp_path.joinpath("a", "x.txt").touch()
+    index = DirectoryIndex()
+    assert index.glob(tmp_path, "**/*.txt") == [tmp_path / "a" / "x.txt"]
+
+    # Pretend that the listings were created long after the last modification and
+    # replace the listing of the subdirectory to see that it is reused.
+    index.listings = {
+        directory: (mtime, mtime + 10**10, *rest)
+        for directory, (mtime, _, *rest) in index.listings.items()
+    }
+    mtime, listed, *_ = index.listings[str(tmp_path / "a")]
+    index.listings[str(tmp_path / "a")] = (mtime, listed, ["y.txt"], [], [])
+    assert index.glob(tmp_path, "**/*.txt") == [tmp_path / "a" / "y.txt"]
+
+    # A new directory changes the modification time of the root directory.
+    tmp_path.joinpath("b").mkdir()
+    tmp_path.joinpath("b", "z.txt").touch()
+    mtime = tmp_path.stat().st_mtime_ns + 10**9
+    os.utime(tmp_path, ns=(mtime, mtime))
+    assert index.glob(tmp_path, "**/*.txt") == [
+        tmp_path / "a" / "y.txt",
+        tmp_path / "b" / "z.txt",
+    ]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import ctypes
+import mmap
+import pickle
+
+import pytest
+
+from _pytask.pickle_utils import dump_zero_copy
+from _pytask.pickle_utils import load_zero_copy
+from pytask import PickleNode
+
+
+class _Buffer(bytearray):
+    """A bytearray which hands its data out-of-band to pickle protocol 5."""
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return _reconstruct, (pickle.PickleBuffer(self),)
+        return type(self), (bytes(self),)
+
+
+def _reconstruct(buffer):
+    return buffer
+
+
+def _dump_and_load(value, path):
+    with path.open("wb") as f:
+        dump_zero_copy(value, f)
+    with path.open("rb") as f:
+        return load_zero_copy(f)
+
+
+def test_large_buffers_are_memory_mapped_and_page_aligned(tmp_path):
+    path = tmp_path / "data.pkl"
+    value = {
+        "large": _Buffer(b"a" * mmap.PAGESIZE),
+        "other": _Buffer(b"b" * (mmap.PAGESIZE + 1)),
+        "small": _Buffer(b"c"),
+        "list": [1, 2],
+    }
+
+    loaded = _dump_and_load(value, path)
+
+    assert loaded["list"] == [1, 2]
+    assert bytes(loaded["small"]) == b"c"
+    for key in ("large", "other"):
+        assert bytes(loaded[key]) == bytes(value[key])
+        assert isinstance(loaded[key].obj, mmap.mmap)
+        address = ctypes.addressof(ctypes.c_char.from_buffer(loaded[key]))
+        assert address % mmap.PAGESIZE == 0
+
+
+def test_loaded_buffers_are_copy_on_write(tmp_path):
+    path = tmp_path / "data.pkl"
+    loaded = _dump_and_load(_Buffer(b"a" * mmap.PAGESIZE), path)
+
+    loaded[0] = ord("b")
+
+    with path.open("rb") as f:
+        assert bytes(load_zero_copy(f)) == b"a" * mmap.PAGESIZE
+
+
+def test_load_raises_error_for_other_pickles(tmp_path):
+    path = tmp_path / "data.pkl"
+    path.write_bytes(pickle.dumps(list(range(10))))
+    with path.open("rb") as f, pytest.raises(pickle.UnpicklingError, match="not"):
+        load_zero_copy(f)
+
+
+def test_zero_copy_pickle_node(tmp_path):
+    node = PickleNode(path=tmp_path / "data.pkl", zero_copy=True)
+
+    node.save(_Buffer(b"a" * mmap.PAGESIZE))
+    state = node.state()
+    value = node.load()
+    assert isinstance(value.obj, mmap.mmap)
+
+    # The previous file is replaced, so loaded values remain valid.
+    node.save(_Buffer(b"b" * mmap.PAGESIZE))
+    assert bytes(value) == b"a" * mmap.PAGESIZE
+    assert bytes(node.load()) == b"b" * mmap.PAGESIZE
+    assert node.state() != state
+    assert [path.name for path in tmp_path.iterdir()] == ["data.pkl"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from types import ModuleType
+
+from pluggy import PluginManager
+
+import _pytask.pluginmanager
+from _pytask.pluginmanager import PluginDistribution
+from _pytask.pluginmanager import list_plugin_distributions
+from _pytask.pluginmanager import load_entry_points
+
+
+class _EntryPoint:
+    name = "plugin"
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+
+    def load(self):
+        return self.plugin
+
+
+def test_plugins_from_entry_points_are_listed_with_distributions(monkeypatch):
+    plugin = ModuleType("plugin")
+    dist = PluginDistribution("pytask-plugin", "1.0.0")
+    monkeypatch.setattr(
+        _pytask.pluginmanager,
+        "_find_entry_points",
+        lambda group, path: ((dist, _EntryPoint(plugin)),),  # noqa: ARG005
+    )
+    pm = PluginManager("pytask")
+
+    load_entry_points(pm, "pytask")
+    assert pm.get_plugin("plugin") is plugin
+    assert list_plugin_distributions(pm) == [(plugin, dist)]
+
+    # Plugins are not registered twice.
+    load_entry_points(pm, "pytask")
+    assert list_plugin_distributions(pm) == [(plugin, dist)]
+
+    pm.unregister(plugin)
+    assert list_plugin_distributions(pm) == []
+    assert list_plugin_distributions(PluginManager("pytask")) == []
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pickle
+import textwrap
+import threading
+
+import pytest
+
+from _pytask.prefetch import Prefetcher
+from _pytask.value_cache import ValueCache
+from pytask import ExitCode
+from pytask import PickleNode
+from pytask import build
+
+
+def test_prefetched_value_is_returned_once(tmp_path):
+    node = PickleNode(path=tmp_path / "data.pkl")
+    node.save([1, 2, 3])
+    prefetcher = Prefetcher(max_size=1024)
+    future, reserved = prefetcher._submit(ValueCache(), node, 10)
+    prefetcher._futures["task"] = {node.signature: (future, reserved)}
+    future.result()
+    assert prefetcher.size > 0
+
+    assert prefetcher.load("task", node, ValueCache()) == [1, 2, 3]
+    assert prefetcher.size == 0
+    assert prefetcher._futures["task"] == {}
+
+    prefetcher.discard("task")
+    prefetcher.shutdown()
+    assert not prefetcher._futures
+
+
+def test_size_is_reserved_until_value_is_loaded(tmp_path):
+    is_loading = threading.Event()
+
+    def deserializer(f):
+        is_loading.wait(timeout=10)
+        return pickle.load(f)
+
+    node = PickleNode(path=tmp_path / "data.pkl", deserializer=deserializer)
+    node.save(list(range(100)))
+    prefetcher = Prefetcher(max_size=1024)
+
+    future, reserved = prefetcher._submit(ValueCache(), node, 10)
+    assert prefetcher.size == reserved == 10
+
+    is_loading.set()
+    _, size = future.result()
+    assert prefetcher.size == size
+
+    prefetcher._futures["task"] = {node.signature: (future, reserved)}
+    prefetcher.discard("task")
+    prefetcher.shutdown()
+    assert prefetcher.size == 0
+
+
+@pytest.mark.end_to_end
+@pytest.mark.parametrize(
+    ("prefetch_size", "expected"),
+    [("0", ["MainThread", "MainThread"]), ("1MB", ["MainThread", "prefetch_0"])],
+)
+def test_dependencies_of_upcoming_tasks_are_prefetched(
+    tmp_path, prefetch_size, expected
+):
+    source = """
+    import pickle
+    import threading
+    from pathlib import Path
+    from typing import Annotated
+
+    from pytask import PickleNode
+    from pytask import task
+
+    def deserializer(f):
+        name = threading.current_thread().name
+        with Path(__file__).parent.joinpath("threads.txt").open("a") as log:
+            log.write(name.split("-")[1] if "-" in name else name)
+            log.write("\\n")
+        return pickle.load(f)
+
+    for i in range(2):
+        node = PickleNode(
+            path=Path(__file__).parent / f"in-{i}.pkl", deserializer=deserializer
+        )
+
+        @task(id=str(i))
+        def task_example(
+            data: Annotated[int, node],
+        ) -> Annotated[str, Path(f"{i}.txt")]:
+            return str(data)
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    for i in range(2):
+        PickleNode(path=tmp_path / f"in-{i}.pkl").save(i)
+
+    session = build(paths=tmp_path, prefetch_size=prefetch_size)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("1.txt").read_text() == "1"
+    # The dependency of the first task is loaded when the task is executed.
+    threads = tmp_path.joinpath("threads.txt").read_text().splitlines()
+    assert sorted(threads) == expected
+    assert session.prefetcher.size == 0
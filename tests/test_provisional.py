@@ -280,3 +280,49 @@ def test_root_dir_is_created(runner, tmp_path):
     assert result.exit_code == ExitCode.OK
     assert tmp_path.joinpath("subfolder", "a.txt").exists()
     assert tmp_path.joinpath("subfolder", "b.txt").exists()
+
+
+def test_tasks_of_task_generator_are_replayed_if_inputs_are_unchanged(runner, tmp_path):
+    source = """
+    from pathlib import Path
+    from typing import Annotated
+
+    from pytask import DirectoryNode
+    from pytask import task
+
+    @task(is_generator=True)
+    def task_generator(paths = DirectoryNode(pattern="[ab].txt")):
+        with Path(__file__).parent.joinpath("log.txt").open("a") as f:
+            f.write("generator\\n")
+        for path in paths:
+
+            @task
+            def task_copy(
+                path: Path = path
+            ) -> Annotated[str, path.with_suffix(".out")]:
+                return path.read_text()
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("a.txt").write_text("a")
+    tmp_path.joinpath("b.txt").write_text("b")
+    log = tmp_path.joinpath("log.txt")
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "3  Succeeded" in result.output
+    assert log.read_text() == "generator\n"
+
+    # The generator is not executed and the tasks are replayed.
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "3  Collected tasks" in result.output
+    assert "2  Skipped because unchanged" in result.output
+    assert log.read_text() == "generator\n"
+
+    # A replayed task that needs to be executed runs the generator again.
+    tmp_path.joinpath("a.out").unlink()
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "1  Skipped because unchanged" in result.output
+    assert tmp_path.joinpath("a.out").read_text() == "a"
+    assert log.read_text() == "generator\n" * 2
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from _pytask.typing import no_default
+from pytask import ExitCode
+from pytask import PythonNode
+from pytask import build
+from pytask import cli
+
+_SOURCE = """
+from pathlib import Path
+from typing import Annotated
+
+from pytask import PythonNode
+
+first = PythonNode(name="first")
+second = PythonNode(name="second")
+
+def task_first() -> Annotated[list[int], first]:
+    return list(range(10_000))
+
+def task_second(data: Annotated[list[int], first]) -> Annotated[int, second]:
+    return len(data)
+
+def task_third(
+    data: Annotated[list[int], first], n: Annotated[int, second]
+) -> Annotated[str, Path("out.txt")]:
+    return str(sum(data) + n)
+"""
+
+
+@pytest.mark.end_to_end
+def test_values_are_released_after_last_dependent_task(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "50005000"
+    products = [
+        session.dag.get(name)
+        for task in session.tasks
+        for name in session.dag.successors(task.signature)
+    ]
+    values = {
+        node.name: node.value for node in products if isinstance(node, PythonNode)
+    }
+    assert values == {"first": no_default, "second": no_default}
+
+
+@pytest.mark.end_to_end
+def test_released_memory_is_shown_in_profile(tmp_path, runner):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+
+    result = runner.invoke(cli, ["profile", tmp_path.as_posix()])
+    assert result.exit_code == ExitCode.OK
+    assert "Released Memory" in result.output
+    assert "KB" in result.output
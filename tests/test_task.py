@@ -735,3 +735,52 @@ def test_task_function_in_another_module(runner, tmp_path):
     result = runner.invoke(cli, [tmp_path.as_posix()])
     assert result.exit_code == ExitCode.COLLECTION_FAILED
     assert "1  Failed" in result.output
+
+
+def test_task_grid(tmp_path, runner):
+    source = """
+    from pathlib import Path
+    from typing import Annotated
+
+    from pytask import Product
+    from pytask import task
+
+    table = {"i": [0, 1], "path": [Path("out_0.txt"), Path("out_1.txt")]}
+
+    @task.grid(table, ids=["first", "second"])
+    def task_example(i: int, path: Annotated[Path, Product], text: str = "i=") -> None:
+        path.write_text(f"{text}{i}")
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert "task_example[first]" in result.output
+    assert "task_example[second]" in result.output
+    assert tmp_path.joinpath("out_0.txt").read_text() == "i=0"
+    assert tmp_path.joinpath("out_1.txt").read_text() == "i=1"
+
+
+@pytest.mark.parametrize(
+    ("table", "kwargs", "expected"),
+    [
+        ({"i": [0, 1], "j": [0]}, {}, "must have the same length"),
+        ({"k": [0, 1]}, {}, "which are not parameters"),
+        ({"i": [0, 1]}, {"ids": ["a"]}, "must have one id per row"),
+        ({"i": [0, 0]}, {}, "is duplicated in the grid"),
+    ],
+)
+def test_task_grid_with_invalid_table(tmp_path, runner, table, kwargs, expected):
+    source = f"""
+    from pytask import task
+
+    @task.grid({table!r}, **{kwargs!r})
+    def task_example(i: int, j: int = 0) -> None: ...
+    """
+    tmp_path.joinpath("task_module.py").write_text(textwrap.dedent(source))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.COLLECTION_FAILED
+    assert expected in result.output
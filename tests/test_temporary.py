@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from _pytask.temporary import is_temporary
+from pytask import ExitCode
+from pytask import PathNode
+from pytask import PythonNode
+from pytask import TaskOutcome
+from pytask import build
+
+_SOURCE = """
+from pathlib import Path
+from typing import Annotated
+
+from pytask import PathNode
+from pytask import Product
+
+tmp = PathNode(path=Path(__file__).parent / "tmp.txt", attributes={"temporary": True})
+
+def task_create(path: Annotated[Path, tmp, Product]) -> None:
+    path.write_text("a")
+
+def task_first(path: Annotated[Path, tmp]) -> Annotated[str, Path("first.txt")]:
+    return path.read_text()
+
+def task_second(
+    path: Annotated[Path, tmp], other: Path = Path("in.txt")
+) -> Annotated[str, Path("second.txt")]:
+    return path.read_text() + other.read_text()
+"""
+
+
+@pytest.mark.parametrize(
+    ("node", "expected"),
+    [
+        (PathNode(path="a.txt", attributes={"temporary": True}), True),
+        (PythonNode(value=1, attributes={"temporary": True}), False),
+    ],
+)
+def test_is_temporary(node, expected):
+    assert is_temporary(node) is expected
+
+
+@pytest.mark.end_to_end
+def test_temporary_product_is_deleted_and_recreated_when_needed(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+    tmp_path.joinpath("in.txt").write_text("b")
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("second.txt").read_text() == "ab"
+    assert not tmp_path.joinpath("tmp.txt").exists()
+
+    # The deletion is not a reason to execute tasks again.
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert all(
+        report.outcome == TaskOutcome.SKIP_UNCHANGED
+        for report in session.execution_reports
+    )
+
+    # A dependent task needs the product, so it is created again.
+    tmp_path.joinpath("in.txt").write_text("c")
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    outcomes = {
+        report.task.base_name: report.outcome for report in session.execution_reports
+    }
+    assert outcomes == {
+        "task_create": TaskOutcome.SUCCESS,
+        "task_first": TaskOutcome.SKIP_UNCHANGED,
+        "task_second": TaskOutcome.SUCCESS,
+    }
+    assert tmp_path.joinpath("second.txt").read_text() == "ac"
+    assert not tmp_path.joinpath("tmp.txt").exists()
+
+
+@pytest.mark.end_to_end
+def test_temporary_product_is_kept_if_dependent_task_fails(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.FAILED
+    assert tmp_path.joinpath("tmp.txt").exists()
+
+    tmp_path.joinpath("in.txt").write_text("b")
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert not tmp_path.joinpath("tmp.txt").exists()
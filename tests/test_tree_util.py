@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import textwrap
+from typing import Any
 
 import pytest
+from attrs import define
 
+from _pytask.tree_util import clear_flat_arguments
+from _pytask.tree_util import get_flat_arguments
 from pytask import ExitCode
 from pytask import build
 from pytask import cli
+from pytask.tree_util import tree_leaves
 from pytask.tree_util import tree_map
 from pytask.tree_util import tree_structure
 
@@ -87,3 +92,28 @@ def test_is_prefix(prefix_tree, full_tree, strict, expected):
     prefix_structure = tree_structure(prefix_tree)
     full_tree_structure = tree_structure(full_tree)
     assert prefix_structure.is_prefix(full_tree_structure, strict=strict) is expected
+
+
+def test_get_flat_arguments_is_cached_until_arguments_change():
+    @define
+    class Example:
+        arguments: dict[str, Any]
+
+    example = Example(arguments={"b": [1, {"x": 2}], "a": (None, 3)})
+
+    flat = get_flat_arguments(example, "arguments")
+    assert flat.leaves == tree_leaves(example.arguments)
+    leaves, treespec = flat.arguments["b"]
+    assert treespec.unflatten(leaves) == example.arguments["b"]
+    assert get_flat_arguments(example, "arguments") is flat
+
+    example.arguments = {**example.arguments, "b": [4]}
+    new_flat = get_flat_arguments(example, "arguments")
+    assert new_flat is not flat
+    assert new_flat.leaves == [None, 3, 4]
+
+    # Trees modified in place are only flattened again after clearing the cache.
+    example.arguments["b"].append(5)
+    assert get_flat_arguments(example, "arguments") is new_flat
+    clear_flat_arguments(example, "arguments")
+    assert get_flat_arguments(example, "arguments").leaves == [None, 3, 4, 5]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from _pytask.value_cache import ValueCache
+from _pytask.value_cache import parse_size
+from pytask import ExitCode
+from pytask import PathNode
+from pytask import build
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (100, 100),
+        ("100", 100),
+        ("1.5KB", 1536),
+        ("512 MB", 512 * 1024**2),
+        ("2gb", 2 * 1024**3),
+    ],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "MB", "1 XB", "-1"])
+def test_parse_size_raises_error(value):
+    with pytest.raises(ValueError, match="The size"):
+        parse_size(value)
+
+
+def test_value_cache_evicts_least_recently_used_values(tmp_path):
+    nodes = []
+    for name in ("a", "b", "c"):
+        path = tmp_path.joinpath(f"{name}.txt")
+        path.write_text(name * 10)
+        nodes.append(PathNode(name=name, path=path, attributes={"cache_value": True}))
+    cache = ValueCache(max_size=20)
+
+    for node in nodes[:2]:
+        cache.load(node)
+    assert cache.size == 20
+
+    # Accessing "a" makes "b" the least recently used value.
+    cache.load(nodes[0])
+    cache.load(nodes[2])
+    assert cache.size == 20
+    assert list(cache._entries) == [nodes[0].signature, nodes[2].signature]
+
+    cache.invalidate(nodes[0].signature)
+    assert cache.size == 10
+
+
+@pytest.mark.end_to_end
+def test_dependencies_are_loaded_once(tmp_path):
+    source = """
+    import pickle
+    from pathlib import Path
+    from typing import Annotated
+
+    from pytask import PickleNode
+
+    def deserializer(f):
+        with Path(__file__).parent.joinpath("loads.txt").open("a") as log:
+            log.write(".")
+        return pickle.load(f)
+
+    node = PickleNode(
+        path=Path(__file__).parent / "data.pkl",
+        deserializer=deserializer,
+        attributes={"cache_value": True},
+    )
+
+    def task_create() -> Annotated[list[int], node]:
+        return [1, 2, 3]
+
+    def task_first(data: Annotated[list[int], node]) -> Annotated[str, Path("1.txt")]:
+        return str(sum(data))
+
+    def task_second(data: Annotated[list[int], node]) -> Annotated[str, Path("2.txt")]:
+        return str(len(data))
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("1.txt").read_text() == "6"
+    assert tmp_path.joinpath("2.txt").read_text() == "3"
+    assert tmp_path.joinpath("loads.txt").read_text() == "."
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+import pytest
+
+from _pytask.pluginmanager import storage
+from _pytask.watch import InotifyWatcher
+from _pytask.watch import PollingWatcher
+from _pytask.watch import watch_builds
+from pytask import ExitCode
+from pytask import TaskOutcome
+
+
+@pytest.mark.parametrize(
+    "watcher_class",
+    [
+        PollingWatcher,
+        pytest.param(
+            InotifyWatcher,
+            marks=pytest.mark.skipif(
+                sys.platform != "linux", reason="inotify is only available on Linux."
+            ),
+        ),
+    ],
+)
+def test_watcher_reports_changed_paths(tmp_path, watcher_class):
+    tmp_path.joinpath("modified.txt").write_text("a")
+    tmp_path.joinpath("deleted.txt").touch()
+
+    watcher = watcher_class()
+    watcher.watch([tmp_path])
+    try:
+        assert watcher.wait(0) == set()
+
+        tmp_path.joinpath("modified.txt").write_text("ab")
+        tmp_path.joinpath("deleted.txt").unlink()
+        tmp_path.joinpath("created.txt").touch()
+
+        assert watcher.wait(1) >= {
+            tmp_path.joinpath("modified.txt"),
+            tmp_path.joinpath("deleted.txt"),
+            tmp_path.joinpath("created.txt"),
+        }
+    finally:
+        watcher.close()
+
+
+@pytest.mark.end_to_end
+def test_watch_builds_after_relevant_changes(tmp_path):
+    source = """
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import Product
+
+    def task_example(
+        path: Path = Path("in.txt"), out: Annotated[Path, Product] = Path("out.txt")
+    ) -> None:
+        out.write_text(path.read_text())
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("in.txt").write_text("Hello")
+
+    storage.create()
+    builds = watch_builds({"paths": (tmp_path,)}, PollingWatcher(interval=0.01))
+    try:
+        session = next(builds)
+        assert session.exit_code == ExitCode.OK
+        assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+
+        # Files unknown to pytask do not trigger a build.
+        tmp_path.joinpath("README.md").write_text("A project.")
+        tmp_path.joinpath("in.txt").write_text("Hello, World!")
+
+        session = next(builds)
+        assert session.exit_code == ExitCode.OK
+        assert session.execution_reports[0].outcome == TaskOutcome.SUCCESS
+        assert tmp_path.joinpath("out.txt").read_text() == "Hello, World!"
+    finally:
+        builds.close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from _pytask.writer import save_atomically
+from pytask import ExitCode
+from pytask import PickleNode
+from pytask import TaskOutcome
+from pytask import build
+
+
+class _FailingNode(PickleNode):
+    def save(self, value):
+        self.path.write_bytes(b"partial")
+        raise ValueError(value)
+
+
+def test_save_atomically(tmp_path):
+    node = PickleNode(path=tmp_path / "data.pkl")
+    save_atomically(node, [1, 2])
+    assert node.load() == [1, 2]
+    assert [path.name for path in tmp_path.iterdir()] == ["data.pkl"]
+
+
+def test_save_atomically_keeps_previous_file_on_error(tmp_path):
+    node = _FailingNode(path=tmp_path / "data.pkl")
+    PickleNode(path=node.path).save(1)
+
+    with pytest.raises(ValueError, match="2"):
+        save_atomically(node, 2)
+    assert node.load() == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["data.pkl"]
+
+
+_SOURCE = """
+import threading
+import time
+from pathlib import Path
+from typing import Annotated
+
+import pytask
+from pytask import PickleNode
+from pytask import Product
+
+class SlowNode(PickleNode):
+    def save(self, value):
+        time.sleep(0.5)
+        if value == "fail":
+            raise ValueError("Saving failed.")
+        super().save(threading.current_thread().name)
+
+node = SlowNode(path=Path(__file__).parent / "a.pkl")
+
+@pytask.mark.try_first
+def task_first() -> Annotated[str, node]:
+    return Path(__file__).parent.joinpath("in.txt").read_text()
+
+def task_second(x: Annotated[str, node]) -> Annotated[str, Path("second.txt")]:
+    return x
+
+def task_independent(
+    path: Annotated[Path, Product] = Path("independent.txt"),
+) -> None:
+    path.write_text("Hello")
+"""
+
+
+@pytest.mark.end_to_end
+def test_products_are_saved_in_the_background(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+    tmp_path.joinpath("in.txt").write_text("ok")
+
+    session = build(paths=tmp_path, n_save_workers=1)
+
+    assert session.exit_code == ExitCode.OK
+    names = [report.task.base_name for report in session.execution_reports]
+    assert names == ["task_independent", "task_first", "task_second"]
+    assert tmp_path.joinpath("second.txt").read_text().startswith("pytask-writer")
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    session = build(paths=tmp_path, n_save_workers=1)
+    assert session.exit_code == ExitCode.OK
+    assert all(
+        report.outcome == TaskOutcome.SKIP_UNCHANGED
+        for report in session.execution_reports
+    )
+
+
+@pytest.mark.end_to_end
+def test_errors_while_saving_fail_the_task(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_SOURCE))
+    tmp_path.joinpath("in.txt").write_text("fail")
+
+    session = build(paths=tmp_path, n_save_workers=1)
+
+    assert session.exit_code == ExitCode.FAILED
+    outcomes = {
+        report.task.base_name: report.outcome for report in session.execution_reports
+    }
+    assert outcomes == {
+        "task_first": TaskOutcome.FAIL,
+        "task_second": TaskOutcome.SKIP_PREVIOUS_FAILED,
+        "task_independent": TaskOutcome.SUCCESS,
+    }
+    report = next(r for r in session.execution_reports if r.outcome == TaskOutcome.FAIL)
+    assert isinstance(report.exc_info[1], ValueError)
+
+    tmp_path.joinpath("in.txt").write_text("ok")
+    session = build(paths=tmp_path, n_save_workers=1)
+    assert session.exit_code == ExitCode.OK